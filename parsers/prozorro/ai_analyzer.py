@@ -1,9 +1,14 @@
 import os
+import json
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple
+from itertools import islice
+from typing import Dict, Any, Optional, List, Union, Tuple, Iterable, Iterator
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from core.classification_cache import ClassificationCache
+from core.prefilter import ClassificationCascade
 from core.models import Tender
 from core.exceptions import ProzorroAPIError
 
@@ -15,6 +20,75 @@ class AIAnalysisError(Exception):
     pass
 
 
+# Version of the classification prompts. Bump it whenever a prompt changes,
+# so that verdicts cached for the old prompts are no longer used.
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = "You are an expert in analyzing public procurement tenders."
+
+BATCH_PROMPT = """
+Analyze each of the texts below and determine if it's related to restoring or building buildings,
+houses, apartments, flats.
+
+Respond with a JSON object of the form {"answers": [{"id": 1, "answer": "YES"}, ...]}
+with one answer, YES or NO, for the id of every text.
+
+Texts:
+"""
+
+
+def build_batch_prompt(titles: List[str]) -> str:
+    """
+    Build the prompt classifying several titles in one request.
+    
+    Args:
+        titles: Tender titles, identified by their position starting at 1
+        
+    Returns:
+        Prompt listing the titles as a JSON array of id/text objects
+    """
+    items = [{"id": number, "text": title} for number, title in enumerate(titles, 1)]
+    return BATCH_PROMPT + json.dumps(items, ensure_ascii=False)
+
+
+def parse_batch_answers(response_text: str, count: int) -> Dict[int, bool]:
+    """
+    Parse the per-item answers of a batch request.
+    
+    Items without a valid YES/NO answer are left out, so that they can be
+    classified again; the rest of the batch is kept.
+    
+    Args:
+        response_text: JSON content of the model's response
+        count: Number of titles in the batch
+        
+    Returns:
+        Dictionary mapping item ids (1 to count) to whether the item is building-related
+    """
+    try:
+        data = json.loads(response_text)
+    except (TypeError, ValueError):
+        return {}
+    answers = data.get("answers") if isinstance(data, dict) else data
+    if isinstance(answers, dict):
+        answers = [{"id": key, "answer": value} for key, value in answers.items()]
+    if not isinstance(answers, list):
+        return {}
+    
+    parsed = {}
+    for entry in answers:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            number = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        answer = str(entry.get("answer", "")).strip().upper()
+        if 1 <= number <= count and answer in ("YES", "NO"):
+            parsed[number] = answer == "YES"
+    return parsed
+
+
 class BuildingAnalyzer:
     """
     Class for analyzing tender data using OpenAI's language models to identify
@@ -22,22 +96,54 @@ class BuildingAnalyzer:
     
     This class is independent of the Prozorro service and can process tender results
     returned by the Prozorro scraper.
+    
+    Titles are classified either one request per title (``is_building_related``)
+    or in batches of many titles per request, with several batches in flight
+    at once (``classify_titles`` and the filters built on it). With a
+    ClassificationCache, titles classified before by the same model and
+    prompt version are answered from the cache. With a ClassificationCascade
+    as pre-filter, cache misses its local tiers settle are not sent to the model.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        batch_size: int = 50,
+        max_concurrency: int = 8,
+        max_retries: int = 2,
+        cache: Optional[ClassificationCache] = None,
+        prefilter: Optional[ClassificationCascade] = None
+    ):
         """
         Initialize the building analyzer.
         
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY environment variable)
             model: OpenAI model to use for analysis
+            base_url: URL of an OpenAI-compatible API (defaults to the
+                OPENAI_BASE_URL environment variable, else OpenAI's API)
+            batch_size: Number of titles classified per batch request
+            max_concurrency: Maximum number of batch requests in flight
+            max_retries: Number of retries of failed requests by the client
+            cache: Optional persistent cache of verdicts
+            prefilter: Optional cascade deciding clear-cut titles locally
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             logger.warning("No OpenAI API key provided. AI analysis will not work.")
         
         self.model = model
-        self.client = OpenAI(api_key=self.api_key) if self.api_key else None
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.cache = cache
+        self.prefilter = prefilter
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url, max_retries=max_retries) if self.api_key else None
+        # Number of titles batch classification could not classify
+        self.unclassified = 0
     
     def is_building_related(self, tender_title: str) -> bool:
         """
@@ -55,6 +161,16 @@ class BuildingAnalyzer:
         Raises:
             AIAnalysisError: If the analysis fails
         """
+        if self.cache is not None:
+            cached = self.cache.get(tender_title, self.model, PROMPT_VERSION)
+            if cached is not None:
+                return cached
+        
+        if self.prefilter is not None:
+            verdict, _ = self.prefilter.decide(tender_title)
+            if verdict is not None:
+                return verdict
+        
         if not self.client:
             raise AIAnalysisError("OpenAI API key not provided. Cannot perform analysis.")
         
@@ -72,7 +188,7 @@ class BuildingAnalyzer:
                 model=self.model,
                 response_format={"type": "text"},
                 messages=[
-                    {"role": "system", "content": "You are an expert in analyzing public procurement tenders."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ]
             )
@@ -81,26 +197,218 @@ class BuildingAnalyzer:
             if response_text not in ["YES", "NO"]:
                 raise AIAnalysisError("Invalid response from OpenAI API")
             
+            if self.cache is not None:
+                self.cache.put(tender_title, response_text == "YES", self.model, PROMPT_VERSION)
             return response_text == "YES"
             
         except Exception as e:
             logger.error(f"Error during AI analysis: {str(e)}")
             raise AIAnalysisError(f"Failed to analyze tender: {str(e)}")
     
+    async def _classify_batch(self, client: AsyncOpenAI, titles: List[str]) -> Dict[int, bool]:
+        """Classify titles in one request and return the valid answers by item id."""
+        response = await client.chat.completions.create(
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": build_batch_prompt(titles)}
+            ]
+        )
+        return parse_batch_answers(response.choices[0].message.content, len(titles))
+    
+    async def _classify_items(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        titles: List[str]
+    ) -> List[Optional[bool]]:
+        """
+        Classify a batch, retrying unanswered titles in smaller batches.
+        
+        Titles left without an answer by a failed request or an incomplete
+        response are sent again, split in halves when no title got an answer,
+        down to single titles, whose failure only leaves that title unclassified.
+        """
+        async with semaphore:
+            try:
+                answers = await self._classify_batch(client, titles)
+            except Exception as e:
+                logger.warning(f"Batch of {len(titles)} titles failed: {str(e)}")
+                answers = {}
+        
+        results: List[Optional[bool]] = [answers.get(number) for number in range(1, len(titles) + 1)]
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        if len(titles) == 1:
+            logger.error(f"Could not classify tender title: {titles[0]}")
+            return results
+        
+        if len(missing) < len(titles):
+            groups = [missing]
+        else:
+            half = len(missing) // 2
+            groups = [missing[:half], missing[half:]]
+        retried = await asyncio.gather(*(
+            self._classify_items(client, semaphore, [titles[index] for index in group])
+            for group in groups
+        ))
+        for group, group_results in zip(groups, retried):
+            for index, result in zip(group, group_results):
+                results[index] = result
+        return results
+    
+    async def classify_titles_async(self, titles: List[str]) -> List[Optional[bool]]:
+        """
+        Classify titles in concurrent batch requests.
+        
+        Identical titles are classified once, and titles with a cached
+        verdict or decided by the pre-filter not at all. At most ``max_concurrency`` requests of up to
+        ``batch_size`` titles are in flight at a time.
+        
+        Args:
+            titles: Tender titles to classify
+            
+        Returns:
+            For every title, True if it is building-related, False if not, and
+            None if it could not be classified
+            
+        Raises:
+            AIAnalysisError: If titles need classifying and no API key is configured
+        """
+        distinct = list(dict.fromkeys(titles))
+        by_title: Dict[str, Optional[bool]] = {}
+        if self.cache is not None:
+            by_title.update(self.cache.get_many(distinct, self.model, PROMPT_VERSION))
+            distinct = [title for title in distinct if title not in by_title]
+        if self.prefilter is not None:
+            # Stored model verdicts take precedence over the local tiers
+            decided, distinct = self.prefilter.split(distinct)
+            by_title.update(decided)
+        
+        if distinct:
+            if not self.api_key:
+                raise AIAnalysisError("OpenAI API key not provided. Cannot perform analysis.")
+            
+            batches = [distinct[start:start + self.batch_size] for start in range(0, len(distinct), self.batch_size)]
+            client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=self.max_retries)
+            try:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                batch_results = await asyncio.gather(*(
+                    self._classify_items(client, semaphore, batch) for batch in batches
+                ))
+            finally:
+                await client.close()
+            
+            classified = {}
+            for batch, results in zip(batches, batch_results):
+                classified.update(zip(batch, results))
+            by_title.update(classified)
+            failed = [title for title, result in classified.items() if result is None]
+            if failed:
+                self.unclassified += len(failed)
+                logger.warning(f"Could not classify {len(failed)} of {len(distinct)} titles")
+            if self.cache is not None:
+                self.cache.put_many(
+                    {title: result for title, result in classified.items() if result is not None},
+                    self.model, PROMPT_VERSION
+                )
+        return [by_title[title] for title in titles]
+    
+    def classify_titles(self, titles: List[str]) -> List[Optional[bool]]:
+        """
+        Classify titles in concurrent batch requests.
+        
+        Runs ``classify_titles_async`` in a new event loop, so it must not be
+        called from a running event loop.
+        
+        Args:
+            titles: Tender titles to classify
+            
+        Returns:
+            For every title, True if it is building-related, False if not, and
+            None if it could not be classified
+        """
+        if not titles:
+            return []
+        return asyncio.run(self.classify_titles_async(titles))
+    
+    def iter_classified_tenders(
+        self,
+        tenders: Iterable[Tender],
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Tuple[Tender, Optional[bool]]]:
+        """
+        Classify a stream of tenders in concurrent batches, a chunk at a time.
+        
+        Args:
+            tenders: Iterable of Tender objects to analyze
+            chunk_size: Number of tenders collected before classifying them
+                (defaults to enough to keep every concurrent request busy)
+            
+        Yields:
+            Tuples of (tender, True/False, or None if it could not be classified),
+            in input order
+        """
+        chunk_size = chunk_size or self.batch_size * self.max_concurrency
+        iterator = iter(tenders)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            results = self.classify_titles([tender.title for tender in chunk])
+            yield from zip(chunk, results)
+    
     def filter_building_related_tenders(
         self, 
         tenders: List[Tender], 
+        batched: bool = False
     ) -> List[Tender]:
         """
         Filter tenders to find those related to buildings/houses/flats.
         
         Args:
             tenders: List of Tender objects to analyze
+            batched: Classify in concurrent batch requests, leaving out the
+                tenders that could not be classified (they are logged and
+                counted in ``unclassified``); otherwise one request per
+                tender, where any failure raises
             
         Returns:
             List of Tender objects that are building-related
         """
         logger.info(f"Analyzing {len(tenders)} tenders for building relation...")
         
+        if batched:
+            results = self.classify_titles([tender.title for tender in tenders])
+            return [tender for tender, result in zip(tenders, results) if result]
+        
         return [tender for tender in tenders if self.is_building_related(tender.title)]
-    
\ No newline at end of file
+    
+    def iter_building_related_tenders(self, tenders: Iterable[Tender], batched: bool = False) -> Iterator[Tender]:
+        """
+        Lazily filter a stream of tenders to those related to buildings/houses/flats.
+        
+        Tenders are classified one at a time as they arrive, or in chunks of
+        concurrent batch requests, so this can consume a crawl while it is
+        still running.
+        
+        Args:
+            tenders: Iterable of Tender objects to analyze
+            batched: Classify in concurrent batch requests, skipping the
+                tenders that could not be classified (they are logged and
+                counted in ``unclassified``)
+            
+        Yields:
+            Tender objects that are building-related
+        """
+        if batched:
+            for tender, result in self.iter_classified_tenders(tenders):
+                if result:
+                    yield tender
+            return
+        
+        for tender in tenders:
+            if self.is_building_related(tender.title):
+                yield tender
@@ -3,14 +3,14 @@ import os
 import json
 import logging
 import argparse
-from pathlib import Path
+import sqlite3
 from core.analysis import (
-    load_all_json_data, 
-    generate_summary_report, 
-    save_analysis_report,
-    analyze_damaged_buildings,
-    analyze_regions
+    run_analyses,
+    build_summary_report, 
+    save_analysis_report
 )
+from core.analysis_store import AnalysisStore
+from core.loader import SnapshotWriter, is_snapshot, iter_tenders
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,47 +19,86 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main(input_dir: str, output_dir: str) -> None:
+def main(input_dir: str, output_dir: str, workers: int = 8, snapshot: str = None,
+         compact_rankings: bool = False, store: str = None) -> None:
     """
     Analyze tender data and generate reports.
     
+    Tenders are streamed into the analyses as they are loaded rather than
+    held in memory all at once.
+    
     Args:
-        input_dir: Directory containing parsed tender JSON files
+        input_dir: Directory containing parsed tender JSON files, or a
+            snapshot file (.ndjson, .ndjson.gz or .pickle)
         output_dir: Directory to save analysis reports to
+        workers: Number of threads reading tender files
+        snapshot: Optional path of a snapshot file to write the loaded
+            tenders to, for faster loading next time
+        compact_rankings: Give the number of tender IDs of the top suppliers
+            and customers instead of the IDs themselves
+        store: Optional path of an analysis store (SQLite) to update with
+            the new, changed and removed tender files of input_dir and to
+            build the reports from, instead of analyzing every tender
     """
     os.makedirs(output_dir, exist_ok=True)
+    damaged_buildings_file = os.path.join(output_dir, "damaged_buildings.json")
+    
+    # Every analysis below comes out of a single pass over the tenders,
+    # made while they are being loaded, or out of the analysis store,
+    # which only reads the tender files changed since its last update
+    logger.info(f"Loading and analyzing tender data from {input_dir}")
+    try:
+        if store:
+            if is_snapshot(input_dir):
+                logger.error("The analysis store needs a directory of tender files as input")
+                return
+            if snapshot:
+                logger.warning("Tenders are not written to a snapshot when using the analysis store")
+            with AnalysisStore(store) as analysis_store:
+                analysis_store.sync_directory(input_dir)
+                results = analysis_store.results(compact_rankings=compact_rankings, damaged_buildings=False)
+                # Copied straight from the store rather than decoded and re-encoded
+                analysis_store.write_damaged_buildings(damaged_buildings_file)
+                logger.info(f"Saved damaged buildings data to {damaged_buildings_file}")
+        elif snapshot:
+            tenders = iter_tenders(input_dir, workers)
+            with SnapshotWriter(snapshot) as writer:
+                results = run_analyses(writer.tee(tenders), compact_rankings=compact_rankings, rankings_only=True)
+        else:
+            tenders = iter_tenders(input_dir, workers)
+            results = run_analyses(tenders, compact_rankings=compact_rankings, rankings_only=True)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error loading tender data from {input_dir}: {str(e)}")
+        return
     
-    # Load all tender data
-    logger.info(f"Loading tender data from {input_dir}")
-    tenders = load_all_json_data(input_dir)
-    if not tenders:
+    if not results['tender_count']:
         logger.error("No tender data found, exiting")
         return
     
-    logger.info(f"Loaded {len(tenders)} tenders")
+    logger.info(f"Analyzed {results['tender_count']} tenders")
     
     logger.info("Generating summary report")
-    summary_report = generate_summary_report(tenders)
+    summary_report = build_summary_report(results)
     
     summary_file = os.path.join(output_dir, "summary_report.json")
     save_analysis_report(summary_report, summary_file)
     
     # Identify tenders related to damaged buildings
     logger.info("Identifying tenders related to damaged buildings")
-    damaged_building_tenders = analyze_damaged_buildings(tenders)
-    logger.info(f"Found {len(damaged_building_tenders)} tenders related to damaged buildings")
+    damaged_building_count = summary_report['damaged_buildings']['count']
+    logger.info(f"Found {damaged_building_count} tenders related to damaged buildings")
     
-    damaged_buildings_file = os.path.join(output_dir, "damaged_buildings.json")
-    try:
-        with open(damaged_buildings_file, 'w', encoding='utf-8') as f:
-            json.dump(damaged_building_tenders, f, ensure_ascii=False, indent=2)
-        logger.info(f"Saved damaged buildings data to {damaged_buildings_file}")
-    except Exception as e:
-        logger.error(f"Error saving damaged buildings data: {str(e)}")
+    if 'damaged_buildings' in results:
+        try:
+            with open(damaged_buildings_file, 'w', encoding='utf-8') as f:
+                json.dump(results['damaged_buildings'], f, ensure_ascii=False, indent=2)
+            logger.info(f"Saved damaged buildings data to {damaged_buildings_file}")
+        except Exception as e:
+            logger.error(f"Error saving damaged buildings data: {str(e)}")
     
     # Analyze regions
     logger.info("Analyzing regions")
-    regions = analyze_regions(tenders)
+    regions = results['regions']
     regions_file = os.path.join(output_dir, "regions.json")
     try:
         with open(regions_file, 'w', encoding='utf-8') as f:
@@ -73,7 +112,7 @@ def main(input_dir: str, output_dir: str) -> None:
     print(f"Total tenders analyzed: {summary_report['tender_count']}")
     print(f"Total value of tenders: {summary_report['values']['total']} UAH")
     print(f"Average tender value: {summary_report['values']['average']:.2f} UAH")
-    print(f"Tenders related to damaged buildings: {len(damaged_building_tenders)}")
+    print(f"Tenders related to damaged buildings: {damaged_building_count}")
     
     print("\nTop 5 regions by tender count:")
     for region, count in list(regions.items())[:5]:
@@ -96,10 +135,19 @@ def main(input_dir: str, output_dir: str) -> None:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Analyze tender data and generate reports")
     parser.add_argument("--input-dir", required=False, default="../parsed_data",
-                        help="Directory containing parsed tender JSON files")
+                        help="Directory containing parsed tender JSON files, or a .ndjson, .ndjson.gz "
+                             "or .pickle snapshot")
     parser.add_argument("--output-dir", required=False, default="../analysis_results",
                         help="Directory to save analysis reports to")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Number of threads reading tender files")
+    parser.add_argument("--snapshot",
+                        help="Write the loaded tenders to this snapshot file (.ndjson, .ndjson.gz or .pickle)")
+    parser.add_argument("--compact-rankings", action="store_true",
+                        help="List the number of tender IDs of the top suppliers and customers instead of the IDs")
+    parser.add_argument("--store",
+                        help="SQLite analysis store to update with the changed tender files and report from")
     
     args = parser.parse_args()
     
-    main(args.input_dir, args.output_dir) 
\ No newline at end of file
+    main(args.input_dir, args.output_dir, args.workers, args.snapshot, args.compact_rankings, args.store) 
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the single-pass analysis engine against one pass per analysis.
+
+Tenders are sampled from the stored tenders and varied so that every
+analysis has data to work on. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_analysis --tenders 100000
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from benchmarks.tender_pages import load_stored_tenders
+from core.analysis import (
+    analyze_damaged_buildings,
+    analyze_customers,
+    analyze_procurement_types,
+    analyze_regions,
+    analyze_suppliers,
+    analyze_tender_categories,
+    analyze_tender_values,
+    build_summary_report,
+    run_analyses,
+)
+
+
+def make_tenders(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Sample tenders from the stored ones, adding customers, types, categories and dates."""
+    rng = random.Random(seed)
+    stored = [data for _, data in load_stored_tenders()]
+    tenders = []
+    for _ in range(count):
+        tender = copy.deepcopy(rng.choice(stored))
+        if rng.random() < 0.4:
+            tender['customer'] = {
+                'name': f"Виконавчий комітет №{rng.randrange(200)}",
+                'edrpou': f"{rng.randrange(10000000, 100000000)}",
+                'region': rng.choice(['Харківська область', 'Київ', 'Одеська область']),
+            }
+        if rng.random() < 0.5:
+            tender['procurement_type'] = rng.choice(['Відкриті торги', 'Спрощена закупівля', 'Звіт про договір'])
+        if rng.random() < 0.5:
+            tender.setdefault('subject', {})['classifier_name'] = rng.choice(['Будівельні роботи', 'Ремонт', 'Вікна'])
+        if rng.random() < 0.5:
+            tender['dates'] = {'publication_date': f"{rng.randrange(1, 29):02d}.{rng.randrange(1, 13):02d}.2023"}
+        tenders.append(tender)
+    return tenders
+
+
+def multi_pass(tenders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute the same results with one pass per analysis, as analyze_tenders.py
+    did before the aggregation engine (damaged buildings and regions twice).
+    """
+    analyze_damaged_buildings(tenders)
+    analyze_regions(tenders)
+    return {
+        'tender_count': len(tenders),
+        'regions': analyze_regions(tenders),
+        'procurement_types': analyze_procurement_types(tenders),
+        'categories': analyze_tender_categories(tenders),
+        'values': analyze_tender_values(tenders),
+        'suppliers': analyze_suppliers(tenders),
+        'customers': analyze_customers(tenders),
+        'damaged_buildings': analyze_damaged_buildings(tenders),
+    }
+
+
+def main(count: int) -> int:
+    tenders = make_tenders(count)
+    print(f"{count} tenders")
+
+    started = time.perf_counter()
+    expected_results = multi_pass(tenders)
+    expected = build_summary_report(expected_results)
+    multi_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual_results = run_analyses(tenders)
+    actual = build_summary_report(actual_results)
+    single_elapsed = time.perf_counter() - started
+
+    print(f"one pass per analysis {multi_elapsed:>8.3f} s")
+    print(f"single pass           {single_elapsed:>8.3f} s ({multi_elapsed / single_elapsed:.1f}x)")
+    identical = all(
+        json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+        for a, b in ((expected, actual), (expected_results['damaged_buildings'], actual_results['damaged_buildings']))
+    )
+    print("reports identical" if identical else "REPORTS DIFFER")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single-pass vs per-analysis tender aggregation")
+    parser.add_argument("--tenders", type=int, default=100000, help="Number of synthetic tenders")
+
+    args = parser.parse_args()
+
+    raise SystemExit(main(args.tenders))
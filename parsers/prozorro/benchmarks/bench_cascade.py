@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the pre-filter cascade against sending every title to the model.
+
+Uses the hand-labelled titles in ``corpus/labelled_titles.json``, split by
+title into a training half for the TF-IDF tier and a held-out half for
+evaluation, so that neither the rules nor the model are scored against
+their own heuristics or against titles they were trained on. Reports the
+titles each tier decided with its accuracy, precision and recall on the
+held-out titles, then classifies numbered copies of them with
+``BuildingAnalyzer`` against the local fake OpenAI server (answering with
+the labels) with and without the cascade. Run from the ``prozorro``
+directory:
+
+    python -m benchmarks.bench_cascade --titles 5000 --latency 0.3
+    python -m benchmarks.bench_cascade --lower 0.3 --upper 0.7
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import time
+from typing import Dict, List, Tuple
+
+from ai_analyzer import BuildingAnalyzer
+from benchmarks.fake_openai_server import FakeOpenAIServer
+from core.prefilter import TIERS, ClassificationCascade, TitleModel, evaluate_cascade
+
+LABELLED_TITLES = os.path.join(os.path.dirname(__file__), 'corpus', 'labelled_titles.json')
+
+_NUMBER_RE = re.compile(r' №\d+$')
+
+
+def load_labelled_titles(path: str = LABELLED_TITLES) -> Dict[str, bool]:
+    """Load the hand-labelled titles as a mapping of titles to their labels."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {item['title']: item['building'] for item in json.load(f)}
+
+
+def split_titles(labels: Dict[str, bool], seed: int = 0) -> Tuple[List[str], List[str]]:
+    """Split the titles into disjoint training and held-out halves, stratified by label."""
+    rng = random.Random(seed)
+    training, held_out = [], []
+    for label in (True, False):
+        titles = sorted(title for title, value in labels.items() if value == label)
+        rng.shuffle(titles)
+        training.extend(titles[:len(titles) // 2])
+        held_out.extend(titles[len(titles) // 2:])
+    return training, held_out
+
+
+def print_report(name: str, report: Dict[str, Dict]) -> None:
+    parts = []
+    for tier in TIERS[:-1]:
+        tier_report = report[tier]
+        parts.append(f"{tier} {tier_report['decided']} (accuracy {tier_report['accuracy']}, "
+                     f"precision {tier_report['precision']}, recall {tier_report['recall']})")
+    print(f"{name:<24} {', '.join(parts)}, escalated {report['llm']['decided']}")
+
+
+def main(count: int, latency: float, batch_size: int, concurrency: int, seed: int,
+         lower: float, upper: float) -> int:
+    labels = load_labelled_titles()
+    training, held_out = split_titles(labels, seed)
+    held_out_labels = [labels[title] for title in held_out]
+    title_model = TitleModel.train(training, [labels[title] for title in training])
+    cascades = (('rules', lambda: ClassificationCascade()),
+                ('rules, tf-idf', lambda: ClassificationCascade(model=title_model, lower=lower, upper=upper)))
+
+    print(f"{len(training)} training and {len(held_out)} held-out hand-labelled titles")
+    for name, make_cascade in cascades:
+        print_report(name, evaluate_cascade(make_cascade(), held_out, held_out_labels))
+
+    rng = random.Random(seed)
+    titles = [f"{rng.choice(held_out)} №{index}" for index in range(count)]
+    server = FakeOpenAIServer(latency=latency, latency_per_item=latency / 100,
+                              oracle=lambda title: labels[_NUMBER_RE.sub('', title)]).start()
+    try:
+        print(f"{count} numbered held-out titles, {latency:.2f} s per request, batches of {batch_size}, "
+              f"{concurrency} in flight")
+        analyzer = BuildingAnalyzer(api_key='test', base_url=server.base_url, batch_size=batch_size,
+                                    max_concurrency=concurrency, max_retries=0)
+        started = time.perf_counter()
+        analyzer.classify_titles(titles)
+        plain = time.perf_counter() - started
+        print(f"{'model only':<24} {plain:>8.2f} s ({server.requests} requests)")
+
+        for name, make_cascade in cascades:
+            analyzer.prefilter = make_cascade()
+            server.requests = 0
+            started = time.perf_counter()
+            results = analyzer.classify_titles(titles)
+            elapsed = time.perf_counter() - started
+            wrong = sum(1 for result, title in zip(results, titles) if result != labels[_NUMBER_RE.sub('', title)])
+            print(f"{name:<24} {elapsed:>8.2f} s ({plain / elapsed:.1f}x, {server.requests} requests, "
+                  f"{analyzer.prefilter.stats.to_dict()}, {wrong} wrong)")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pre-filter cascade against a fake model server")
+    parser.add_argument("--titles", type=int, default=5000, help="Number of titles to classify")
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated seconds per request")
+    parser.add_argument("--batch-size", type=int, default=50, help="Titles per batch request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch requests in flight")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the training/held-out split")
+    parser.add_argument("--lower", type=float, default=0.05, help="Probability at or below which tf-idf decides NO")
+    parser.add_argument("--upper", type=float, default=0.95, help="Probability at or above which tf-idf decides YES")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    raise SystemExit(main(args.titles, args.latency, args.batch_size, args.concurrency, args.seed,
+                          args.lower, args.upper))
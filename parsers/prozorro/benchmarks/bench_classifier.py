@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark of batched, concurrent tender classification against one request per title.
+
+Runs ``BuildingAnalyzer`` against a local fake OpenAI-compatible server
+with simulated model latency, so no API key or network is needed. The
+one-request-per-title mode is timed on a sample and extrapolated. A second
+batched run with a classification cache shows a repeat crawl answered from
+the cache. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_classifier --titles 5000 --latency 0.3
+    python -m benchmarks.bench_classifier --fail-rate 0.05 --drop-rate 0.02
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from ai_analyzer import BuildingAnalyzer
+from benchmarks.fake_openai_server import FakeOpenAIServer, is_building_title
+from benchmarks.tender_pages import load_stored_tenders
+from core.classification_cache import ClassificationCache, ClassificationCacheStats
+
+OTHER_TITLES = (
+    'Папір офісний А4', 'Бензин А-95', 'Послуги з охорони приміщень', 'Продукти харчування для їдальні',
+    'Комп’ютерне обладнання', 'Медичні препарати', 'Канцелярське приладдя', 'Послуги зв’язку',
+)
+
+
+def make_titles(count: int, seed: int = 0) -> List[str]:
+    """Mix the stored tender titles with unrelated ones, numbered to make them distinct."""
+    rng = random.Random(seed)
+    stored = [data['title'] for _, data in load_stored_tenders() if data.get('title')]
+    return [f"{rng.choice(stored if rng.random() < 0.5 else OTHER_TITLES)} №{index}" for index in range(count)]
+
+
+def main(count: int, latency: float, sample: int, batch_size: int, concurrency: int,
+         fail_rate: float, drop_rate: float) -> int:
+    titles = make_titles(count)
+    expected = [is_building_title(title) for title in titles]
+    server = FakeOpenAIServer(latency=latency, latency_per_item=latency / 100,
+                              fail_rate=fail_rate, drop_rate=drop_rate).start()
+    try:
+        analyzer = BuildingAnalyzer(api_key='test', base_url=server.base_url, batch_size=batch_size,
+                                    max_concurrency=concurrency, max_retries=0)
+        print(f"{count} titles, {latency:.2f} s per request, batches of {batch_size}, {concurrency} in flight")
+
+        started = time.perf_counter()
+        single_errors = 0
+        for title in titles[:sample]:
+            try:
+                analyzer.is_building_related(title)
+            except Exception:
+                single_errors += 1
+        per_title = (time.perf_counter() - started) / sample
+        print(f"{'one request per title':<24} {per_title * count:>8.1f} s (extrapolated from {sample}, "
+              f"{single_errors} failed)")
+
+        server.requests = 0
+        started = time.perf_counter()
+        results = analyzer.classify_titles(titles)
+        elapsed = time.perf_counter() - started
+        unclassified = sum(1 for result in results if result is None)
+        wrong = sum(1 for result, truth in zip(results, expected) if result is not None and result != truth)
+        print(f"{'batched, concurrent':<24} {elapsed:>8.1f} s ({per_title * count / elapsed:.0f}x, "
+              f"{server.requests} requests, {unclassified} unclassified, {wrong} wrong)")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ClassificationCache(os.path.join(tmp, 'classifications.sqlite'))
+            analyzer.cache = cache
+            analyzer.classify_titles(titles)
+            # A repeat crawl sees the same titles, a few of them edited
+            repeat = [title if index % 20 else f"{title} (зміни)" for index, title in enumerate(titles)]
+            server.requests = 0
+            cache.stats = ClassificationCacheStats()
+            started = time.perf_counter()
+            cached_results = analyzer.classify_titles(repeat)
+            cached_elapsed = time.perf_counter() - started
+            stats = cache.stats.to_dict()
+            cache.close()
+        wrong += sum(
+            1 for result, title in zip(cached_results, repeat)
+            if result is not None and result != is_building_title(title)
+        )
+        print(f"{'repeat, cached':<24} {cached_elapsed:>8.1f} s ({server.requests} requests, "
+              f"hit rate {stats['hit_rate']:.0%})")
+    finally:
+        server.stop()
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched LLM tender classification against a fake server")
+    parser.add_argument("--titles", type=int, default=5000, help="Number of titles to classify")
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated seconds per request")
+    parser.add_argument("--sample", type=int, default=20, help="Titles classified one request at a time")
+    parser.add_argument("--batch-size", type=int, default=50, help="Titles per batch request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch requests in flight")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests failing with HTTP 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of batch answers left out")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    raise SystemExit(main(args.titles, args.latency, args.sample, args.batch_size, args.concurrency,
+                          args.fail_rate, args.drop_rate))
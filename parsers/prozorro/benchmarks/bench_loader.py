@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the tender loaders: serial json, threaded reads and snapshots.
+
+Writes synthetic tender files to a temporary directory, then loads them
+with each loader. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_loader --tenders 20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Iterable
+
+from benchmarks.bench_analysis import make_tenders
+from core.loader import JSON_DECODER, SnapshotWriter, iter_tenders, list_tender_files
+
+
+def serial_json(directory: str) -> Iterable:
+    """Load the files one by one with the standard json module, as before the loader."""
+    for path in list_tender_files(directory):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield json.load(f)
+
+
+def run(name: str, load: Callable[[], Iterable], expected: int) -> None:
+    started = time.perf_counter()
+    count = sum(1 for _ in load())
+    elapsed = time.perf_counter() - started
+    status = '' if count == expected else f'  LOADED {count} OF {expected}'
+    print(f"{name:<28} {elapsed:>8.3f} s {count / elapsed:>12,.0f} tenders/s{status}")
+
+
+def main(count: int, workers: int) -> None:
+    tenders = make_tenders(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, 'parsed')
+        os.makedirs(directory)
+        for index, tender in enumerate(tenders):
+            with open(os.path.join(directory, f"tender-{index:07d}.json"), 'w', encoding='utf-8') as f:
+                json.dump(tender, f, ensure_ascii=False, indent=2)
+
+        snapshots = [os.path.join(tmp, name) for name in ('tenders.ndjson', 'tenders.ndjson.gz', 'tenders.pickle')]
+        for snapshot in snapshots:
+            with SnapshotWriter(snapshot) as writer:
+                for tender in tenders:
+                    writer.write(tender)
+
+        print(f"{count} tenders, {JSON_DECODER} decoder")
+        run("serial json.load", lambda: serial_json(directory), count)
+        run("serial reads", lambda: iter_tenders(directory, workers=1), count)
+        run(f"{workers} reader threads", lambda: iter_tenders(directory, workers=workers), count)
+        for snapshot in snapshots:
+            run(os.path.basename(snapshot), lambda: iter_tenders(snapshot), count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the tender loaders")
+    parser.add_argument("--tenders", type=int, default=20000, help="Number of synthetic tender files")
+    parser.add_argument("--workers", type=int, default=8, help="Number of reader threads")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    main(args.tenders, args.workers)
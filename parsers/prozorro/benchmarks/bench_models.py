@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of full vs lean parsing of search API responses.
+
+Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_models --pages 200 --per-page 100
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from core.base import BaseAPIClient
+from core.lean_models import parse_lean_search_response
+from core.models import TenderSearchResponse
+
+
+def make_tender(index: int) -> Dict[str, Any]:
+    """Build a realistic search result entry."""
+    return {
+        "procuringEntity": {
+            "identifier": {
+                "id": f"{40000000 + index}",
+                "scheme": "UA-EDR",
+                "legalName": f"Виконавчий комітет міської ради №{index}",
+                "legalName_en": f"Executive committee #{index}",
+            },
+            "address": {
+                "streetAddress": f"вулиця Сумська, {index % 200}",
+                "postalCode": f"{61000 + index % 999:05d}",
+                "locality": "Харків",
+                "countryName": "Україна",
+            },
+            "contactPoint": {
+                "name": "Іваненко Іван Іванович",
+                "telephone": "+380570000000",
+                "email": f"buyer{index}@example.gov.ua",
+                "name_en": "Ivan Ivanenko",
+            },
+            "kind": "general",
+            "name": f"Виконавчий комітет міської ради №{index}",
+            "name_en": f"Executive committee #{index}",
+        },
+        "enquiryPeriod": {
+            "startDate": "2023-06-07T10:00:00+03:00",
+            "endDate": "2023-06-14T10:00:00+03:00",
+            "clarificationsUntil": "2023-06-17T00:00:00+03:00",
+            "invalidationDate": None,
+        },
+        "tenderPeriod": {
+            "startDate": "2023-06-07T10:00:00+03:00",
+            "endDate": "2023-06-22T10:00:00+03:00",
+        },
+        "title": f"Поточний ремонт житлового будинку №{index}, пошкодженого внаслідок обстрілу",
+        "tenderID": f"UA-2023-06-07-{index:06d}-a",
+        "value": {"amount": 100000.0 + index, "valueAddedTaxIncluded": True, "currency": "UAH"},
+        "status": "complete",
+    }
+
+
+def make_pages(pages: int, per_page: int) -> List[str]:
+    """Build raw JSON bodies of search result pages."""
+    return [
+        json.dumps({
+            "page": page,
+            "per_page": per_page,
+            "total": pages * per_page,
+            "data": [make_tender(page * per_page + i) for i in range(per_page)],
+        }, ensure_ascii=False)
+        for page in range(pages)
+    ]
+
+
+def run(name: str, bodies: List[str], parse: Callable[[Dict[str, Any]], Any], touch: Callable[[Any], Any]) -> None:
+    """Parse every page, keep the results like a crawl does and report throughput and peak memory."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    results = []
+    for body in bodies:
+        response = parse(json.loads(body))
+        for tender in response.data:
+            touch(tender)
+        results.append(response)
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = sum(len(response.data) for response in results)
+    print(f"{name:<28} {count / elapsed:>12,.0f} tenders/s {elapsed:>8.3f} s {peak / 1024 / 1024:>9.1f} MiB peak")
+
+
+def main(pages: int, per_page: int) -> None:
+    """Run the full and lean parsing benchmarks on synthetic pages."""
+    bodies = make_pages(pages, per_page)
+    client = BaseAPIClient.__new__(BaseAPIClient)
+
+    def read_lean_fields(tender):
+        return tender.tender_id, tender.title, tender.status
+
+    print(f"{pages} pages x {per_page} tenders")
+    run("full TenderSearchResponse", bodies,
+        lambda data: client.parse_response(data, TenderSearchResponse), read_lean_fields)
+    run("lean TenderRecord", bodies, parse_lean_search_response, read_lean_fields)
+    run("lean + nested access", bodies, parse_lean_search_response,
+        lambda tender: tender.procuring_entity.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark full vs lean search response parsing")
+    parser.add_argument("--pages", type=int, default=100, help="Number of search pages")
+    parser.add_argument("--per-page", type=int, default=100, help="Tenders per page")
+
+    args = parser.parse_args()
+
+    main(args.pages, args.per_page)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the tender HTML parser on a stored corpus with golden output.
+
+The corpus in ``benchmarks/corpus`` holds tender pages rendered from the
+stored tenders: plain pages, pages with markup quirks and large synthetic
+pages with hundreds of awards and documents. ``corpus/golden`` holds the
+data each page must parse into. Every engine runs in a fresh process, and
+the benchmark reports pages per second, p50/p95 page latency and peak RSS
+of plain parsing, and the time spent building the tree and in each
+``_extract_*`` method from a separate pass instrumented with ``ParseStats``
+(whose timing wrappers are kept out of the headline figures), then diffs
+the output against the golden data. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_parser
+    python -m benchmarks.bench_parser --engines bs4 lxml --repeat 5
+    python -m benchmarks.bench_parser --update-golden
+    python -m benchmarks.bench_parser --build-corpus
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.tender_pages import load_stored_tenders, make_large_tender, render_tender_page
+from core.html_parser import PARSER_ENGINES, ParseStats, parse_tender_html
+
+CORPUS_DIR = Path(__file__).resolve().parent / 'corpus'
+
+def build_corpus(corpus_dir: Path, seed: int = 0) -> int:
+    """
+    Render the corpus pages from the stored tenders.
+
+    Args:
+        corpus_dir: Directory to write the pages to
+        seed: Random seed for markup quirks and synthetic tenders
+
+    Returns:
+        Number of pages written
+    """
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    tenders = load_stored_tenders()
+    pages = {}
+    for tender_id, data in tenders:
+        pages[f"plain_{tender_id}"] = render_tender_page(data)
+        pages[f"quirks_{tender_id}"] = render_tender_page(data, random.Random(f"{seed}-{tender_id}"), filler=5)
+
+    for index, (awards, documents, filler) in enumerate(((300, 300, 0), (500, 100, 0), (200, 200, 500))):
+        rng = random.Random(f"{seed}-large-{index}")
+        data = make_large_tender(tenders, rng, awards, documents)
+        pages[f"large_{index}_{awards}a_{documents}d"] = render_tender_page(data, rng, filler)
+
+    for name, html in pages.items():
+        (corpus_dir / f"{name}.html").write_text(html, encoding='utf-8')
+    return len(pages)
+
+
+def load_corpus(corpus_dir: Path) -> List[Tuple[str, str]]:
+    """Load the corpus pages as (name, html) tuples sorted by name."""
+    return [(path.stem, path.read_text(encoding='utf-8')) for path in sorted(corpus_dir.glob('*.html'))]
+
+
+def _rss_mib() -> float:
+    """Peak resident set size of the current process in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_engine(engine: str, corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Parse the whole corpus with one engine.
+
+    Meant to run in a fresh process, so that the peak RSS belongs to this
+    engine alone.
+
+    Args:
+        engine: Parser engine
+        corpus_dir: Directory with the corpus pages
+        repeat: Number of times every page is parsed
+
+    Returns:
+        Dictionary with the page latencies of plain parsing, the step timings
+        and total time of one pass instrumented with ParseStats, peak RSS
+        before and after plain parsing and the parse result of every page
+    """
+    pages = load_corpus(Path(corpus_dir))
+    base_rss = _rss_mib()
+
+    latencies = []
+    results = {}
+    for _ in range(repeat):
+        for name, html in pages:
+            started = time.perf_counter()
+            results[name] = parse_tender_html(html, engine)
+            latencies.append(time.perf_counter() - started)
+    peak_rss = _rss_mib()
+
+    stats = ParseStats()
+    started = time.perf_counter()
+    for _, html in pages:
+        parse_tender_html(html, engine, stats)
+    instrumented_seconds = time.perf_counter() - started
+
+    return {
+        'latencies': latencies,
+        'steps': stats.step_seconds,
+        'instrumented_seconds': instrumented_seconds,
+        'base_rss': base_rss,
+        'peak_rss': peak_rss,
+        'results': results,
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def diff_data(expected: Any, actual: Any, path: str = '') -> List[str]:
+    """
+    Compare parsed data with golden data.
+
+    Returns:
+        Paths of the differing values, e.g. ``awards[2].bid_amount``
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in sorted(set(expected) | set(actual)):
+            key_path = f"{path}.{key}" if path else key
+            if key not in actual:
+                differences.append(f"{key_path} (missing)")
+            elif key not in expected:
+                differences.append(f"{key_path} (unexpected)")
+            else:
+                differences.extend(diff_data(expected[key], actual[key], key_path))
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path} ({len(expected)} items expected, got {len(actual)})"]
+        differences = []
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            differences.extend(diff_data(expected_item, actual_item, f"{path}[{index}]"))
+        return differences
+    return [] if expected == actual else [path]
+
+
+def report(engine: str, stats: Dict[str, Any]) -> None:
+    """Print the throughput, latency and memory of plain parsing and the step timings of an engine."""
+    latencies = stats['latencies']
+    total = sum(latencies)
+    print(f"\n{engine}: {len(latencies) / total:,.1f} pages/s, "
+          f"p50 {_percentile(latencies, 0.5) * 1000:.2f} ms, p95 {_percentile(latencies, 0.95) * 1000:.2f} ms, "
+          f"peak RSS {stats['peak_rss']:.1f} MiB (+{stats['peak_rss'] - stats['base_rss']:.1f} MiB parsing)")
+    instrumented = stats['instrumented_seconds']
+    print(f"  steps of one instrumented pass ({instrumented * 1000:.1f} ms):")
+    for step, elapsed in sorted(stats['steps'].items(), key=lambda item: -item[1]):
+        print(f"  {step:<28} {elapsed * 1000:>10.1f} ms {elapsed / instrumented:>7.1%}")
+
+
+def check_golden(engine: str, results: Dict[str, Any], golden_dir: Path) -> int:
+    """
+    Diff the parse results of an engine against the golden data.
+
+    Returns:
+        Number of pages whose data differs or has no golden file
+    """
+    failures = 0
+    for name, data in results.items():
+        golden_file = golden_dir / f"{name}.json"
+        if not golden_file.exists():
+            failures += 1
+            print(f"  NO GOLDEN {name}")
+            continue
+        differences = diff_data(json.loads(golden_file.read_text(encoding='utf-8')), data)
+        if differences:
+            failures += 1
+            shown = ', '.join(differences[:5]) + (', ...' if len(differences) > 5 else '')
+            print(f"  MISMATCH {name}: {shown}")
+    print(f"  {engine}: {len(results) - failures}/{len(results)} pages match the golden data")
+    return failures
+
+
+def write_golden(results: Dict[str, Any], golden_dir: Path) -> None:
+    """Save parse results as the golden data, replacing the existing files."""
+    golden_dir.mkdir(parents=True, exist_ok=True)
+    for stale in golden_dir.glob('*.json'):
+        stale.unlink()
+    for name, data in results.items():
+        (golden_dir / f"{name}.json").write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the tender HTML parser against the golden corpus")
+    parser.add_argument("--corpus", default=str(CORPUS_DIR), help="Directory with the corpus pages")
+    parser.add_argument("--engines", nargs='+', choices=PARSER_ENGINES, default=list(PARSER_ENGINES),
+                        help="Parser engines to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times every page is parsed")
+    parser.add_argument("--build-corpus", action="store_true",
+                        help="Render the corpus pages from the stored tenders and write the golden data")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="Accept the output of the first engine as the new golden data")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed used by --build-corpus")
+
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus)
+    golden_dir = corpus_dir / 'golden'
+    if args.build_corpus:
+        for stale in corpus_dir.glob('*.html'):
+            stale.unlink()
+        print(f"Wrote {build_corpus(corpus_dir, args.seed)} pages to {corpus_dir}")
+
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        print(f"No pages in {corpus_dir}")
+        return 1
+    print(f"{len(pages)} pages, {sum(len(html) for _, html in pages) / 1024 / 1024:.1f} MiB, "
+          f"{args.repeat} repeats")
+
+    failures = 0
+    context = multiprocessing.get_context('spawn')
+    for index, engine in enumerate(args.engines):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            stats = executor.submit(run_engine, engine, str(corpus_dir), args.repeat).result()
+        report(engine, stats)
+
+        if index == 0 and (args.update_golden or args.build_corpus):
+            write_golden(stats['results'], golden_dir)
+            print(f"  wrote golden data of {len(stats['results'])} pages from {engine}")
+        else:
+            failures += check_golden(engine, stats['results'], golden_dir)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the incremental supplier and customer rankings against full
+analyses sorted at the end.
+
+Synthetic tenders spread over tens of thousands of suppliers and customers
+are fed to ``analyze_suppliers``/``analyze_customers`` followed by a top-k
+selection, and to the ranking accumulators with and without tender ID
+details. Reports the time and the peak memory of each and checks that they
+rank the same entities. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_ranking --tenders 300000 --suppliers 50000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.aggregation import AggregationEngine, CustomerAccumulator, SupplierAccumulator
+from core.ranking import CustomerRankingAccumulator, SupplierRankingAccumulator, top_entities
+
+
+def make_tenders(count: int, suppliers: int, customers: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build minimal tenders with awards and customers drawn from large populations."""
+    rng = random.Random(seed)
+    tenders = []
+    for index in range(count):
+        awards = []
+        for _ in range(rng.randrange(1, 4)):
+            awards.append({
+                'participant_name': f"ТОВ Постачальник {int(suppliers * rng.random() ** 3)}",
+                'decision': 'Переможець' if rng.random() < 0.6 else 'Відхилено',
+                'bid_amount': round(rng.uniform(1000, 5000000), 2),
+                'bid_currency': 'UAH',
+            })
+        tenders.append({
+            'tender_id': f"UA-2023-01-01-{index:06d}-a",
+            'customer': {
+                'name': f"Замовник {rng.randrange(customers)}",
+                'edrpou': f"{rng.randrange(10000000, 100000000)}",
+                'region': 'Київ',
+            },
+            'expected_cost': {'amount': round(rng.uniform(1000, 10000000), 2), 'currency': 'UAH'},
+            'awards': awards,
+        })
+    return tenders
+
+
+def full_analyses(tenders: List[Dict[str, Any]], k: int) -> Dict[str, Any]:
+    results = AggregationEngine() \
+        .register('suppliers', SupplierAccumulator()) \
+        .register('customers', CustomerAccumulator()) \
+        .run(tenders)
+    return {
+        name: {'by_value': top_entities(entities, k), 'by_count': top_entities(entities, k, 'tender_count')}
+        for name, entities in results.items()
+    }
+
+
+def rankings(tenders: List[Dict[str, Any]], k: int, details: bool) -> Dict[str, Any]:
+    return AggregationEngine() \
+        .register('suppliers', SupplierRankingAccumulator(k, details)) \
+        .register('customers', CustomerRankingAccumulator(k, details)) \
+        .run(tenders)
+
+
+def measure(run: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], float, int]:
+    """Run twice: once for the result and elapsed time, once traced for the peak memory."""
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce rankings to what every variant reports: names, counts and totals."""
+    return {
+        name: {
+            order: [(entity, record['tender_count'], record['total_value'],
+                     record.get('tender_id_count', len(record.get('tender_ids', ()))))
+                    for entity, record in top.items()]
+            for order, top in ranked.items()
+        }
+        for name, ranked in result.items()
+    }
+
+
+def main(count: int, suppliers: int, customers: int, k: int) -> int:
+    tenders = make_tenders(count, suppliers, customers)
+    print(f"{count} tenders, up to {suppliers} suppliers and {customers} customers, top {k}")
+
+    expected, baseline, baseline_peak = measure(lambda: full_analyses(tenders, k))
+    print(f"{'full analyses + sort':<24} {baseline:>8.3f} s {baseline_peak / 2 ** 20:>8.1f} MiB")
+
+    mismatches = 0
+    for label, details in (('rankings with IDs', True), ('compact rankings', False)):
+        result, elapsed, peak = measure(lambda: rankings(tenders, k, details))
+        same = _summary(result) == _summary(expected)
+        mismatches += not same
+        print(f"{label:<24} {elapsed:>8.3f} s {peak / 2 ** 20:>8.1f} MiB "
+              f"({baseline / elapsed:.1f}x, {baseline_peak / peak:.1f}x less memory)"
+              f"{'' if same else '  RANKINGS DIFFER'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental top-k rankings against full sorted analyses")
+    parser.add_argument("--tenders", type=int, default=300000, help="Number of synthetic tenders")
+    parser.add_argument("--suppliers", type=int, default=50000, help="Number of distinct suppliers")
+    parser.add_argument("--customers", type=int, default=30000, help="Number of distinct customers")
+    parser.add_argument("--top", type=int, default=10, help="Number of ranked entities")
+
+    args = parser.parse_args()
+
+    raise SystemExit(main(args.tenders, args.suppliers, args.customers, args.top))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark of report refreshes from the analysis store against full re-analysis.
+
+Writes synthetic tenders to a temporary directory, builds an analysis store
+from them, then changes, adds and removes a small share of the files (as a
+daily crawl would) and times refreshing the reports, including
+damaged_buildings.json, from the store against analyzing every file again. Run from the ``prozorro`` directory:
+
+    python -m benchmarks.bench_store --tenders 50000 --delta 500
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_analysis import make_tenders
+from core.analysis import build_summary_report, run_analyses
+from core.analysis_store import AnalysisStore
+from core.loader import iter_tenders
+
+
+def _write(directory: str, name: str, tender) -> None:
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        json.dump(tender, f, ensure_ascii=False)
+
+
+def main(count: int, delta: int, seed: int) -> int:
+    rng = random.Random(seed)
+    tenders = make_tenders(count + delta, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, 'parsed')
+        os.makedirs(directory)
+        for index, tender in enumerate(tenders[:count]):
+            _write(directory, f"tender_{index:07d}.json", tender)
+        store_path = os.path.join(tmp, 'analysis.sqlite')
+        print(f"{count} tenders, delta of {delta} changed, {delta} added and {delta} removed files")
+
+        started = time.perf_counter()
+        with AnalysisStore(store_path) as store:
+            store.sync_directory(directory)
+        print(f"{'initial store build':<24} {time.perf_counter() - started:>8.3f} s")
+
+        # A crawl changes some tenders, adds new ones and removes others
+        names = rng.sample(sorted(os.listdir(directory)), 2 * delta)
+        for name in names[:delta]:
+            os.remove(os.path.join(directory, name))
+        for index, name in enumerate(names[delta:]):
+            _write(directory, name, tenders[count + index])
+        for index in range(delta):
+            _write(directory, f"tender_new_{index:07d}.json", tenders[count + index])
+
+        started = time.perf_counter()
+        results = run_analyses(iter_tenders(directory), rankings_only=True)
+        expected = build_summary_report(results)
+        with open(os.path.join(tmp, 'damaged_buildings.json'), 'w', encoding='utf-8') as f:
+            json.dump(results['damaged_buildings'], f, ensure_ascii=False, indent=2)
+        full = time.perf_counter() - started
+        print(f"{'full re-analysis':<24} {full:>8.3f} s")
+
+        started = time.perf_counter()
+        with AnalysisStore(store_path) as store:
+            store.sync_directory(directory)
+            actual = build_summary_report(store.results(damaged_buildings=False))
+            store.write_damaged_buildings(os.path.join(tmp, 'damaged_buildings.json'))
+        incremental = time.perf_counter() - started
+        print(f"{'store refresh':<24} {incremental:>8.3f} s ({full / incremental:.1f}x)")
+
+    same = all(
+        list(expected[key]) == list(actual[key])
+        for key in ('regions', 'procurement_types', 'categories', 'top_suppliers', 'top_customers')
+    ) and expected['tender_count'] == actual['tender_count'] \
+        and round(expected['values']['total'], 2) == round(actual['values']['total'], 2)
+    print("reports match" if same else "REPORTS DIFFER")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark analysis store refreshes against full re-analysis")
+    parser.add_argument("--tenders", type=int, default=50000, help="Number of tender files")
+    parser.add_argument("--delta", type=int, default=500, help="Number of changed, added and removed files each")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    raise SystemExit(main(args.tenders, args.delta, args.seed))
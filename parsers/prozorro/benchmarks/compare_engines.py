@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Check that the parser engines extract identical tender data.
+
+Pages are rendered from the stored tenders (once in plain markup, which must
+parse back into the stored data, and again with random markup quirks) or
+read from a directory of downloaded HTML pages. Run from the ``prozorro``
+directory:
+
+    python -m benchmarks.compare_engines --variants 5 --filler 50
+    python -m benchmarks.compare_engines --html-dir output
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.tender_pages import expected_parse, load_stored_tenders, render_tender_page
+from core.html_parser import PARSER_ENGINES, parse_tender_html
+
+
+def _dump(data) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def rendered_pages(variants: int, filler: int, seed: int) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Render pages from the stored tenders.
+
+    Returns:
+        Tuple of (list of (name, html) pages, expected JSON of the plain pages by name)
+    """
+    pages = []
+    expected = {}
+    for tender_id, data in load_stored_tenders():
+        pages.append((tender_id, render_tender_page(data)))
+        expected[tender_id] = _dump(expected_parse(data))
+        for variant in range(variants):
+            rng = random.Random(f"{seed}-{tender_id}-{variant}")
+            pages.append((f"{tender_id}#{variant}", render_tender_page(data, rng, filler)))
+    return pages, expected
+
+
+def compare(pages: List[Tuple[str, str]], expected: Dict[str, str]) -> int:
+    """
+    Parse every page with every engine and report differences.
+
+    Returns:
+        Number of pages with differences
+    """
+    timings = {engine: 0.0 for engine in PARSER_ENGINES}
+    mismatches = 0
+
+    for name, html in pages:
+        results = {}
+        for engine in timings:
+            started = time.perf_counter()
+            results[engine] = _dump(parse_tender_html(html, engine))
+            timings[engine] += time.perf_counter() - started
+
+        differing = [engine for engine in PARSER_ENGINES if results[engine] != results['bs4']]
+        if differing:
+            mismatches += 1
+            print(f"MISMATCH {name}: {', '.join(differing)} extracted different data than bs4")
+        elif name in expected and results['bs4'] != expected[name]:
+            mismatches += 1
+            print(f"MISMATCH {name}: parsed data differs from the stored tender")
+
+    for engine, elapsed in timings.items():
+        print(f"{engine:<12} {len(pages) / elapsed:>10,.1f} pages/s {elapsed:>8.3f} s "
+              f"{timings['bs4'] / elapsed:>6.1f}x bs4")
+    print(f"{len(pages)} pages, {mismatches} mismatches")
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the tender parser engines")
+    parser.add_argument("--html-dir", help="Directory with downloaded tender HTML pages to compare instead")
+    parser.add_argument("--variants", type=int, default=5, help="Quirky variants rendered per stored tender")
+    parser.add_argument("--filler", type=int, default=20, help="Filler lots added to quirky variants")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for markup quirks")
+
+    args = parser.parse_args()
+
+    if args.html_dir:
+        pages = [(path.name, path.read_text(encoding='utf-8')) for path in sorted(Path(args.html_dir).glob('*.html'))]
+        expected = {}
+    else:
+        pages, expected = rendered_pages(args.variants, args.filler, args.seed)
+
+    if not pages:
+        print("No pages to compare")
+        return 1
+    return 1 if compare(pages, expected) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
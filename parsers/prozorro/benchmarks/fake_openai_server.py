@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Local fake of the OpenAI chat completions API for exercising BuildingAnalyzer.
+
+Answers single-title prompts with YES/NO text and batch prompts with the
+JSON answers object, classifying titles by keyword or by a given oracle
+function (e.g. a lookup of hand-labelled titles). It can simulate model
+latency, failing requests (HTTP 500) and answers missing from batch
+responses. Point the analyzer at it with ``base_url``:
+
+    server = FakeOpenAIServer(latency=0.2).start()
+    analyzer = BuildingAnalyzer(api_key='test', base_url=server.base_url)
+    ...
+    server.stop()
+
+or run it on its own:
+
+    python -m benchmarks.fake_openai_server --port 8765
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Stems of building-related words; titles containing one are answered YES
+BUILDING_STEMS = ('будів', 'ремонт', 'відновл', 'реконструкц', 'будинк', 'житл', 'квартир', 'дах', 'покрівл')
+
+_SINGLE_TITLE_RE = re.compile(r'Text: "(.*)"', re.DOTALL)
+
+
+def is_building_title(title: str, stems: Iterable[str] = BUILDING_STEMS) -> bool:
+    """Return the fake model's answer for a title."""
+    title = title.lower()
+    return any(stem in title for stem in stems)
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible chat completions endpoint running in a background thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 latency_per_item: float = 0.0, fail_rate: float = 0.0, drop_rate: float = 0.0, seed: int = 0,
+                 oracle: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds every request takes
+            latency_per_item: Extra seconds per title of a batch request
+            fail_rate: Share of requests answered with HTTP 500
+            drop_rate: Share of batch items left out of the answers
+            seed: Seed of the simulated failures
+            oracle: Function answering whether a title is building-related
+                (``is_building_title`` by default)
+        """
+        self.latency = latency
+        self.latency_per_item = latency_per_item
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.oracle = oracle or is_building_title
+        self.requests = 0
+        self.items = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the OpenAI clients."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        self._server.server_close()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def answer(self, prompt: str) -> Tuple[int, Optional[str]]:
+        """
+        Produce the reply to a user prompt.
+
+        Returns:
+            Tuple of (HTTP status, message content or None on failure)
+        """
+        if 'Texts:' in prompt:
+            items = json.loads(prompt.split('Texts:', 1)[1])
+        else:
+            match = _SINGLE_TITLE_RE.search(prompt)
+            items = [{'id': 1, 'text': match.group(1) if match else prompt}]
+        with self._lock:
+            self.requests += 1
+            self.items += len(items)
+        time.sleep(self.latency + self.latency_per_item * len(items))
+
+        if self.fail_rate and self._random() < self.fail_rate:
+            return 500, None
+        if 'Texts:' not in prompt:
+            return 200, 'YES' if self.oracle(items[0]['text']) else 'NO'
+        answers = [
+            {'id': item['id'], 'answer': 'YES' if self.oracle(item['text']) else 'NO'}
+            for item in items
+            if not (self.drop_rate and self._random() < self.drop_rate)
+        ]
+        return 200, json.dumps({'answers': answers}, ensure_ascii=False)
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                prompt = next((message['content'] for message in reversed(request.get('messages', []))
+                               if message.get('role') == 'user'), '')
+                status, content = server.answer(prompt)
+                if content is None:
+                    body: Dict[str, Any] = {'error': {'message': 'Simulated failure', 'type': 'server_error'}}
+                else:
+                    body = {
+                        'id': 'chatcmpl-fake',
+                        'object': 'chat.completion',
+                        'created': int(time.time()),
+                        'model': request.get('model', 'fake'),
+                        'choices': [{
+                            'index': 0,
+                            'message': {'role': 'assistant', 'content': content},
+                            'finish_reason': 'stop',
+                        }],
+                        'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                    }
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request takes")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests failing with HTTP 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of batch answers left out")
+
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(args.host, args.port, args.latency, fail_rate=args.fail_rate, drop_rate=args.drop_rate)
+    print(f"Serving fake OpenAI API at {fake.base_url}")
+    fake.serve_forever()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Prozorro search API and tender pages.
+
+Answers ``POST /api/search/tenders`` with pages of synthetic tenders (every
+other one building-related, spread over regions 61 to 64 and filtered by the
+``region`` parameter) and ``GET /tender/<id>`` with one of the stored
+tender pages of the benchmark corpus. It can simulate latency, missing (404)
+and truncated tender pages, and counts the requests it serves, including the highest number in flight at once. Point a
+scraper at it with ``base_url`` and ``tender_page_url``:
+
+    server = FakeProzorroServer(total=100).start()
+    scraper = ProzorroScraper(server.base_url)
+    scraper.tender_page_url = server.tender_page_url
+    ...
+    server.stop()
+
+or run it on its own:
+
+    python -m benchmarks.fake_prozorro_server --port 8766
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.bench_models import make_tender
+from core.planner import expand_regions
+
+CORPUS_DIR = Path(__file__).parent / 'corpus'
+
+
+def make_search_tender(index: int) -> Dict[str, Any]:
+    """Build a search result entry; odd ones are not building-related."""
+    tender = make_tender(index)
+    if index % 2:
+        tender['title'] = f"Закупівля канцелярського приладдя №{index}"
+    return tender
+
+
+def tender_region(index: int) -> str:
+    """Return the region code of a search result entry."""
+    return str(61 + index % 4)
+
+
+class FakeProzorroServer:
+    """Prozorro-compatible search endpoint and tender pages running in a background thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, total: int = 100, latency: float = 0.0,
+                 missing_pages: Iterable[str] = (), truncated_pages: Iterable[str] = ()):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            total: Number of tenders matching a search without a region filter
+            latency: Seconds every request takes
+            missing_pages: IDs of tenders whose page is answered with 404
+            truncated_pages: IDs of tenders whose page breaks off half way
+        """
+        self.total = total
+        self.latency = latency
+        self.missing_pages = set(missing_pages)
+        self.truncated_pages = set(truncated_pages)
+        self.pages = [path.read_text(encoding='utf-8') for path in sorted(CORPUS_DIR.glob('plain_*.html'))]
+        self.search_requests = 0
+        self.page_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        """Scheme, host and port of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the Prozorro API clients."""
+        return f"{self.address}/api"
+
+    @property
+    def tender_page_url(self) -> str:
+        """Tender page URL format to set on the Prozorro API clients."""
+        return f"{self.address}/tender/{{tender_id}}"
+
+    def start(self) -> 'FakeProzorroServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        self._server.server_close()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _enter(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def search(self, page: int, per_page: int, region: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Produce a page of search results.
+
+        Args:
+            page: Page number (1-based)
+            per_page: Number of results per page
+            region: Optional region filter such as '61-62'
+
+        Returns:
+            The search response body
+        """
+        indices = range(self.total)
+        if region:
+            regions = set(expand_regions(region))
+            indices = [index for index in indices if tender_region(index) in regions]
+        start = max(0, page - 1) * per_page
+        data: List[Dict[str, Any]] = [make_search_tender(index) for index in indices[start:start + per_page]]
+        return {'page': page, 'per_page': per_page, 'total': len(indices), 'data': data}
+
+    def tender_page(self, tender_id: str) -> str:
+        """Return the HTML page served for a tender."""
+        return self.pages[sum(map(ord, tender_id)) % len(self.pages)]
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, content_type: str, data: bytes) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                if url.path != '/api/search/tenders':
+                    self._reply(404, 'text/plain', b'Not found')
+                    return
+                query = parse_qs(url.query)
+                server._enter('search_requests')
+                try:
+                    time.sleep(server.latency)
+                    body = server.search(
+                        int(query.get('page', ['1'])[0]),
+                        int(query.get('per_page', ['20'])[0]),
+                        query.get('region', [None])[0]
+                    )
+                finally:
+                    server._leave()
+                self._reply(200, 'application/json', json.dumps(body, ensure_ascii=False).encode('utf-8'))
+
+            def do_GET(self) -> None:
+                path = urlparse(self.path).path
+                if not path.startswith('/tender/'):
+                    self._reply(404, 'text/plain', b'Not found')
+                    return
+                tender_id = path[len('/tender/'):]
+                server._enter('page_requests')
+                try:
+                    time.sleep(server.latency)
+                    html = server.tender_page(tender_id)
+                finally:
+                    server._leave()
+                if tender_id in server.missing_pages:
+                    self._reply(404, 'text/plain', b'Not found')
+                    return
+                data = html.encode('utf-8')
+                if tender_id in server.truncated_pages:
+                    # Announce the whole page but send only half of it
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data[:len(data) // 2])
+                    self.close_connection = True
+                    return
+                self._reply(200, 'text/html; charset=utf-8', data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Prozorro search API and tender page server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on")
+    parser.add_argument("--total", type=int, default=100, help="Number of tenders matching a search")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request takes")
+
+    args = parser.parse_args()
+
+    fake = FakeProzorroServer(args.host, args.port, args.total, args.latency)
+    print(f"Serving fake Prozorro API at {fake.base_url}")
+    fake.serve_forever()
@@ -0,0 +1,275 @@
+"""
+Synthetic Prozorro tender pages for parser benchmarks and engine comparisons.
+
+Only the parsed JSON of tenders is kept in the repository, so pages are
+rebuilt from it in the markup of prozorro.gov.ua. Parsing a page rendered
+from a stored tender gives back that tender (without the coordinates added
+by the location guesser, and with the ISO dates the parser adds). Given a random generator, pages also get the
+markup variations that make HTML parsing tricky: comments, scripts,
+whitespace-only text, wrapper elements and single-string elements that
+match the parser's text lookups.
+"""
+
+import copy
+import glob
+import json
+import os
+import random
+import re
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.dates import add_iso_dates
+
+TENDERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tenders')
+
+# Fields added to stored tenders after parsing
+GEO_FIELDS = ('latitude', 'longitude')
+
+
+def load_stored_tenders(tenders_dir: str = TENDERS_DIR) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Load the stored tenders.
+
+    Args:
+        tenders_dir: Directory with tender JSON files
+
+    Returns:
+        List of (tender ID, tender data) tuples sorted by ID
+    """
+    tenders = []
+    for path in sorted(glob.glob(os.path.join(tenders_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            tenders.append((os.path.splitext(os.path.basename(path))[0], json.load(f)))
+    return tenders
+
+
+def strip_geo_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a stored tender without the fields added by the location guesser."""
+    return {key: value for key, value in data.items() if key not in GEO_FIELDS}
+
+
+def expected_parse(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return what parsing the page rendered from a stored tender gives."""
+    expected = copy.deepcopy(strip_geo_fields(data))
+    add_iso_dates(expected)
+    return expected
+
+
+def _money(amount: float) -> str:
+    """Format an amount the way tender pages do, e.g. ``416 662,96``."""
+    text = format(amount, ',.2f').replace(',', ' ').replace('.', ',')
+    if float(text.replace(' ', '').replace(',', '.')) != amount:
+        text = repr(amount).replace('.', ',')
+    return text
+
+
+def _split_time(date_text: str) -> Tuple[str, str]:
+    """Split ``19 грудня 2022 13:05`` style dates into the date and the time."""
+    match = re.match(r'(.*\d{4})\s*(\d{2}:\d{2})$', date_text)
+    if not match:
+        return date_text, ''
+    return match.group(1).strip(), match.group(2)
+
+
+def _split_award_time(date_text: str) -> Tuple[str, str]:
+    """Undo the parser's clean-up of award dates (``19 грудня  2022 13:05``) and split off the time."""
+    match = re.match(r'(.*?) (\d{4}) (\d{2}:\d{2})$', date_text)
+    if not match:
+        return _split_time(date_text)
+    return match.group(1) + match.group(2), match.group(3)
+
+
+class _Quirks:
+    """Random markup variations applied to a page."""
+
+    def __init__(self, rng: Optional[random.Random]):
+        self.rng = rng
+
+    def chance(self, probability: float = 0.5) -> bool:
+        return self.rng is not None and self.rng.random() < probability
+
+    def space(self) -> str:
+        """Whitespace between elements."""
+        if self.rng is None:
+            return '\n'
+        return self.rng.choice(['', ' ', '\n', '\n    ', '\t\n  \n'])
+
+    def comment(self) -> str:
+        return '<!-- tender -->' if self.chance(0.3) else ''
+
+    def wrap(self, html: str) -> str:
+        """Optionally wrap content in inline elements that do not change its text."""
+        if self.chance(0.3):
+            return f'<span>{html}</span>'
+        if self.chance(0.2):
+            return f'<span><b>{html}</b></span>'
+        return html
+
+
+def render_tender_page(data: Dict[str, Any], rng: Optional[random.Random] = None, filler: int = 0) -> str:
+    """
+    Render a tender page that parses back into the given tender data.
+
+    Args:
+        data: Parsed tender data, e.g. a stored tender
+        rng: Random generator for markup quirks (None renders plain markup
+            whose parse result equals ``data``)
+        filler: Number of extra lots to add, making the page larger without
+            changing the parsed data
+
+    Returns:
+        HTML of the tender page
+    """
+    q = _Quirks(rng)
+    sp = q.space
+    parts = [
+        '<!DOCTYPE html>', '<html lang="uk">', '<head>', '<meta charset="utf-8">',
+        f'<title>{escape(data.get("title", ""))} | Prozorro</title>',
+        '<script>window.dataLayer = []; var label = "Найменування Дата оприлюднення";</script>',
+        '<style>.tender--head--title { font-weight: bold; }</style>',
+        '</head>', '<body class="tender-page">',
+        '<nav class="navbar"><ul><li><a href="/">Головна</a></li><li><a href="/search">Пошук</a></li></ul></nav>',
+        '<div class="container"><div class="row"><div class="col-sm-9">',
+    ]
+
+    # Head: title, ID, hash and status
+    parts.append('<div class="tender--head">')
+    if 'title' in data:
+        parts.append(f'<h1 class="tender--head--title">{sp()}{q.wrap(escape(data["title"]))}{sp()}</h1>')
+    inf = []
+    if 'tender_id' in data:
+        inf.append(f'<span class="tender--head--id">{data["tender_id"]}</span>')
+    if 'tender_hash' in data:
+        inf.append(f'●{q.comment()}<span class="js-hash">{data["tender_hash"]}</span>')
+    if 'status' in data:
+        inf.append(f'<span class="marked">{q.wrap(escape(data["status"]))}</span>')
+    if inf:
+        parts.append(f'<div class="tender--head--inf">{sp().join(inf)}</div>')
+    parts.append('</div>')
+
+    if q.chance(0.5):
+        # A publication date lookup only matches a div whose single string holds the label
+        parts.append('<div class="tender--head--date"><span class="date">Дата оприлюднення 07.06.2023</span></div>')
+    else:
+        parts.append('<div class="tender--head--date">Дата оприлюднення: <span class="date">07 червня 2023</span></div>')
+
+    if 'expected_cost' in data:
+        cost = data['expected_cost']
+        parts.append(
+            '<div class="tender--description--cost">Очікувана вартість'
+            f'<div class="tender--description--cost--number"><strong>{_money(cost["amount"])}'
+            f'{sp()}<span class="small">{cost["currency"]}</span></strong></div></div>'
+        )
+
+    # Customer table; rows with a label and a value cell never have a single string
+    customer = data.get('customer') or {}
+    parts.append('<div class="tender--customer--inner"><table class="tender--customer">')
+    for label, key in (('Найменування:', 'name'), ('ЄДРПОУ:', 'edrpou'), ('Місцезнаходження:', 'location'),
+                       ('Категорія:', 'category')):
+        value = customer.get(key, 'Виконавчий комітет' if key == 'name' else '')
+        parts.append(f'<tr>{sp()}<td class="col-sm-4">{label}</td><td class="col-sm-6">{escape(value)}</td></tr>')
+    parts.append('<tr><td class="col-sm-4">Контактна особа:</td><td class="col-sm-6">Іваненко Іван'
+                 '<br>+380440000000<br>buyer@example.gov.ua</td></tr>')
+    parts.append('</table></div>')
+
+    # Subject of the procurement
+    subject = data.get('subject')
+    if subject is not None:
+        parts.append('<div class="margin-bottom margin-bottom-more">')
+        parts.append('<p><strong>Вид предмету закупівлі:</strong> Роботи</p>')
+        parts.append('<p>Класифікатор ДК 021:2015: <span>45453000-7</span></p>')
+        parts.append('<div class="row"><div class="col-md-8">')
+        if 'description' in subject:
+            parts.append(
+                f'<div class="tender--description--text description">{sp()}{q.wrap(escape(subject["description"]))}</div>'
+            )
+        if 'delivery_place' in subject:
+            label = 'Місце поставки товарів або місце виконання робіт чи надання послуг:'
+            parts.append(f'<div>{label} {escape(subject["delivery_place"])}</div>')
+        parts.append('<div>Строк поставки товарів, виконання робіт чи надання послуг: <b>31.12.2023</b></div>')
+        parts.append('</div><div class="col-md-4">')
+        if 'quantity' in subject:
+            parts.append(f'<div class="padding margin-bottom">{escape(subject["quantity"])}</div>')
+        parts.append('</div></div></div>')
+
+    # Filler lots and history, matched by none of the parser's lookups
+    for index in range(filler):
+        parts.append(
+            f'<div class="tender--lot">{q.comment()}<h3>Лот {index + 1}</h3>'
+            f'<p>Опис лоту {index + 1}: ремонт покрівлі, заміна вікон, відновлення фасаду.</p>'
+            f'<ul><li>Статус: <span>активний</span></li><li>Сума: {_money(1000.0 + index)} UAH</li></ul></div>'
+        )
+
+    # Awards
+    awards = data.get('awards')
+    if awards is not None:
+        parts.append('<table class="table table-striped"><thead><tr><th>Учасник</th><th>Рішення</th>'
+                     '<th>Пропозиція</th><th>Опубліковано</th></tr></thead><tbody>')
+        for award in awards:
+            participant = f'<strong>{escape(award.get("participant_name", ""))}</strong>'
+            if 'participant_edrpou' in award:
+                participant += f'<div>#{award["participant_edrpou"]}</div>'
+            if 'bid_amount' in award:
+                bid = f'{_money(award["bid_amount"])}<div>{award.get("bid_currency", "")} з ПДВ</div>'
+            else:
+                bid = 'Не вказано'
+            day, time = _split_award_time(award.get('publication_date', ''))
+            parts.append(
+                f'<tr>{sp()}<td>{participant}</td><td>{q.wrap(escape(award.get("decision", "")))}</td>'
+                f'<td>{bid}</td><td>{day}{sp()}<div>{time}</div></td></tr>'
+            )
+        parts.append('</tbody></table>')
+
+    # Documents
+    documents = data.get('documents')
+    if documents:
+        parts.append('<div class="documents-tabs"><table class="tender--customer">')
+        for document in documents:
+            day, time = _split_time(document.get('date', ''))
+            parts.append(
+                f'<tr><td><div class="date">{day}<br>{time}</div></td>'
+                f'<td>{q.comment()}<a href="{escape(document.get("url", ""))}">{escape(document.get("title", ""))}</a></td></tr>'
+            )
+        parts.append('</table></div>')
+
+    parts.append('</div><div class="col-sm-3"><div class="sidebar">Поділитися</div></div></div></div>')
+    parts.append('<footer><p>© Prozorro</p><script>console.log("Дата оприлюднення");</script></footer>')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def make_large_tender(
+    tenders: List[Tuple[str, Dict[str, Any]]],
+    rng: random.Random,
+    awards: int = 300,
+    documents: int = 300
+) -> Dict[str, Any]:
+    """
+    Build a tender with many awards and documents from the stored tenders.
+
+    Args:
+        tenders: Stored tenders, as returned by ``load_stored_tenders``
+        rng: Random generator picking the base tender, awards and documents
+        awards: Number of awards
+        documents: Number of documents
+
+    Returns:
+        Tender data for ``render_tender_page``
+    """
+    award_pool = [award for _, data in tenders for award in data.get('awards') or []]
+    document_pool = [document for _, data in tenders for document in data.get('documents') or []]
+
+    data = strip_geo_fields(rng.choice(tenders)[1])
+    data['awards'] = []
+    for _ in range(awards):
+        award = dict(rng.choice(award_pool))
+        if 'participant_edrpou' in award:
+            award['participant_edrpou'] = str(rng.randrange(10000000, 100000000))
+        data['awards'].append(award)
+    data['documents'] = []
+    for index in range(documents):
+        document = dict(rng.choice(document_pool))
+        document['url'] = f"https://public-docs.prozorro.gov.ua/get/{rng.getrandbits(128):032x}?n={index}"
+        data['documents'].append(document)
+    return data
@@ -1,29 +1,46 @@
 from core.scraper import ProzorroScraper
+from core.async_scraper import AsyncProzorroScraper
+from core.rate_limit import TokenBucket
+from core.governor import DEFAULT_GOVERNOR_LIMITS, RequestGovernor, GovernorStats, get_default_governor
+from core.planner import CrawlPlanner
 from core.models import (
     Tender, 
     TenderSearchResponse, 
     SearchParams,
     ProcuringEntity,
-    Value
+    Value,
+    CrawlShard,
+    ShardedCrawlResult
 )
 from core.exceptions import (
     ProzorroAPIError,
     ProzorroConnectionError,
     ProzorroResponseError,
-    ProzorroParsingError
+    ProzorroParsingError,
+    ProzorroCircuitOpenError
 )
 
 __all__ = [
     'ProzorroScraper',
+    'AsyncProzorroScraper',
+    'TokenBucket',
+    'RequestGovernor',
+    'GovernorStats',
+    'get_default_governor',
+    'DEFAULT_GOVERNOR_LIMITS',
+    'CrawlPlanner',
     'Tender',
     'TenderSearchResponse',
     'SearchParams',
     'ProcuringEntity',
     'Value',
+    'CrawlShard',
+    'ShardedCrawlResult',
     'ProzorroAPIError',
     'ProzorroConnectionError',
     'ProzorroResponseError',
     'ProzorroParsingError',
+    'ProzorroCircuitOpenError',
 ]
 
 # Core package for the Prozorro tools 
\ No newline at end of file
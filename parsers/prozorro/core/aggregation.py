@@ -0,0 +1,359 @@
+"""
+Single-pass aggregation of tender data.
+
+Every analysis is an accumulator that looks at one tender at a time and
+produces its result at the end. ``AggregationEngine`` visits the tenders
+once and feeds each tender to all registered accumulators, so any number of
+analyses costs a single pass over the data, which may also be a stream.
+"""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.dates import to_iso
+from core.matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Keywords related to damaged buildings or repairs (in Ukrainian)
+DAMAGED_BUILDING_KEYWORDS = [
+    'пошкодж', 'руйнув', 'зруйнов', 'відновл', 'реконструкц',
+    'відбудов', 'ремонт', 'віднов', 'реставрац'
+]
+
+_REGION_RE = re.compile(r'Україна,\s+(.*?(?:область|місто|Київ|Крим))')
+
+def tender_region(tender: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the region of a tender.
+
+    Args:
+        tender: Tender data dictionary
+
+    Returns:
+        The region from the location data, the customer data or the delivery
+        place, in that order, or None if none of them has one
+    """
+    # Try to get region from location data
+    if 'location' in tender and 'region' in tender['location']:
+        return tender['location']['region']
+    # Try to get region from customer data
+    if 'customer' in tender and 'region' in tender['customer']:
+        return tender['customer']['region']
+    # Try to get region from subject data
+    if 'subject' in tender and 'delivery_place' in tender['subject']:
+        region_match = _REGION_RE.search(tender['subject']['delivery_place'])
+        if region_match:
+            return region_match.group(1).strip()
+    return None
+
+
+def publication_date_iso(tender: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the publication date of a tender in ISO format.
+
+    Tenders parsed by the current parser carry the ISO date; for older
+    parsed data it is derived from the date text.
+
+    Args:
+        tender: Tender data dictionary
+
+    Returns:
+        ``YYYY-MM-DD...`` date, or None if the tender has no recognisable
+        publication date
+    """
+    dates = tender.get('dates')
+    if not dates:
+        return None
+    if 'publication_date_iso' in dates:
+        return dates['publication_date_iso']
+    return to_iso(dates.get('publication_date'))
+
+
+class Accumulator:
+    """Base class of analyses computed one tender at a time."""
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        """
+        Account for one tender.
+
+        Args:
+            tender: Tender data dictionary
+        """
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """
+        Return the result of the analysis over every tender added so far.
+
+        Returns:
+            JSON-serialisable result
+        """
+        raise NotImplementedError
+
+
+class TenderCountAccumulator(Accumulator):
+    """Number of tenders."""
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class RegionAccumulator(Accumulator):
+    """Number of tenders per region, most common first."""
+
+    def __init__(self):
+        self.regions = Counter()
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        region = tender_region(tender)
+        if region is not None:
+            self.regions[region] += 1
+
+    def result(self) -> Dict[str, int]:
+        return dict(self.regions.most_common())
+
+
+class FieldCountAccumulator(Accumulator):
+    """Number of tenders per value of a field, most common first."""
+
+    def __init__(self, field: str, section: Optional[str] = None):
+        """
+        Initialize the accumulator.
+
+        Args:
+            field: Name of the field to count
+            section: Name of the nested dictionary holding the field, if any
+        """
+        self.field = field
+        self.section = section
+        self.counts = Counter()
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        data = tender if self.section is None else tender.get(self.section)
+        if data is not None and self.field in data:
+            self.counts[data[self.field]] += 1
+
+    def result(self) -> Dict[str, int]:
+        return dict(self.counts.most_common())
+
+
+class SupplierAccumulator(Accumulator):
+    """Winning suppliers with their tender counts and total bid value."""
+
+    def __init__(self):
+        self.suppliers = defaultdict(lambda: {
+            'tender_count': 0,
+            'total_value': 0,
+            'currencies': set(),
+            'tender_ids': set()
+        })
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        if 'awards' not in tender or not tender['awards']:
+            return
+        for award in tender['awards']:
+            if 'participant_name' in award and award['decision'] == 'Переможець':
+                supplier = self.suppliers[award['participant_name']]
+                supplier['tender_count'] += 1
+
+                if 'tender_id' in tender:
+                    supplier['tender_ids'].add(tender['tender_id'])
+
+                if 'bid_amount' in award and 'bid_currency' in award:
+                    supplier['total_value'] += award['bid_amount']
+                    supplier['currencies'].add(award['bid_currency'])
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        # Convert sets to sorted lists for JSON serialization and a deterministic output
+        return {
+            name: dict(supplier, currencies=sorted(supplier['currencies']), tender_ids=sorted(supplier['tender_ids']))
+            for name, supplier in self.suppliers.items()
+        }
+
+
+class CustomerAccumulator(Accumulator):
+    """Procuring entities with their tender counts and total expected value."""
+
+    def __init__(self):
+        self.customers = defaultdict(lambda: {
+            'tender_count': 0,
+            'total_value': 0,
+            'currencies': set(),
+            'tender_ids': set(),
+            'edrpou': None,
+            'region': None
+        })
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        if 'customer' not in tender or 'name' not in tender['customer']:
+            return
+        customer = self.customers[tender['customer']['name']]
+        customer['tender_count'] += 1
+
+        if 'tender_id' in tender:
+            customer['tender_ids'].add(tender['tender_id'])
+
+        if 'expected_cost' in tender:
+            cost = tender['expected_cost']
+            customer['total_value'] += cost.get('amount', 0)
+            customer['currencies'].add(cost.get('currency', 'UAH'))
+
+        if 'edrpou' in tender['customer'] and not customer['edrpou']:
+            customer['edrpou'] = tender['customer']['edrpou']
+
+        if 'region' in tender['customer'] and not customer['region']:
+            customer['region'] = tender['customer']['region']
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        # Convert sets to sorted lists for JSON serialization and a deterministic output
+        return {
+            name: dict(customer, currencies=sorted(customer['currencies']), tender_ids=sorted(customer['tender_ids']))
+            for name, customer in self.customers.items()
+        }
+
+
+class ValueAccumulator(Accumulator):
+    """Statistics of the expected tender values, in total and by year, month and category."""
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+        self.min = float('inf')
+        self.max = 0
+        self.by_year = defaultdict(int)
+        self.by_month = defaultdict(int)
+        self.by_category = defaultdict(int)
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        if 'expected_cost' not in tender or 'amount' not in tender['expected_cost']:
+            return
+        amount = tender['expected_cost']['amount']
+        self.total += amount
+        self.count += 1
+        self.min = min(self.min, amount)
+        self.max = max(self.max, amount)
+
+        # Group by year and month of the publication date if available
+        iso_date = publication_date_iso(tender)
+        if iso_date:
+            self.by_year[iso_date[:4]] += amount
+            self.by_month[iso_date[:7]] += amount
+
+        # Group by category
+        if 'subject' in tender and 'classifier_name' in tender['subject']:
+            self.by_category[tender['subject']['classifier_name']] += amount
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'count': self.count,
+            'average': self.total / self.count if self.count > 0 else 0,
+            # No tenders with a value leave min at 0
+            'min': 0 if self.min == float('inf') else self.min,
+            'max': self.max,
+            'currency': 'UAH',
+            'by_year': dict(self.by_year),
+            'by_month': dict(self.by_month),
+            'by_category': dict(self.by_category),
+        }
+
+
+class DamagedBuildingAccumulator(Accumulator):
+    """Tenders whose title or description mentions damaged buildings or their repair."""
+
+    def __init__(self, matcher: Optional[KeywordMatcher] = None, min_score: Optional[float] = None):
+        """
+        Initialize the accumulator.
+
+        Args:
+            matcher: Keyword matcher (DAMAGED_BUILDING_KEYWORDS by default)
+            min_score: Minimum total keyword weight of a matching tender; if
+                given, the score is added to the analysis data. By default
+                any keyword match is enough.
+        """
+        self.matcher = KeywordMatcher(DAMAGED_BUILDING_KEYWORDS) if matcher is None else matcher
+        self.min_score = min_score
+        self.tenders: List[Dict[str, Any]] = []
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        subject = tender.get('subject') or {}
+        matched_keywords = self.matcher.keywords_in(tender.get('title'), subject.get('description'))
+        if not matched_keywords:
+            return
+
+        analysis = {
+            'is_damaged_building': True,
+            'matched_keywords': matched_keywords
+        }
+        if self.min_score is not None:
+            score = sum(self.matcher.weights[keyword] for keyword in matched_keywords)
+            if score < self.min_score:
+                return
+            analysis['score'] = score
+
+        # Add analysis data to the tender
+        tender_copy = tender.copy()
+        tender_copy['analysis'] = analysis
+        self.tenders.append(tender_copy)
+
+    def result(self) -> List[Dict[str, Any]]:
+        return self.tenders
+
+
+class AggregationEngine:
+    """
+    Runs any number of accumulators in a single pass over the tenders.
+
+    Example:
+        engine = AggregationEngine()
+        engine.register('regions', RegionAccumulator())
+        engine.register('values', ValueAccumulator())
+        results = engine.run(tenders)
+    """
+
+    def __init__(self):
+        self.accumulators: Dict[str, Accumulator] = {}
+
+    def register(self, name: str, accumulator: Accumulator) -> 'AggregationEngine':
+        """
+        Register an accumulator under a name.
+
+        Args:
+            name: Name of the accumulator's result
+            accumulator: The accumulator
+
+        Returns:
+            The engine itself, for chaining
+
+        Raises:
+            ValueError: If the name is already registered
+        """
+        if name in self.accumulators:
+            raise ValueError(f"Accumulator already registered: {name}")
+        self.accumulators[name] = accumulator
+        return self
+
+    def run(self, tenders: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Feed every tender to every accumulator and collect their results.
+
+        Args:
+            tenders: Tender data dictionaries, visited once
+
+        Returns:
+            Dictionary mapping accumulator names to their results
+        """
+        adds = [accumulator.add for accumulator in self.accumulators.values()]
+        for tender in tenders:
+            for add in adds:
+                add(tender)
+        return {name: accumulator.result() for name, accumulator in self.accumulators.items()}
@@ -8,11 +8,22 @@ information from the tender data.
 
 import json
 import logging
-import os
-from typing import Dict, List, Any, Optional, Tuple
-from collections import Counter, defaultdict
-import re
-from datetime import datetime
+from typing import Dict, Iterable, List, Any, Optional
+
+from core.aggregation import (
+    Accumulator,
+    AggregationEngine,
+    CustomerAccumulator,
+    DamagedBuildingAccumulator,
+    FieldCountAccumulator,
+    RegionAccumulator,
+    SupplierAccumulator,
+    TenderCountAccumulator,
+    ValueAccumulator,
+)
+from core.loader import iter_tenders
+from core.matcher import KeywordMatcher
+from core.ranking import CustomerRankingAccumulator, SupplierRankingAccumulator, top_entities
 
 logger = logging.getLogger(__name__)
 
@@ -35,62 +46,48 @@ def load_json_data(file_path: str) -> Dict[str, Any]:
         return {}
 
 
-def load_all_json_data(directory: str) -> List[Dict[str, Any]]:
+def load_all_json_data(directory: str, workers: int = 8) -> List[Dict[str, Any]]:
     """
-    Load all JSON files from a directory.
+    Load all JSON files from a directory, or all tenders from a snapshot file.
+    
+    Files whose names start with an underscore hold run metadata (e.g. the
+    parse summary) rather than tenders and are skipped. Files are read by a
+    pool of threads; use ``core.loader.iter_tenders`` to stream them instead.
     
     Args:
-        directory: Path to the directory containing JSON files
+        directory: Path to the directory containing JSON files, or to an
+            ``.ndjson``, ``.ndjson.gz`` or ``.pickle`` snapshot
+        workers: Number of reader threads
         
     Returns:
         List of dictionaries, each containing data from a JSON file
     """
-    data = []
     try:
-        for filename in os.listdir(directory):
-            if filename.endswith('.json'):
-                file_path = os.path.join(directory, filename)
-                json_data = load_json_data(file_path)
-                if json_data:
-                    data.append(json_data)
-        logger.info(f"Loaded {len(data)} JSON files from {directory}")
-        return data
+        return list(iter_tenders(directory, workers))
     except Exception as e:
         logger.error(f"Error loading JSON data from directory {directory}: {str(e)}")
         return []
 
 
+def _run_accumulator(accumulator: Accumulator, tenders: Iterable[Dict[str, Any]]) -> Any:
+    """Run a single accumulator over the tenders and return its result."""
+    return AggregationEngine().register('result', accumulator).run(tenders)['result']
+
+
 def analyze_regions(tenders: List[Dict[str, Any]]) -> Dict[str, int]:
     """
     Analyze the regions where tenders are located.
     
+    The region is taken from the location data, the customer data or the
+    delivery place, in that order.
+    
     Args:
         tenders: List of tender data dictionaries
         
     Returns:
         Dictionary mapping regions to the number of tenders in each region
     """
-    regions = Counter()
-    
-    for tender in tenders:
-        # Try to get region from location data
-        if 'location' in tender and 'region' in tender['location']:
-            region = tender['location']['region']
-            regions[region] += 1
-        # Try to get region from customer data
-        elif 'customer' in tender and 'region' in tender['customer']:
-            region = tender['customer']['region']
-            regions[region] += 1
-        # Try to get region from subject data
-        elif 'subject' in tender and 'delivery_place' in tender['subject']:
-            delivery_place = tender['subject']['delivery_place']
-            region_match = re.search(r'Україна,\s+(.*?(?:область|місто|Київ|Крим))', delivery_place)
-            if region_match:
-                region = region_match.group(1).strip()
-                regions[region] += 1
-    
-    # Convert Counter to dict
-    return dict(regions.most_common())
+    return _run_accumulator(RegionAccumulator(), tenders)
 
 
 def analyze_procurement_types(tenders: List[Dict[str, Any]]) -> Dict[str, int]:
@@ -103,14 +100,7 @@ def analyze_procurement_types(tenders: List[Dict[str, Any]]) -> Dict[str, int]:
     Returns:
         Dictionary mapping procurement types to the number of tenders using each type
     """
-    procurement_types = Counter()
-    
-    for tender in tenders:
-        if 'procurement_type' in tender:
-            procurement_type = tender['procurement_type']
-            procurement_types[procurement_type] += 1
-    
-    return dict(procurement_types.most_common())
+    return _run_accumulator(FieldCountAccumulator('procurement_type'), tenders)
 
 
 def analyze_tender_categories(tenders: List[Dict[str, Any]]) -> Dict[str, int]:
@@ -123,14 +113,7 @@ def analyze_tender_categories(tenders: List[Dict[str, Any]]) -> Dict[str, int]:
     Returns:
         Dictionary mapping categories to the number of tenders in each category
     """
-    categories = Counter()
-    
-    for tender in tenders:
-        if 'subject' in tender and 'classifier_name' in tender['subject']:
-            category = tender['subject']['classifier_name']
-            categories[category] += 1
-    
-    return dict(categories.most_common())
+    return _run_accumulator(FieldCountAccumulator('classifier_name', section='subject'), tenders)
 
 
 def analyze_suppliers(tenders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
@@ -143,33 +126,7 @@ def analyze_suppliers(tenders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]
     Returns:
         Dictionary mapping supplier names to information about their tenders
     """
-    suppliers = defaultdict(lambda: {
-        'tender_count': 0,
-        'total_value': 0,
-        'currencies': set(),
-        'tender_ids': set()
-    })
-    
-    for tender in tenders:
-        if 'awards' in tender and tender['awards']:
-            for award in tender['awards']:
-                if 'participant_name' in award and award['decision'] == 'Переможець':
-                    supplier_name = award['participant_name']
-                    suppliers[supplier_name]['tender_count'] += 1
-                    
-                    if 'tender_id' in tender:
-                        suppliers[supplier_name]['tender_ids'].add(tender['tender_id'])
-                    
-                    if 'bid_amount' in award and 'bid_currency' in award:
-                        suppliers[supplier_name]['total_value'] += award['bid_amount']
-                        suppliers[supplier_name]['currencies'].add(award['bid_currency'])
-    
-    # Convert sets to lists for JSON serialization
-    for supplier in suppliers.values():
-        supplier['currencies'] = list(supplier['currencies'])
-        supplier['tender_ids'] = list(supplier['tender_ids'])
-    
-    return dict(suppliers)
+    return _run_accumulator(SupplierAccumulator(), tenders)
 
 
 def analyze_customers(tenders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
@@ -182,40 +139,7 @@ def analyze_customers(tenders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]
     Returns:
         Dictionary mapping customer names to information about their tenders
     """
-    customers = defaultdict(lambda: {
-        'tender_count': 0,
-        'total_value': 0,
-        'currencies': set(),
-        'tender_ids': set(),
-        'edrpou': None,
-        'region': None
-    })
-    
-    for tender in tenders:
-        if 'customer' in tender and 'name' in tender['customer']:
-            customer_name = tender['customer']['name']
-            customers[customer_name]['tender_count'] += 1
-            
-            if 'tender_id' in tender:
-                customers[customer_name]['tender_ids'].add(tender['tender_id'])
-            
-            if 'expected_cost' in tender:
-                cost = tender['expected_cost']
-                customers[customer_name]['total_value'] += cost.get('amount', 0)
-                customers[customer_name]['currencies'].add(cost.get('currency', 'UAH'))
-            
-            if 'edrpou' in tender['customer'] and not customers[customer_name]['edrpou']:
-                customers[customer_name]['edrpou'] = tender['customer']['edrpou']
-            
-            if 'region' in tender['customer'] and not customers[customer_name]['region']:
-                customers[customer_name]['region'] = tender['customer']['region']
-    
-    # Convert sets to lists for JSON serialization
-    for customer in customers.values():
-        customer['currencies'] = list(customer['currencies'])
-        customer['tender_ids'] = list(customer['tender_ids'])
-    
-    return dict(customers)
+    return _run_accumulator(CustomerAccumulator(), tenders)
 
 
 def analyze_tender_values(tenders: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -228,75 +152,14 @@ def analyze_tender_values(tenders: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         Dictionary containing various statistics about tender values
     """
-    values = {
-        'total': 0,
-        'count': 0,
-        'average': 0,
-        'min': float('inf'),
-        'max': 0,
-        'currency': 'UAH',
-        'by_year': defaultdict(int),
-        'by_month': defaultdict(int),
-        'by_category': defaultdict(int)
-    }
-    
-    for tender in tenders:
-        if 'expected_cost' in tender and 'amount' in tender['expected_cost']:
-            amount = tender['expected_cost']['amount']
-            values['total'] += amount
-            values['count'] += 1
-            values['min'] = min(values['min'], amount)
-            values['max'] = max(values['max'], amount)
-            
-            # Extract year and month from tender date if available
-            if 'dates' in tender and 'publication_date' in tender['dates']:
-                date_str = tender['dates']['publication_date']
-                try:
-                    # Try different date formats
-                    date_formats = [
-                        '%d %B %Y',  # 01 січня 2023
-                        '%d %b %Y',  # 01 січ 2023
-                        '%d.%m.%Y',  # 01.01.2023
-                    ]
-                    
-                    parsed_date = None
-                    for fmt in date_formats:
-                        try:
-                            parsed_date = datetime.strptime(date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if parsed_date:
-                        year = parsed_date.year
-                        month = parsed_date.month
-                        values['by_year'][str(year)] += amount
-                        values['by_month'][f"{year}-{month:02d}"] += amount
-                except Exception as e:
-                    logger.debug(f"Could not parse date {date_str}: {str(e)}")
-            
-            # Group by category
-            if 'subject' in tender and 'classifier_name' in tender['subject']:
-                category = tender['subject']['classifier_name']
-                values['by_category'][category] += amount
-    
-    # Calculate average
-    if values['count'] > 0:
-        values['average'] = values['total'] / values['count']
-    
-    # Reset min if no tenders were found
-    if values['min'] == float('inf'):
-        values['min'] = 0
-    
-    # Convert defaultdicts to regular dicts
-    values['by_year'] = dict(values['by_year'])
-    values['by_month'] = dict(values['by_month'])
-    values['by_category'] = dict(values['by_category'])
-    
-    return values
+    return _run_accumulator(ValueAccumulator(), tenders)
 
 
-def analyze_damaged_buildings(tenders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def analyze_damaged_buildings(
+    tenders: List[Dict[str, Any]],
+    matcher: Optional[KeywordMatcher] = None,
+    min_score: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Identify and analyze tenders related to damaged buildings.
     
@@ -305,82 +168,113 @@ def analyze_damaged_buildings(tenders: List[Dict[str, Any]]) -> List[Dict[str, A
     
     Args:
         tenders: List of tender data dictionaries
+        matcher: Keyword matcher to use instead of the default damaged
+            building keywords
+        min_score: Minimum total keyword weight of a matching tender (any
+            match by default)
         
     Returns:
         List of tenders related to damaged buildings with additional analysis
     """
-    # Keywords related to damaged buildings or repairs (in Ukrainian)
-    keywords = [
-        'пошкодж', 'руйнув', 'зруйнов', 'відновл', 'реконструкц', 
-        'відбудов', 'ремонт', 'віднов', 'реставрац', 'відбудов'
-    ]
-    
-    damaged_building_tenders = []
+    return _run_accumulator(DamagedBuildingAccumulator(matcher, min_score), tenders)
+
+
+def run_analyses(
+    tenders: Iterable[Dict[str, Any]],
+    top_k: int = 10,
+    compact_rankings: bool = False,
+    rankings_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Run every analysis in a single pass over the tenders.
     
-    for tender in tenders:
-        is_damaged_building = False
-        matched_keywords = set()
-        
-        # Check title
-        if 'title' in tender:
-            title = tender['title'].lower()
-            for keyword in keywords:
-                if keyword in title:
-                    is_damaged_building = True
-                    matched_keywords.add(keyword)
-        
-        # Check description
-        if 'subject' in tender and 'description' in tender['subject']:
-            description = tender['subject']['description'].lower()
-            for keyword in keywords:
-                if keyword in description:
-                    is_damaged_building = True
-                    matched_keywords.add(keyword)
+    Args:
+        tenders: Tender data dictionaries; any iterable, visited once
+        top_k: Number of suppliers and customers in the rankings
+        compact_rankings: Give the number of tender IDs of ranked suppliers
+            and customers instead of the IDs themselves, so that no IDs
+            are held in memory
+        rankings_only: Skip the full supplier and customer analyses and
+            only rank them, which is what the summary report needs
         
-        if is_damaged_building:
-            # Add analysis data to the tender
-            tender_copy = tender.copy()
-            tender_copy['analysis'] = {
-                'is_damaged_building': True,
-                'matched_keywords': list(matched_keywords)
-            }
-            damaged_building_tenders.append(tender_copy)
-    
-    return damaged_building_tenders
+    Returns:
+        Dictionary with the results of every analysis: 'tender_count',
+        'regions', 'procurement_types', 'categories', 'values',
+        'top_suppliers', 'top_customers', 'damaged_buildings' and, unless
+        rankings_only is set, 'suppliers' and 'customers'
+    """
+    engine = AggregationEngine()
+    engine.register('tender_count', TenderCountAccumulator())
+    engine.register('regions', RegionAccumulator())
+    engine.register('procurement_types', FieldCountAccumulator('procurement_type'))
+    engine.register('categories', FieldCountAccumulator('classifier_name', section='subject'))
+    engine.register('values', ValueAccumulator())
+    if not rankings_only:
+        engine.register('suppliers', SupplierAccumulator())
+        engine.register('customers', CustomerAccumulator())
+    engine.register('top_suppliers', SupplierRankingAccumulator(top_k, details=not compact_rankings))
+    engine.register('top_customers', CustomerRankingAccumulator(top_k, details=not compact_rankings))
+    engine.register('damaged_buildings', DamagedBuildingAccumulator())
+    return engine.run(tenders)
 
 
-def generate_summary_report(tenders: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _rankings(results: Dict[str, Any], name: str, top_k: int) -> Dict[str, Dict[str, Any]]:
+    """Return the rankings of suppliers or customers, ranking the full analysis if needed."""
+    rankings = results.get(f'top_{name}')
+    if rankings is not None:
+        return rankings
+    return {
+        'by_value': top_entities(results[name], top_k),
+        'by_count': top_entities(results[name], top_k, 'tender_count'),
+    }
+
+
+def build_summary_report(results: Dict[str, Any], top_k: int = 10) -> Dict[str, Any]:
     """
-    Generate a comprehensive summary report from tender data.
+    Build the summary report from the results of ``run_analyses``.
     
     Args:
-        tenders: List of tender data dictionaries
+        results: Results of ``run_analyses`` or ``AnalysisStore.results``, or
+            of the individual analyses with 'suppliers' and 'customers'
+            instead of their rankings
+        top_k: Number of suppliers and customers to rank if the results
+            have no rankings
         
     Returns:
         Dictionary containing various analyses and statistics
     """
-    report = {
-        'tender_count': len(tenders),
-        'regions': analyze_regions(tenders),
-        'procurement_types': analyze_procurement_types(tenders),
-        'categories': analyze_tender_categories(tenders),
-        'values': analyze_tender_values(tenders),
-        'top_suppliers': dict(sorted(
-            analyze_suppliers(tenders).items(), 
-            key=lambda x: x[1]['total_value'], 
-            reverse=True
-        )[:10]),
-        'top_customers': dict(sorted(
-            analyze_customers(tenders).items(), 
-            key=lambda x: x[1]['total_value'], 
-            reverse=True
-        )[:10]),
+    suppliers = _rankings(results, 'suppliers', top_k)
+    customers = _rankings(results, 'customers', top_k)
+    return {
+        'tender_count': results['tender_count'],
+        'regions': results['regions'],
+        'procurement_types': results['procurement_types'],
+        'categories': results['categories'],
+        'values': results['values'],
+        'top_suppliers': suppliers['by_value'],
+        'top_suppliers_by_count': suppliers['by_count'],
+        'top_customers': customers['by_value'],
+        'top_customers_by_count': customers['by_count'],
         'damaged_buildings': {
-            'count': len(analyze_damaged_buildings(tenders))
+            'count': results['damaged_building_count'] if 'damaged_building_count' in results
+            else len(results['damaged_buildings'])
         }
     }
+
+
+def generate_summary_report(tenders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Generate a comprehensive summary report from tender data.
+    
+    All analyses are computed in a single pass over the tenders.
     
-    return report
+    Args:
+        tenders: List of tender data dictionaries
+        
+    Returns:
+        Dictionary containing various analyses and statistics
+    """
+    return build_summary_report(run_analyses(tenders, rankings_only=True))
 
 
 def save_analysis_report(report: Dict[str, Any], output_file: str) -> None:
@@ -0,0 +1,518 @@
+"""
+Persistent, incrementally updated analysis state.
+
+``AnalysisStore`` keeps the aggregates behind the summary report in a small
+SQLite database: tender counts per region, procurement type and category,
+tender values in total and per year, month and category, supplier and
+customer totals, and the damaged building tenders. Each tender's
+contribution to the aggregates is stored with it, so adding, replacing or
+removing a tender updates the aggregates in place, and refreshing the
+reports after a crawl costs time proportional to the changed tenders
+rather than to the whole archive.
+
+Amounts are summed in kopecks (hundredths) as integers, so retracting a
+tender restores the totals exactly.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from core.aggregation import DAMAGED_BUILDING_KEYWORDS, publication_date_iso, tender_region
+from core.loader import list_tender_files, read_tender_file
+from core.matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Version of the stored contributions. Bump it whenever a change to the
+# analyses changes what a tender contributes, so that stores are rebuilt.
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tenders (
+    key TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    amount INTEGER,
+    contribution TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tenders_amount ON tenders (amount);
+CREATE TABLE IF NOT EXISTS counts (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+CREATE TABLE IF NOT EXISTS value_totals (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tender_count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    edrpou TEXT,
+    region TEXT,
+    PRIMARY KEY (kind, name)
+);
+CREATE INDEX IF NOT EXISTS entities_total ON entities (kind, total);
+CREATE INDEX IF NOT EXISTS entities_tender_count ON entities (kind, tender_count);
+CREATE TABLE IF NOT EXISTS entity_currencies (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (kind, name, currency)
+);
+CREATE TABLE IF NOT EXISTS entity_tenders (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tender_id TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (kind, name, tender_id)
+);
+CREATE TABLE IF NOT EXISTS damaged (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS damaged_seq ON damaged (seq);
+"""
+
+_TABLES = ('tenders', 'counts', 'value_totals', 'entities', 'entity_currencies', 'entity_tenders', 'damaged')
+
+
+def _kopecks(amount: Any) -> Optional[int]:
+    """Convert an amount to integer hundredths, or None if it is missing."""
+    if amount is None:
+        return None
+    return round(amount * 100)
+
+
+class AnalysisStore:
+    """
+    SQLite-backed aggregates of parsed tenders that can be updated incrementally.
+
+    Tenders are identified by a key, the file name when syncing a
+    directory. Ties in the report rankings are ordered by when their entry
+    first entered the store, which for a store built in one go matches the
+    order of the from-scratch analyses.
+
+    Customer EDRPOU codes and regions keep the first value seen and are not
+    retracted with the tenders that brought them.
+
+    Example:
+        with AnalysisStore('analysis.sqlite') as store:
+            store.sync_directory('../parsed_data')
+            report = build_summary_report(store.results())
+    """
+
+    def __init__(self, path: str, matcher: Optional[KeywordMatcher] = None):
+        """
+        Open or create a store.
+
+        A store written by another STORE_VERSION is emptied, so that it is
+        rebuilt on the next sync.
+
+        Args:
+            path: Path of the SQLite database
+            matcher: Keyword matcher for damaged buildings
+                (DAMAGED_BUILDING_KEYWORDS by default)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.matcher = KeywordMatcher(DAMAGED_BUILDING_KEYWORDS) if matcher is None else matcher
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if meta.get('version') not in (None, str(STORE_VERSION)):
+            logger.info(f"Analysis store {path} has version {meta['version']}, rebuilding")
+            for table in _TABLES:
+                self._db.execute(f"DELETE FROM {table}")
+            meta = {}
+        self._seq = int(meta.get('seq', 0))
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(STORE_VERSION),))
+        self._db.commit()
+
+    def __enter__(self) -> 'AnalysisStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(commit=exc_type is None)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def contribution(self, tender: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute what a tender adds to the aggregates.
+
+        Args:
+            tender: Tender data dictionary
+
+        Returns:
+            JSON-serialisable contribution of the tender
+        """
+        subject = tender.get('subject') or {}
+        contribution = {
+            'tender_id': tender.get('tender_id'),
+            'region': tender_region(tender),
+            'procurement_type': tender.get('procurement_type'),
+            'category': subject.get('classifier_name'),
+            'amount': None,
+            'year': None,
+            'month': None,
+            'suppliers': [],
+            'customer': None,
+            'damaged': None,
+        }
+
+        cost = tender.get('expected_cost')
+        if cost is not None and 'amount' in cost:
+            contribution['amount'] = _kopecks(cost['amount'])
+            iso_date = publication_date_iso(tender)
+            if iso_date:
+                contribution['year'] = iso_date[:4]
+                contribution['month'] = iso_date[:7]
+
+        for award in tender.get('awards') or []:
+            if 'participant_name' in award and award.get('decision') == 'Переможець':
+                if 'bid_amount' in award and 'bid_currency' in award:
+                    contribution['suppliers'].append(
+                        [award['participant_name'], _kopecks(award['bid_amount']), award['bid_currency']])
+                else:
+                    contribution['suppliers'].append([award['participant_name'], None, None])
+
+        customer = tender.get('customer') or {}
+        if 'name' in customer:
+            amount = currency = None
+            if cost is not None:
+                amount = _kopecks(cost.get('amount', 0))
+                currency = cost.get('currency', 'UAH')
+            contribution['customer'] = [customer['name'], amount, currency,
+                                        customer.get('edrpou'), customer.get('region')]
+
+        matched_keywords = self.matcher.keywords_in(tender.get('title'), subject.get('description'))
+        if matched_keywords:
+            contribution['damaged'] = matched_keywords
+        return contribution
+
+    def _bump_count(self, dimension: str, key: Optional[str], sign: int) -> None:
+        if key is None:
+            return
+        self._db.execute(
+            "INSERT INTO counts VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count",
+            (dimension, key, sign, self._next_seq())
+        )
+        if sign < 0:
+            self._db.execute("DELETE FROM counts WHERE dimension = ? AND key = ? AND count <= 0", (dimension, key))
+
+    def _bump_value(self, dimension: str, key: Optional[str], amount: int, sign: int) -> None:
+        if key is None:
+            return
+        self._db.execute(
+            "INSERT INTO value_totals VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count, total = total + excluded.total",
+            (dimension, key, sign, sign * amount, self._next_seq())
+        )
+        if sign < 0:
+            self._db.execute("DELETE FROM value_totals WHERE dimension = ? AND key = ? AND count <= 0", (dimension, key))
+
+    def _bump_entity(self, kind: str, name: str, tender_id: Optional[str], amount: Optional[int],
+                     currency: Optional[str], sign: int, edrpou: Any = None, region: Any = None) -> None:
+        db = self._db
+        db.execute(
+            "INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (kind, name) DO UPDATE SET "
+            "tender_count = tender_count + excluded.tender_count, total = total + excluded.total, "
+            "edrpou = CASE WHEN edrpou IS NULL OR edrpou = '' THEN excluded.edrpou ELSE edrpou END, "
+            "region = CASE WHEN region IS NULL OR region = '' THEN excluded.region ELSE region END",
+            (kind, name, sign, sign * (amount or 0), self._next_seq(),
+             edrpou if sign > 0 else None, region if sign > 0 else None)
+        )
+        if currency is not None:
+            db.execute(
+                "INSERT INTO entity_currencies VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, name, currency) DO UPDATE SET count = count + excluded.count",
+                (kind, name, currency, sign, self._next_seq())
+            )
+        if tender_id is not None:
+            db.execute(
+                "INSERT INTO entity_tenders VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, name, tender_id) DO UPDATE SET count = count + excluded.count",
+                (kind, name, tender_id, sign, self._next_seq())
+            )
+        if sign < 0:
+            db.execute("DELETE FROM entities WHERE kind = ? AND name = ? AND tender_count <= 0", (kind, name))
+            db.execute("DELETE FROM entity_currencies WHERE kind = ? AND name = ? AND count <= 0", (kind, name))
+            db.execute("DELETE FROM entity_tenders WHERE kind = ? AND name = ? AND count <= 0", (kind, name))
+
+    def _apply(self, contribution: Dict[str, Any], sign: int) -> None:
+        """Add (sign 1) or retract (sign -1) a contribution."""
+        self._bump_count('region', contribution['region'], sign)
+        self._bump_count('procurement_type', contribution['procurement_type'], sign)
+        self._bump_count('category', contribution['category'], sign)
+
+        amount = contribution['amount']
+        if amount is not None:
+            self._bump_value('all', '', amount, sign)
+            self._bump_value('year', contribution['year'], amount, sign)
+            self._bump_value('month', contribution['month'], amount, sign)
+            self._bump_value('category', contribution['category'], amount, sign)
+
+        tender_id = contribution['tender_id']
+        for name, bid_amount, currency in contribution['suppliers']:
+            self._bump_entity('supplier', name, tender_id, bid_amount, currency, sign)
+        if contribution['customer'] is not None:
+            name, cost_amount, currency, edrpou, region = contribution['customer']
+            self._bump_entity('customer', name, tender_id, cost_amount, currency, sign, edrpou, region)
+
+    def add(self, key: str, tender: Dict[str, Any], mtime_ns: Optional[int] = None, size: Optional[int] = None) -> None:
+        """
+        Add a tender, replacing any tender stored under the same key.
+
+        Args:
+            key: Key of the tender, e.g. its file name
+            tender: Tender data dictionary
+            mtime_ns: Modification time of the tender's file, for syncing
+            size: Size of the tender's file, for syncing
+        """
+        self.remove(key)
+        contribution = self.contribution(tender)
+        self._apply(contribution, 1)
+        self._db.execute(
+            "INSERT INTO tenders VALUES (?, ?, ?, ?, ?)",
+            (key, mtime_ns, size, contribution['amount'], json.dumps(contribution, ensure_ascii=False))
+        )
+        if contribution['damaged']:
+            tender_copy = tender.copy()
+            tender_copy['analysis'] = {
+                'is_damaged_building': True,
+                'matched_keywords': contribution['damaged']
+            }
+            self._db.execute("INSERT INTO damaged VALUES (?, ?, ?)",
+                             (key, self._next_seq(), json.dumps(tender_copy, ensure_ascii=False, indent=2)))
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a tender and retract its contribution.
+
+        Args:
+            key: Key of the tender
+
+        Returns:
+            True if a tender was stored under the key
+        """
+        row = self._db.execute("SELECT contribution FROM tenders WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        self._apply(json.loads(row[0]), -1)
+        self._db.execute("DELETE FROM tenders WHERE key = ?", (key,))
+        self._db.execute("DELETE FROM damaged WHERE key = ?", (key,))
+        return True
+
+    def sync_directory(self, directory: str) -> Dict[str, int]:
+        """
+        Bring the store in line with a directory of parsed tender files.
+
+        Only new files and files whose modification time or size changed
+        are read; tenders whose file is gone are removed. Files that cannot
+        be loaded are logged and keep their previous contribution, if any.
+
+        Args:
+            directory: Directory with parsed tender JSON files
+
+        Returns:
+            Number of 'added', 'replaced', 'removed', 'unchanged' and 'failed' files
+        """
+        known = {key: (mtime_ns, size) for key, mtime_ns, size
+                 in self._db.execute("SELECT key, mtime_ns, size FROM tenders")}
+        counts = dict.fromkeys(('added', 'replaced', 'removed', 'unchanged', 'failed'), 0)
+        seen = set()
+        for path in list_tender_files(directory):
+            key = os.path.basename(path)
+            seen.add(key)
+            stat = os.stat(path)
+            if known.get(key) == (stat.st_mtime_ns, stat.st_size):
+                counts['unchanged'] += 1
+                continue
+            tender = read_tender_file(path)
+            if not tender:
+                counts['failed'] += 1
+                continue
+            self.add(key, tender, stat.st_mtime_ns, stat.st_size)
+            counts['replaced' if key in known else 'added'] += 1
+
+        for key in known.keys() - seen:
+            self.remove(key)
+            counts['removed'] += 1
+        self.commit()
+        logger.info(
+            f"Synced analysis store {self.path} with {directory}: {counts['added']} added, "
+            f"{counts['replaced']} replaced, {counts['removed']} removed, {counts['unchanged']} unchanged, "
+            f"{counts['failed']} failed"
+        )
+        return counts
+
+    def _counts(self, dimension: str) -> Dict[str, int]:
+        return dict(self._db.execute(
+            "SELECT key, count FROM counts WHERE dimension = ? ORDER BY count DESC, seq", (dimension,)))
+
+    def _value_totals(self, dimension: str) -> Dict[str, float]:
+        return {key: total / 100 for key, total in self._db.execute(
+            "SELECT key, total FROM value_totals WHERE dimension = ? ORDER BY seq", (dimension,))}
+
+    def _values(self) -> Dict[str, Any]:
+        row = self._db.execute("SELECT count, total FROM value_totals WHERE dimension = 'all'").fetchone()
+        count, total = row if row else (0, 0)
+        minimum = self._db.execute("SELECT MIN(amount) FROM tenders").fetchone()[0]
+        maximum = self._db.execute("SELECT MAX(amount) FROM tenders").fetchone()[0]
+        return {
+            'total': total / 100,
+            'count': count,
+            'average': total / 100 / count if count > 0 else 0,
+            # No tenders with a value leave min at 0
+            'min': minimum / 100 if minimum is not None else 0,
+            'max': max(0, maximum / 100) if maximum is not None else 0,
+            'currency': 'UAH',
+            'by_year': self._value_totals('year'),
+            'by_month': self._value_totals('month'),
+            'by_category': self._value_totals('category'),
+        }
+
+    def _entity_records(self, kind: str, order: str, top_k: int, compact: bool) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        rows = self._db.execute(
+            f"SELECT name, tender_count, total, edrpou, region FROM entities WHERE kind = ? "
+            f"ORDER BY {order} DESC, seq LIMIT ?", (kind, top_k)
+        ).fetchall()
+        for name, tender_count, total, edrpou, region in rows:
+            record = {
+                'tender_count': tender_count,
+                'total_value': total / 100,
+                'currencies': [currency for currency, in self._db.execute(
+                    "SELECT currency FROM entity_currencies WHERE kind = ? AND name = ? ORDER BY currency", (kind, name))],
+            }
+            tender_ids = [tender_id for tender_id, in self._db.execute(
+                "SELECT tender_id FROM entity_tenders WHERE kind = ? AND name = ? ORDER BY tender_id", (kind, name))]
+            if compact:
+                record['tender_id_count'] = len(tender_ids)
+            else:
+                record['tender_ids'] = tender_ids
+            if kind == 'customer':
+                record['edrpou'] = edrpou
+                record['region'] = region
+            records[name] = record
+        return records
+
+    def _rankings(self, kind: str, top_k: int, compact: bool) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {
+            'by_value': self._entity_records(kind, 'total', top_k, compact),
+            'by_count': self._entity_records(kind, 'tender_count', top_k, compact),
+        }
+
+    def damaged_buildings(self) -> List[Dict[str, Any]]:
+        """
+        Return the tenders related to damaged buildings.
+
+        Returns:
+            Tenders with their 'analysis' data, in the order they were added
+        """
+        return [json.loads(data) for data, in self._db.execute("SELECT data FROM damaged ORDER BY seq")]
+
+    def write_damaged_buildings(self, output_file: str) -> int:
+        """
+        Write the tenders related to damaged buildings to a JSON file.
+
+        The stored JSON is copied without being decoded, in the layout of
+        ``json.dump(tenders, f, ensure_ascii=False, indent=2)``.
+
+        Args:
+            output_file: Path of the JSON file
+
+        Returns:
+            Number of tenders written
+        """
+        count = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for data, in self._db.execute("SELECT data FROM damaged ORDER BY seq"):
+                f.write(',\n  ' if count else '\n  ')
+                # JSON strings hold no raw newlines, so this only indents lines
+                f.write(data.replace('\n', '\n  '))
+                count += 1
+            f.write('\n]' if count else ']')
+        return count
+
+    def results(self, top_k: int = 10, compact_rankings: bool = False,
+                damaged_buildings: bool = True) -> Dict[str, Any]:
+        """
+        Return the stored aggregates in the shape of ``run_analyses`` results.
+
+        Args:
+            top_k: Number of suppliers and customers in the rankings
+            compact_rankings: Give the number of tender IDs of ranked
+                suppliers and customers instead of the IDs themselves
+            damaged_buildings: Include the damaged building tenders; if not,
+                only their number is given, as 'damaged_building_count'
+
+        Returns:
+            Dictionary with 'tender_count', 'regions', 'procurement_types',
+            'categories', 'values', 'top_suppliers', 'top_customers' and
+            'damaged_buildings' (or 'damaged_building_count'), ready for
+            ``build_summary_report``
+        """
+        results = {
+            'tender_count': len(self),
+            'regions': self._counts('region'),
+            'procurement_types': self._counts('procurement_type'),
+            'categories': self._counts('category'),
+            'values': self._values(),
+            'top_suppliers': self._rankings('supplier', top_k, compact_rankings),
+            'top_customers': self._rankings('customer', top_k, compact_rankings),
+        }
+        if damaged_buildings:
+            results['damaged_buildings'] = self.damaged_buildings()
+        else:
+            results['damaged_building_count'] = self._db.execute("SELECT COUNT(*) FROM damaged").fetchone()[0]
+        return results
+
+    def commit(self) -> None:
+        """Persist the changes made so far."""
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('seq', ?)", (str(self._seq),))
+        self._db.commit()
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Close the store.
+
+        Args:
+            commit: Persist the pending changes; otherwise roll them back
+        """
+        if commit:
+            self.commit()
+        else:
+            self._db.rollback()
+        self._db.close()
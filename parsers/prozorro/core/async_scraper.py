@@ -0,0 +1,200 @@
+from typing import AsyncIterator, List, Optional
+from collections import deque
+import asyncio
+import logging
+
+from core.governor import RequestGovernor
+from core.models import TenderSearchResponse, Tender
+from core.scraper import ProzorroScraper
+
+
+class AsyncProzorroScraper:
+    """
+    Asyncio-based client for paginated Prozorro searches.
+
+    Requests are issued through a regular ``ProzorroScraper`` running in worker
+    threads, so responses are validated exactly like the synchronous client.
+    Concurrency is bounded by a semaphore and the request rate by the
+    scraper's request governor, which is the only rate limiter involved.
+    Unless a scraper is given, the async client creates one with its own
+    governor running at ``requests_per_second``, so it neither shares nor is
+    capped by the process-wide default governor.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://prozorro.gov.ua/api",
+        max_concurrency: int = 5,
+        requests_per_second: float = 1.0,
+        burst: Optional[float] = None,
+        scraper: Optional[ProzorroScraper] = None
+    ):
+        """
+        Initialize the async scraper.
+
+        Args:
+            base_url: The base URL for the Prozorro API
+            max_concurrency: Maximum number of requests in flight at once
+            requests_per_second: Sustained request rate of the scraper's governor
+            burst: Maximum number of requests that may be sent back to back
+            scraper: Optional synchronous scraper to issue requests through; its
+                own governor then sets the request rate and requests_per_second
+                and burst are ignored, and its connection pool is left as is
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        if scraper is None:
+            governor = RequestGovernor(
+                requests_per_second=requests_per_second,
+                max_requests_per_second=requests_per_second,
+                burst=burst
+            )
+            scraper = ProzorroScraper(base_url, governor=governor, pool_size=max_concurrency)
+
+        self.scraper = scraper
+        self.max_concurrency = max_concurrency
+        self.logger = logging.getLogger(__name__)
+
+    async def search_tenders(
+        self,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        page: int = 0,
+        per_page: int = 20
+    ) -> TenderSearchResponse:
+        """
+        Search for tenders without blocking the event loop.
+
+        Args:
+            text: Optional search text
+            region: Optional region filter (format: '61-64' for regions 61 through 64)
+            page: Page number
+            per_page: Number of results per page
+
+        Returns:
+            A TenderSearchResponse object containing search results
+
+        Raises:
+            ProzorroAPIError: If the API request fails
+        """
+        return await asyncio.to_thread(self.scraper.search_tenders, text, region, page, per_page)
+
+    async def iter_tenders(
+        self,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Tender]:
+        """
+        Iterate over all pages of tender search results, fetching them concurrently.
+
+        The first page is fetched on its own to learn the total number of
+        results, then the remaining pages are fetched in parallel within a
+        sliding window. Tenders are yielded page by page in page order, as soon
+        as each page (and every page before it) has arrived. The pages requested
+        are the same as in ``ProzorroScraper.get_all_tender_pages``.
+
+        Args:
+            text: Optional search text
+            region: Optional region filter
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve (None for all)
+
+        Yields:
+            Tender objects in page order
+
+        Raises:
+            ProzorroAPIError: If any of the API requests fails
+        """
+        first_page = await self.search_tenders(text, region, 1, per_page)
+        total_pages = (first_page.total + per_page - 1) // per_page
+
+        last_page = total_pages
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+        remaining_pages = iter(range(2, last_page + 1))
+
+        self.logger.info(
+            f"Retrieved page 1/{total_pages} with {len(first_page.data)} tenders, "
+            f"fetching {max(0, last_page - 1)} more pages"
+        )
+
+        for tender in first_page.data:
+            yield tender
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_page(page: int) -> TenderSearchResponse:
+            async with semaphore:
+                response = await self.search_tenders(text, region, page, per_page)
+            self.logger.info(f"Retrieved page {page}/{total_pages} with {len(response.data)} tenders")
+            return response
+
+        # Keep a bounded number of pages scheduled ahead of the consumer
+        window = deque()
+
+        def schedule_next() -> None:
+            page = next(remaining_pages, None)
+            if page is not None:
+                window.append(asyncio.ensure_future(fetch_page(page)))
+
+        for _ in range(self.max_concurrency * 2):
+            schedule_next()
+
+        try:
+            while window:
+                response = await window.popleft()
+                schedule_next()
+                for tender in response.data:
+                    yield tender
+        finally:
+            for task in window:
+                task.cancel()
+
+    async def get_all_tender_pages(
+        self,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None
+    ) -> List[Tender]:
+        """
+        Retrieve all pages of tender search results concurrently.
+
+        Args:
+            text: Optional search text
+            region: Optional region filter
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve (None for all)
+
+        Returns:
+            A list of Tender objects in the same order as
+            ``ProzorroScraper.get_all_tender_pages``
+
+        Raises:
+            ProzorroAPIError: If any of the API requests fails
+        """
+        return [tender async for tender in self.iter_tenders(text, region, per_page, max_pages)]
+
+    def run_all_tender_pages(
+        self,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None
+    ) -> List[Tender]:
+        """
+        Synchronous entry point for ``get_all_tender_pages``.
+
+        Args:
+            text: Optional search text
+            region: Optional region filter
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve (None for all)
+
+        Returns:
+            A list of Tender objects
+        """
+        return asyncio.run(self.get_all_tender_pages(text, region, per_page, max_pages))
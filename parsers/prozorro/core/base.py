@@ -1,17 +1,27 @@
 import requests
-from typing import Dict, Any, Optional, Type, TypeVar, Generic
+from typing import Dict, Any, Optional, Type, TypeVar, Generic, Iterable
+import codecs
 import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
 from core.exceptions import (
     ProzorroConnectionError,
     ProzorroResponseError,
     ProzorroParsingError
 )
-from core.utils import get_required_headers, build_api_url
+from core.models import TenderDownloadResult
+from core.utils import get_required_headers, get_html_headers, build_api_url
+from core.governor import RequestGovernor, get_default_governor
+from core.http_cache import HTTPCache
 
 T = TypeVar('T', bound=BaseModel)
 
+logger = logging.getLogger(__name__)
+
 
 class BaseAPIClient:
     """
@@ -20,16 +30,63 @@ class BaseAPIClient:
     This class handles the common HTTP operations and response parsing.
     """
     
-    def __init__(self, base_url: str = "https://prozorro.gov.ua/api"):
+    # The Prozorro web page URL format for tenders
+    tender_page_url = "https://prozorro.gov.ua/tender/{tender_id}"
+    
+    def __init__(
+        self,
+        base_url: str = "https://prozorro.gov.ua/api",
+        governor: Optional[RequestGovernor] = None,
+        pool_size: int = 10,
+        cache: Optional[HTTPCache] = None,
+        page_governor: Optional[RequestGovernor] = None
+    ):
         """
         Initialize the API client.
         
         Args:
             base_url: The base URL for the Prozorro API
+            governor: Request governor pacing and retrying API requests
+                (defaults to the shared 'api' one)
+            pool_size: Number of keep-alive connections kept open per host
+            cache: Optional HTTP response cache for search results and tender pages
+            page_governor: Request governor pacing and retrying tender page
+                downloads (defaults to the shared 'pages' one)
         """
         self.base_url = base_url
+        self.governor = governor or get_default_governor('api')
+        self.page_governor = page_governor or get_default_governor('pages')
+        self.cache = cache
         self.session = requests.Session()
         self.session.headers.update(get_required_headers())
+        
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def _send(
+        self,
+        method: str,
+        url: str,
+        governor: Optional[RequestGovernor] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request through the response cache, if any, and a governor.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            governor: Governor to send the request through (the API governor by default)
+            **kwargs: Extra arguments passed to the request
+            
+        Returns:
+            The HTTP response
+        """
+        governor = governor or self.governor
+        if self.cache is not None:
+            return self.cache.fetch(governor, self.session, method, url, **kwargs)
+        return governor.request(self.session, method, url, **kwargs)
     
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -50,10 +107,10 @@ class BaseAPIClient:
         url = build_api_url(self.base_url, endpoint, params)
         
         try:
-            response = self.session.get(url)
+            response = self._send('GET', url)
             response.raise_for_status()
             return response.json()
-        except requests.ConnectionError as e:
+        except (requests.ConnectionError, requests.Timeout) as e:
             raise ProzorroConnectionError(f"Failed to connect to {url}: {str(e)}")
         except requests.HTTPError as e:
             raise ProzorroResponseError(response.status_code, response.text)
@@ -81,10 +138,10 @@ class BaseAPIClient:
         url = build_api_url(self.base_url, endpoint, params)
         
         try:
-            response = self.session.post(url, data=data)
+            response = self._send('POST', url, data=data)
             response.raise_for_status()
             return response.json()
-        except requests.ConnectionError as e:
+        except (requests.ConnectionError, requests.Timeout) as e:
             raise ProzorroConnectionError(f"Failed to connect to {url}: {str(e)}")
         except requests.HTTPError as e:
             raise ProzorroResponseError(response.status_code, response.text)
@@ -105,23 +162,106 @@ class BaseAPIClient:
             ProzorroConnectionError: If connection to the API fails
             ProzorroResponseError: If API returns an error status
         """
-        # The Prozorro web page URL format for tenders
-        url = f"https://prozorro.gov.ua/tender/{tender_id}"
+        url = self.tender_page_url.format(tender_id=tender_id)
         
         try:
             # Use a different set of headers for HTML requests
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-            }
-            response = requests.get(url, headers=headers)
+            response = self._send('GET', url, self.page_governor, headers=get_html_headers())
             response.raise_for_status()
             return response.text
-        except requests.ConnectionError as e:
+        except (requests.ConnectionError, requests.Timeout) as e:
             raise ProzorroConnectionError(f"Failed to connect to {url}: {str(e)}")
         except requests.HTTPError as e:
             raise ProzorroResponseError(response.status_code, response.text)
     
+    def download_tender_html(self, tender_id: str, output_file: str) -> str:
+        """
+        Download the HTML page of a tender straight to a file.
+        
+        The response body is streamed to a temporary file in chunks and moved
+        into place once complete, so a failed download never leaves a
+        truncated page behind. The response is closed in every case, so a
+        failed download does not hold on to its pooled connection.
+        
+        Args:
+            tender_id: The ID of the tender
+            output_file: Path of the file to write the HTML to
+            
+        Returns:
+            The path of the written file
+            
+        Raises:
+            ProzorroConnectionError: If connection to the API fails
+            ProzorroResponseError: If API returns an error status
+        """
+        url = self.tender_page_url.format(tender_id=tender_id)
+        tmp_file = f"{output_file}.part"
+        
+        try:
+            response = self._send('GET', url, self.page_governor, headers=get_html_headers(), stream=True)
+            with response:
+                if not response.ok:
+                    raise ProzorroResponseError(response.status_code, response.text)
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(decoder.decode(chunk))
+                    f.write(decoder.decode(b'', final=True))
+            os.replace(tmp_file, output_file)
+            return output_file
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            raise ProzorroConnectionError(f"Failed to connect to {url}: {str(e)}")
+        finally:
+            # A failed download never leaves a partial page behind
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    
+    def get_tender_htmls(
+        self,
+        tender_ids: Iterable[str],
+        output_dir: str,
+        max_workers: int = 8
+    ) -> TenderDownloadResult:
+        """
+        Download the HTML pages of many tenders concurrently.
+        
+        Pages are fetched over the pooled keep-alive session by a bounded
+        thread pool and each one is streamed to ``<output_dir>/<tender_id>.html``
+        as it arrives. A failure for one tender does not stop the others.
+        
+        Args:
+            tender_ids: IDs of the tenders to download
+            output_dir: Directory to save the HTML files to
+            max_workers: Maximum number of concurrent downloads
+            
+        Returns:
+            A TenderDownloadResult with the saved file paths and the error
+            message of every failed tender
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        result = TenderDownloadResult()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.download_tender_html,
+                    tender_id,
+                    os.path.join(output_dir, f"{tender_id}.html")
+                ): tender_id
+                for tender_id in dict.fromkeys(tender_ids)
+            }
+            
+            for future in as_completed(futures):
+                tender_id = futures[future]
+                try:
+                    result.saved[tender_id] = future.result()
+                except Exception as e:
+                    result.failed[tender_id] = str(e)
+                    logger.warning(f"Failed to download HTML for tender {tender_id}: {str(e)}")
+        
+        logger.info(f"Downloaded {len(result.saved)} tender pages, {len(result.failed)} failed")
+        return result
+    
     def parse_response(self, response_data: Dict[str, Any], model_class: Type[T]) -> T:
         """
         Parse API response into a Pydantic model.
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.models import Tender
+
+logger = logging.getLogger(__name__)
+
+
+def tender_fingerprint(tender: Tender) -> str:
+    """
+    Compute a hash of a tender search record.
+
+    Args:
+        tender: The tender returned by the search API
+
+    Returns:
+        Hex digest that changes whenever any field of the record changes
+    """
+    payload = tender.model_dump_json(by_alias=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class CrawlCheckpoint:
+    """
+    Persistent state of an incremental Prozorro search crawl.
+
+    The checkpoint remembers every tender seen so far together with its status
+    and a hash of its search record, the page cursor of an unfinished crawl,
+    and the tenders found new or changed that have not been processed yet.
+    It is stored as a JSON file and rewritten atomically after every page.
+    """
+
+    def __init__(self, path: str, query: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: Path of the checkpoint JSON file
+            query: Search parameters the checkpoint belongs to
+        """
+        self.path = path
+        self.query = query or {}
+        self.tenders: Dict[str, Dict[str, str]] = {}
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.last_page: Optional[int] = None
+        self.total_pages: Optional[int] = None
+        self.last_completed_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str, query: Optional[Dict[str, Any]] = None) -> 'CrawlCheckpoint':
+        """
+        Load a checkpoint from disk, or create an empty one.
+
+        If the stored checkpoint belongs to a different query it is discarded.
+
+        Args:
+            path: Path of the checkpoint JSON file
+            query: Search parameters the checkpoint belongs to
+
+        Returns:
+            A CrawlCheckpoint instance
+        """
+        checkpoint = cls(path, query)
+        if not os.path.exists(path):
+            return checkpoint
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading crawl checkpoint from {path}: {str(e)}")
+            return checkpoint
+
+        if query is not None and state.get('query') != query:
+            logger.warning(f"Checkpoint {path} belongs to query {state.get('query')}, starting a new one")
+            return checkpoint
+
+        checkpoint.query = state.get('query', {})
+        checkpoint.tenders = state.get('tenders', {})
+        checkpoint.pending = state.get('pending', {})
+        checkpoint.last_page = state.get('last_page')
+        checkpoint.total_pages = state.get('total_pages')
+        checkpoint.last_completed_at = state.get('last_completed_at')
+        return checkpoint
+
+    def save(self) -> None:
+        """Write the checkpoint to disk atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        state = {
+            'query': self.query,
+            'last_page': self.last_page,
+            'total_pages': self.total_pages,
+            'last_completed_at': self.last_completed_at,
+            'tenders': self.tenders,
+            'pending': self.pending,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether an interrupted crawl can be resumed."""
+        return self.last_page is not None
+
+    def start_crawl(self, total_pages: int) -> None:
+        """
+        Mark the beginning of a new crawl.
+
+        Args:
+            total_pages: Number of result pages reported by the API
+        """
+        self.total_pages = total_pages
+        self.last_page = None
+
+    def record_page(self, page: int, tenders: Iterable[Tender]) -> List[Tender]:
+        """
+        Record a crawled page and detect new or changed tenders.
+
+        Args:
+            page: Number of the crawled page
+            tenders: Tenders on that page
+
+        Returns:
+            The tenders on the page that are new or changed since they were last seen
+        """
+        changed = []
+        for tender in tenders:
+            fingerprint = tender_fingerprint(tender)
+            known = self.tenders.get(tender.tender_id)
+            if known and known.get('hash') == fingerprint:
+                continue
+
+            self.tenders[tender.tender_id] = {'status': tender.status, 'hash': fingerprint}
+            self.pending[tender.tender_id] = tender.model_dump(mode='json', by_alias=True)
+            changed.append(tender)
+
+        self.last_page = page
+        return changed
+
+    def finish_crawl(self) -> None:
+        """Mark the current crawl as complete."""
+        self.last_page = None
+        self.last_completed_at = datetime.now().isoformat(timespec='seconds')
+
+    def pending_tenders(self) -> List[Tender]:
+        """
+        Return the new or changed tenders that have not been processed yet.
+
+        Returns:
+            List of Tender objects
+        """
+        return [Tender.model_validate(data) for data in self.pending.values()]
+
+    def mark_processed(self, tender_ids: Iterable[str]) -> None:
+        """
+        Remove tenders from the pending list once they have been handled.
+
+        Args:
+            tender_ids: IDs of the processed tenders
+        """
+        for tender_id in tender_ids:
+            self.pending.pop(tender_id, None)
@@ -0,0 +1,288 @@
+"""
+Persistent cache of tender classification verdicts.
+
+The same tender titles come back in every crawl. Verdicts are stored in a
+SQLite file keyed by the normalised title, the model and the version of the
+prompt that produced them, so repeat crawls classify from the cache and a
+new model or prompt never reuses old verdicts. Entries can expire after a
+TTL, and hit/miss counters show how much of a run the cache answered.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters unified by title normalisation
+_UNIFIED_CHARACTERS = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'", "«": '"', "»": '"', "“": '"', "”": '"',
+                                     "–": '-', "—": '-'})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalise a tender title for use as a cache key.
+
+    Applies Unicode NFKC normalisation and case folding, unifies apostrophes,
+    quotes and dashes, collapses whitespace and strips surrounding
+    whitespace and trailing punctuation.
+
+    Args:
+        title: Tender title
+
+    Returns:
+        The normalised title
+    """
+    title = unicodedata.normalize('NFKC', title).casefold().translate(_UNIFIED_CHARACTERS)
+    return _WHITESPACE_RE.sub(' ', title).strip().rstrip('.;,').strip()
+
+
+class ClassificationCacheStats:
+    """Thread-safe hit/miss counters of a ClassificationCache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stored = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increase one of the counters.
+
+        Args:
+            name: Name of the counter attribute
+            amount: Amount to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            Dictionary mapping counter names to their values, with the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'stored': self.stored,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class ClassificationCache:
+    """
+    Persistent cache of classification verdicts.
+
+    A verdict is found only for the same normalised title, model and prompt
+    version it was stored with; expired verdicts (older than ``ttl``
+    seconds) count as misses. It can be shared between threads.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the SQLite file
+            ttl: Seconds a verdict stays valid, None for verdicts that never expire
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.stats = ClassificationCacheStats()
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version INTEGER NOT NULL,
+                verdict INTEGER NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(title: str, model: str, prompt_version: int) -> str:
+        """
+        Build the cache key of a classification.
+
+        Args:
+            title: Tender title (normalised here)
+            model: Name of the model
+            prompt_version: Version of the prompt
+
+        Returns:
+            Hex digest identifying the classification
+        """
+        raw = f"{model}\x00{prompt_version}\x00{normalize_title(title)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, titles: Iterable[str], model: str, prompt_version: int) -> Dict[str, bool]:
+        """
+        Look up the verdicts of several titles.
+
+        Args:
+            titles: Tender titles
+            model: Name of the model
+            prompt_version: Version of the prompt
+
+        Returns:
+            Dictionary mapping the titles with a valid cached verdict to it;
+            titles that normalise alike share the verdict
+        """
+        # Distinct titles can share a key, so every key maps to all its titles
+        keys: Dict[str, List[str]] = {}
+        for title in dict.fromkeys(titles):
+            keys.setdefault(self.make_key(title, model, prompt_version), []).append(title)
+        rows = []
+        with self._lock:
+            key_list = list(keys)
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                rows.extend(self._db.execute(
+                    f"SELECT key, verdict, stored_at FROM verdicts WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ))
+
+        now = time.time()
+        verdicts = {}
+        expired = 0
+        for key, verdict, stored_at in rows:
+            if self.ttl is not None and now - stored_at >= self.ttl:
+                expired += len(keys[key])
+                continue
+            for title in keys[key]:
+                verdicts[title] = bool(verdict)
+        lookups = sum(len(key_titles) for key_titles in keys.values())
+        self.stats.increment('hits', len(verdicts))
+        self.stats.increment('misses', lookups - len(verdicts))
+        self.stats.increment('expired', expired)
+        return verdicts
+
+    def get(self, title: str, model: str, prompt_version: int) -> Optional[bool]:
+        """
+        Look up the verdict of a title.
+
+        Args:
+            title: Tender title
+            model: Name of the model
+            prompt_version: Version of the prompt
+
+        Returns:
+            The cached verdict, or None if there is no valid one
+        """
+        return self.get_many([title], model, prompt_version).get(title)
+
+    def put_many(self, verdicts: Dict[str, bool], model: str, prompt_version: int) -> None:
+        """
+        Store the verdicts of several titles.
+
+        Args:
+            verdicts: Dictionary mapping tender titles to their verdicts
+            model: Name of the model that produced them
+            prompt_version: Version of the prompt that produced them
+        """
+        now = time.time()
+        rows = [
+            (self.make_key(title, model, prompt_version), normalize_title(title), model, prompt_version, int(verdict), now)
+            for title, verdict in verdicts.items()
+        ]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+        self.stats.increment('stored', len(rows))
+
+    def put(self, title: str, verdict: bool, model: str, prompt_version: int) -> None:
+        """
+        Store the verdict of a title.
+
+        Args:
+            title: Tender title
+            verdict: Whether the tender is building-related
+            model: Name of the model that produced it
+            prompt_version: Version of the prompt that produced it
+        """
+        self.put_many({title: verdict}, model, prompt_version)
+
+    def purge(self, model: Optional[str] = None, prompt_version: Optional[int] = None) -> int:
+        """
+        Delete expired verdicts and, if given, those of other models or prompt versions.
+
+        Args:
+            model: Keep only the verdicts of this model
+            prompt_version: Keep only the verdicts of this prompt version
+
+        Returns:
+            Number of deleted verdicts
+        """
+        conditions = []
+        params = []
+        if self.ttl is not None:
+            conditions.append("stored_at <= ?")
+            params.append(time.time() - self.ttl)
+        if model is not None:
+            conditions.append("model != ?")
+            params.append(model)
+        if prompt_version is not None:
+            conditions.append("prompt_version != ?")
+            params.append(prompt_version)
+        if not conditions:
+            return 0
+        with self._lock:
+            deleted = self._db.execute(f"DELETE FROM verdicts WHERE {' OR '.join(conditions)}", params).rowcount
+            self._db.commit()
+        if deleted:
+            logger.info(f"Purged {deleted} classification verdicts from {self.path}")
+        return deleted
+
+    def verdicts(self, model: str, prompt_version: int) -> Iterator[Tuple[str, bool]]:
+        """
+        Iterate over the valid verdicts of a model and prompt version.
+
+        Args:
+            model: Name of the model
+            prompt_version: Version of the prompt
+
+        Yields:
+            Tuples of (normalised title, verdict), e.g. to train a local classifier
+        """
+        min_stored_at = time.time() - self.ttl if self.ttl is not None else float('-inf')
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, verdict FROM verdicts WHERE model = ? AND prompt_version = ? AND stored_at > ?",
+                (model, prompt_version, min_stored_at)
+            ).fetchall()
+        for title, verdict in rows:
+            yield title, bool(verdict)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the cache."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,152 @@
+"""
+Normalisation of the dates found on Prozorro tender pages.
+
+Tender pages write dates with Ukrainian month names in the genitive
+("07 червня 2023 13:24"), often with the time glued to the year
+("07 червня 202313:24"). ``normalize_date`` turns those, ISO dates,
+``dd.mm.yyyy`` dates and dates with English month names into ISO 8601,
+caching its results, as the same date strings repeat across tenders. The
+parser stores the ISO form of every date next to the original text, so
+analyses never re-parse dates.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Month numbers by lowercase name: Ukrainian genitive, nominative and
+# abbreviated forms, and English names
+MONTHS = {}
+for _number, _names in enumerate((
+    ('січня', 'січень', 'січ', 'january', 'jan'),
+    ('лютого', 'лютий', 'лют', 'february', 'feb'),
+    ('березня', 'березень', 'бер', 'march', 'mar'),
+    ('квітня', 'квітень', 'квіт', 'кві', 'april', 'apr'),
+    ('травня', 'травень', 'трав', 'тра', 'may'),
+    ('червня', 'червень', 'черв', 'чер', 'june', 'jun'),
+    ('липня', 'липень', 'лип', 'july', 'jul'),
+    ('серпня', 'серпень', 'серп', 'сер', 'august', 'aug'),
+    ('вересня', 'вересень', 'вер', 'september', 'sep', 'sept'),
+    ('жовтня', 'жовтень', 'жовт', 'жов', 'october', 'oct'),
+    ('листопада', 'листопад', 'лист', 'лис', 'november', 'nov'),
+    ('грудня', 'грудень', 'груд', 'гру', 'december', 'dec'),
+), 1):
+    for _name in _names:
+        MONTHS[_name] = _number
+
+# Fast paths: ISO dates and dd.mm.yyyy dates, each with an optional time
+_ISO_RE = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?')
+_DOTTED_RE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})(?:\s*(\d{1,2}):(\d{2}))?')
+
+# "07 червня 2023", optionally followed by a time, which may be glued to the year
+_NAMED_MONTH_RE = re.compile(r'(\d{1,2})\s+([^\W\d_]+)\.?,?\s*(\d{4})(?:\s*(\d{1,2}):(\d{2}))?')
+
+# A time glued to the year, e.g. "07 червня 202313:24"
+_GLUED_TIME_RE = re.compile(r'(.*?)(\d{4})(\d{2}:\d{2})')
+
+
+def _format(year: int, month: int, day: int, hour: Optional[str], minute: Optional[str]) -> Optional[str]:
+    try:
+        if hour is None:
+            return date(year, month, day).isoformat()
+        return datetime(year, month, day, int(hour), int(minute)).isoformat(timespec='minutes')
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(text: str) -> Optional[str]:
+    """
+    Normalise a date as written on tender pages to ISO 8601.
+
+    Results are cached, as tenders share few distinct date strings.
+
+    Args:
+        text: Date text, e.g. ``07 червня 2023 13:24``, ``07 червня 202313:24``,
+            ``07.06.2023`` or ``2023-06-07T13:24:00+03:00``
+
+    Returns:
+        ``YYYY-MM-DD`` for dates without a time, ``YYYY-MM-DDTHH:MM`` for
+        dates with one (ISO input keeps its seconds and offset), or None if
+        the text is not a recognised date
+    """
+    text = ' '.join(text.split())
+
+    if _ISO_RE.fullmatch(text):
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return parsed.date().isoformat() if len(text) == 10 else parsed.isoformat()
+
+    match = _DOTTED_RE.fullmatch(text) or _NAMED_MONTH_RE.fullmatch(text)
+    if match is None:
+        return None
+    day, month, year, hour, minute = match.groups()
+    if month.isdigit():
+        month = int(month)
+    else:
+        month = MONTHS.get(month.lower())
+        if month is None:
+            return None
+    return _format(int(year), month, int(day), hour, minute)
+
+
+def to_iso(value: Any) -> Optional[str]:
+    """
+    Normalise a date field of parsed data to ISO 8601.
+
+    Args:
+        value: Field value; anything but a non-empty string gives None
+
+    Returns:
+        The ISO date, see ``normalize_date``, or None
+    """
+    if not value or not isinstance(value, str):
+        return None
+    return normalize_date(value)
+
+
+def fix_glued_time(text: str) -> str:
+    """
+    Separate a time glued to the year, e.g. ``07 червня 202313:24``.
+
+    Args:
+        text: Date text
+
+    Returns:
+        The text with spaces around the year (``07 червня  2023 13:24``), or
+        the text unchanged if no time is glued to it
+    """
+    if ':' in text:
+        parts = _GLUED_TIME_RE.match(text)
+        if parts:
+            return f"{parts.group(1)} {parts.group(2)} {parts.group(3)}"
+    return text
+
+
+def add_iso_dates(tender_data: Dict[str, Any]) -> None:
+    """
+    Store the ISO form of every date of a parsed tender next to its text.
+
+    Adds ``<key>_iso`` for every entry of ``dates``, ``publication_date_iso``
+    to awards and ``date_iso`` to documents; the value is None where the
+    text is not a recognised date.
+
+    Args:
+        tender_data: Parsed tender data, updated in place
+    """
+    dates = tender_data.get('dates')
+    if dates:
+        for key, value in list(dates.items()):
+            if not key.endswith('_iso'):
+                dates[f"{key}_iso"] = to_iso(value)
+
+    for award in tender_data.get('awards') or []:
+        if 'publication_date' in award:
+            award['publication_date_iso'] = to_iso(award['publication_date'])
+
+    for document in tender_data.get('documents') or []:
+        if 'date' in document:
+            document['date_iso'] = to_iso(document['date'])
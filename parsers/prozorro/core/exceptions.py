@@ -20,4 +20,9 @@ class ProzorroResponseError(ProzorroAPIError):
 
 class ProzorroParsingError(ProzorroAPIError):
     """Exception raised when parsing the API response fails."""
-    pass 
\ No newline at end of file
+    pass 
+
+
+class ProzorroCircuitOpenError(ProzorroConnectionError):
+    """Exception raised when requests to a host are suspended after repeated failures."""
+    pass
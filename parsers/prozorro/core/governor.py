@@ -0,0 +1,412 @@
+"""
+Request governor shared by the Prozorro API clients.
+
+The governor paces requests with one adaptive token bucket per host, retries
+throttled and failed requests with jittered exponential backoff, applies
+connect/read timeouts and stops hammering a host that keeps failing by means
+of a circuit breaker.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from core.exceptions import ProzorroCircuitOpenError
+from core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either a number of seconds or an HTTP date
+
+    Returns:
+        Number of seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class GovernorStats:
+    """Thread-safe counters describing the work done by a RequestGovernor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.failures = 0
+        self.circuit_rejections = 0
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """
+        Increase one of the counters.
+
+        Args:
+            name: Name of the counter attribute
+            amount: Amount to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            Dictionary mapping counter names to their values
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'failures': self.failures,
+                'circuit_rejections': self.circuit_rejections,
+            }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single host.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected for ``reset_timeout`` seconds. Afterwards a single
+    trial request is let through; its outcome closes or re-opens the circuit.
+    A throttled trial request closes it too, since the host did answer.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before letting a trial request through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request may be sent, False if the circuit is open
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def record_throttled(self) -> None:
+        """Close the circuit if a throttled response answered the trial request."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._failures = 0
+                self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket that adjusts its rate to the responses of the server.
+
+    The rate grows additively after successful requests and is cut
+    multiplicatively when the server answers with 429 Too Many Requests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        capacity: Optional[float] = None
+    ):
+        """
+        Initialize the adaptive token bucket.
+
+        Args:
+            rate: Initial number of requests per second
+            min_rate: Lowest rate the bucket may be slowed down to
+            max_rate: Highest rate the bucket may speed up to
+            increase_step: Requests per second added after each success
+            decrease_factor: Factor applied to the rate after a 429 response
+            capacity: Maximum burst size
+        """
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+
+    def on_success(self) -> None:
+        """Speed up after a successful request."""
+        if self.rate < self.max_rate:
+            self.set_rate(min(self.max_rate, self.rate + self.increase_step))
+
+    def on_throttled(self) -> None:
+        """Slow down after the server asked us to."""
+        self.set_rate(max(self.min_rate, self.rate * self.decrease_factor))
+
+
+class RequestGovernor:
+    """
+    Governs HTTP requests made to Prozorro hosts.
+
+    A single governor is meant to be shared by every client talking to the
+    same hosts, so that the per-host request budget is respected globally.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        max_requests_per_second: float = 4.0,
+        min_requests_per_second: float = 0.1,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        burst: Optional[float] = None
+    ):
+        """
+        Initialize the request governor.
+
+        Args:
+            requests_per_second: Initial request rate for each host
+            max_requests_per_second: Highest request rate a host is sped up to
+            min_requests_per_second: Lowest request rate a host is slowed down to
+            max_retries: Maximum number of retries for a single request
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            connect_timeout: Timeout in seconds for establishing a connection
+            read_timeout: Timeout in seconds for reading the response
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds an open circuit rejects requests for
+            retry_statuses: HTTP status codes that are retried
+            burst: Maximum number of requests sent back to back to a host
+                (defaults to the token bucket's capacity)
+        """
+        self.requests_per_second = requests_per_second
+        self.max_requests_per_second = max_requests_per_second
+        self.min_requests_per_second = min_requests_per_second
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.burst = burst
+        self.stats = GovernorStats()
+        self._hosts: Dict[str, Tuple[AdaptiveTokenBucket, CircuitBreaker]] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, url: str) -> Tuple[AdaptiveTokenBucket, CircuitBreaker]:
+        """Return the token bucket and circuit breaker for the host of a URL."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    AdaptiveTokenBucket(
+                        self.requests_per_second,
+                        self.min_requests_per_second,
+                        self.max_requests_per_second,
+                        capacity=self.burst
+                    ),
+                    CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                )
+            return self._hosts[host]
+
+    def host_rates(self) -> Dict[str, float]:
+        """
+        Return the current request rate of every known host.
+
+        Returns:
+            Dictionary mapping host names to requests per second
+        """
+        with self._lock:
+            return {host: bucket.rate for host, (bucket, _) in self._hosts.items()}
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Compute a jittered exponential backoff delay.
+
+        Args:
+            attempt: Zero-based number of the retry
+
+        Returns:
+            Delay in seconds
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _sleep(self, seconds: float) -> None:
+        """Sleep and account the time as throttled."""
+        if seconds > 0:
+            time.sleep(seconds)
+            self.stats.increment('throttled_seconds', seconds)
+
+    def request(self, session: Any, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send an HTTP request, retrying throttled and failed attempts.
+
+        Responses with a status that is not retried are returned as is, so
+        callers keep handling HTTP errors with ``raise_for_status``. When the
+        retries are exhausted the last response is returned, or the last
+        connection error is raised.
+
+        Args:
+            session: A requests.Session (or anything with a compatible ``request`` method)
+            method: HTTP method
+            url: Request URL
+            **kwargs: Extra arguments passed to ``session.request``
+
+        Returns:
+            The HTTP response
+
+        Raises:
+            ProzorroCircuitOpenError: If the host's circuit is open
+            requests.RequestException: If the request keeps failing to connect
+        """
+        bucket, breaker = self._host_state(url)
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                self.stats.increment('circuit_rejections')
+                raise ProzorroCircuitOpenError(f"Circuit open for {urlparse(url).netloc}, not requesting {url}")
+
+            waited = bucket.acquire()
+            if waited:
+                self.stats.increment('throttled_seconds', waited)
+            self.stats.increment('requests')
+
+            retry_after = None
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                self.stats.increment('failures')
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Request to {url} failed ({str(e)}), retrying")
+            else:
+                if response.status_code not in self.retry_statuses:
+                    breaker.record_success()
+                    bucket.on_success()
+                    return response
+
+                if response.status_code == 429:
+                    self.stats.increment('throttled')
+                    breaker.record_throttled()
+                    bucket.on_throttled()
+                else:
+                    breaker.record_failure()
+                self.stats.increment('failures')
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+                if attempt >= self.max_retries:
+                    return response
+                logger.warning(f"Request to {url} returned {response.status_code}, retrying")
+                response.close()
+
+            delay = self.backoff_delay(attempt)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self.stats.increment('retries')
+            self._sleep(delay)
+            attempt += 1
+
+
+# Per-host limits of the shared governors. Search API requests get a
+# conservative budget; tender page downloads are plain page views with a
+# budget of their own, so parallel downloads do not eat into the search budget.
+DEFAULT_GOVERNOR_LIMITS: Dict[str, Dict[str, float]] = {
+    'api': {'requests_per_second': 1.0, 'max_requests_per_second': 4.0},
+    'pages': {'requests_per_second': 8.0, 'max_requests_per_second': 16.0},
+}
+
+_default_governors: Dict[str, RequestGovernor] = {}
+_default_governor_lock = threading.Lock()
+
+
+def get_default_governor(kind: str = 'api') -> RequestGovernor:
+    """
+    Return the process-wide governor shared by clients created without one.
+
+    There is one shared governor per kind of request, each with the limits
+    listed in ``DEFAULT_GOVERNOR_LIMITS``.
+
+    Args:
+        kind: 'api' for search API requests or 'pages' for tender page downloads
+
+    Returns:
+        The shared RequestGovernor instance for that kind of request
+
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind not in DEFAULT_GOVERNOR_LIMITS:
+        raise ValueError(f"Unknown governor kind: {kind}")
+    with _default_governor_lock:
+        if kind not in _default_governors:
+            _default_governors[kind] = RequestGovernor(**DEFAULT_GOVERNOR_LIMITS[kind])
+        return _default_governors[kind]
@@ -2,11 +2,114 @@ from bs4 import BeautifulSoup
 import re
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import time
+from typing import Callable, Dict, Any, Optional, List
+
+from core.dates import add_iso_dates, fix_glued_time
 
 logger = logging.getLogger(__name__)
 
+# Version of the extraction logic. Bump it whenever a change to the parser
+# changes the extracted data, so that previously parsed pages are re-parsed.
+PARSER_VERSION = 2
+
+class ParseStats:
+    """
+    Hot-path counters of tender page parsing.
+    
+    Collects the wall time spent building the document tree and in every
+    parsing step, the number of calls of each element lookup, and how many
+    string lookups scanned the whole document. Stats of several pages or
+    worker processes are combined with ``merge``.
+    """
+    
+    def __init__(self):
+        self.pages = 0
+        self.step_seconds: Dict[str, float] = {}
+        self.lookup_calls: Dict[str, int] = {}
+        self.full_document_scans = 0
+        
+    def add_time(self, step: str, seconds: float) -> None:
+        """
+        Add the wall time of a parsing step.
+        
+        Args:
+            step: Name of the step
+            seconds: Time spent in the step
+        """
+        self.step_seconds[step] = self.step_seconds.get(step, 0.0) + seconds
+        
+    def count_lookup(self, lookup: str, full_document: bool = False) -> None:
+        """
+        Count a call of an element lookup.
+        
+        Args:
+            lookup: Name of the lookup method
+            full_document: Whether the lookup scanned the whole document for a string
+        """
+        self.lookup_calls[lookup] = self.lookup_calls.get(lookup, 0) + 1
+        if full_document:
+            self.full_document_scans += 1
+            
+    def merge(self, other: 'ParseStats') -> None:
+        """
+        Add the counters of another stats object to this one.
+        
+        Args:
+            other: Stats to add
+        """
+        self.pages += other.pages
+        for step, seconds in other.step_seconds.items():
+            self.add_time(step, seconds)
+        for lookup, calls in other.lookup_calls.items():
+            self.lookup_calls[lookup] = self.lookup_calls.get(lookup, 0) + calls
+        self.full_document_scans += other.full_document_scans
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a summary of the counters.
+        
+        Returns:
+            Dictionary with the page count, the time of every step (slowest
+            first, with its share of the total), the lookup call counts and
+            the number of full-document string scans
+        """
+        total = sum(self.step_seconds.values())
+        steps = sorted(self.step_seconds.items(), key=lambda item: -item[1])
+        return {
+            'pages': self.pages,
+            'total_seconds': round(total, 3),
+            'steps': {
+                step: {
+                    'seconds': round(seconds, 3),
+                    'share': round(seconds / total, 3) if total else 0.0,
+                    'ms_per_page': round(seconds * 1000 / self.pages, 3) if self.pages else 0.0,
+                }
+                for step, seconds in steps
+            },
+            'lookup_calls': dict(sorted(self.lookup_calls.items())),
+            'full_document_scans': self.full_document_scans,
+        }
+        
+    def format(self) -> str:
+        """
+        Format the counters as a human-readable report.
+        
+        Returns:
+            Multi-line report
+        """
+        summary = self.to_dict()
+        lines = [f"Parse stats for {summary['pages']} pages ({summary['total_seconds']:.3f}s):"]
+        for step, timing in summary['steps'].items():
+            lines.append(
+                f"  {step:<28} {timing['seconds']:>9.3f}s {timing['share']:>7.1%} {timing['ms_per_page']:>9.3f} ms/page"
+            )
+        calls = ', '.join(f"{lookup} {count}" for lookup, count in summary['lookup_calls'].items())
+        lines.append(f"  lookup calls: {calls or 'none'}")
+        lines.append(f"  full-document string scans: {summary['full_document_scans']}")
+        return '\n'.join(lines)
+
+
 class TenderHTMLParser:
     """
     Parser for extracting data from Prozorro tender HTML pages.
@@ -15,15 +118,17 @@ class TenderHTMLParser:
     of Prozorro tender pages for further analysis.
     """
     
-    def __init__(self, html_content: str):
+    def __init__(self, html_content: str, stats: Optional[ParseStats] = None):
         """
         Initialize the parser with HTML content.
         
         Args:
             html_content: Raw HTML content of the tender page
+            stats: Optional stats collecting step timings and lookup counts
         """
         self.soup = BeautifulSoup(html_content, 'lxml')
         self.tender_data = {}
+        self.stats = stats
         
     def parse(self) -> Dict[str, Any]:
         """
@@ -32,30 +137,34 @@ class TenderHTMLParser:
         Returns:
             A dictionary containing extracted tender data
         """
+        if self.stats is not None:
+            self.stats.pages += 1
+            self._count_lookups()
+            
         try:
             # Extract basic tender information
-            self._extract_basic_info()
+            self._run_step(self._extract_basic_info)
             
             # Extract customer (procuring entity) information
-            self._extract_customer_info()
+            self._run_step(self._extract_customer_info)
             
             # Extract tender subject information
-            self._extract_subject_info()
+            self._run_step(self._extract_subject_info)
             
             # Extract award information
-            self._extract_award_info()
+            self._run_step(self._extract_award_info)
             
             # Extract dates
-            self._extract_dates()
+            self._run_step(self._extract_dates)
             
             # Extract documents
-            self._extract_documents()
+            self._run_step(self._extract_documents)
             
             # Extract location data (for geographic analysis)
-            self._extract_location_data()
+            self._run_step(self._extract_location_data)
             
             # Clean up and normalize data
-            self._clean_and_normalize_data()
+            self._run_step(self._clean_and_normalize_data)
             
             return self.tender_data
         except Exception as e:
@@ -63,18 +172,107 @@ class TenderHTMLParser:
             # Return whatever data we've extracted so far
             return self.tender_data
     
+    def _run_step(self, step: Callable[[], None]) -> None:
+        """
+        Run a parsing step, timing it if stats are collected.
+        
+        Args:
+            step: Bound method of the step
+        """
+        if self.stats is None:
+            step()
+            return
+        started = time.perf_counter()
+        try:
+            step()
+        finally:
+            self.stats.add_time(step.__name__, time.perf_counter() - started)
+            
+    def _count_lookups(self) -> None:
+        """Make this parser's element lookups count their calls in its stats."""
+        stats = self.stats
+        
+        def counted(name: str, lookup: Callable) -> Callable:
+            def wrapper(*args, **kwargs):
+                stats.count_lookup(name)
+                return lookup(*args, **kwargs)
+            return wrapper
+            
+        for name in ('_select_one', '_select', '_get_text'):
+            setattr(self, name, counted(name, getattr(self, name)))
+            
+        find_containing = self._find_containing
+        
+        def counted_find_containing(name: str, text: str, scope: Optional[Any] = None) -> Optional[Any]:
+            stats.count_lookup('_find_containing', full_document=scope is None)
+            return find_containing(name, text, scope)
+        self._find_containing = counted_find_containing
+        
+    def _select_one(self, selector: str, scope: Optional[Any] = None) -> Optional[Any]:
+        """
+        Return the first element matching a CSS selector.
+        
+        Args:
+            selector: CSS selector
+            scope: Element to search within (the whole document if None)
+        
+        Returns:
+            The matching element or None
+        """
+        return (self.soup if scope is None else scope).select_one(selector)
+    
+    def _select(self, selector: str, scope: Optional[Any] = None) -> List[Any]:
+        """
+        Return all elements matching a CSS selector in document order.
+        
+        Args:
+            selector: CSS selector
+            scope: Element to search within (the whole document if None)
+        
+        Returns:
+            List of matching elements
+        """
+        return (self.soup if scope is None else scope).select(selector)
+    
+    def _find_containing(self, name: str, text: str, scope: Optional[Any] = None) -> Optional[Any]:
+        """
+        Return the first element with the given tag name whose string contains a text.
+        
+        Args:
+            name: Tag name
+            text: Text the element's string must contain
+            scope: Element to search within (the whole document if None)
+        
+        Returns:
+            The matching element or None
+        """
+        return (self.soup if scope is None else scope).find(name, string=lambda s: text in str(s) if s else False)
+    
+    def _get_text(self, element: Any, separator: str = '') -> str:
+        """
+        Return the stripped text of an element.
+        
+        Args:
+            element: Element to get the text of
+            separator: String joining the text fragments
+        
+        Returns:
+            The text of the element
+        """
+        return element.get_text(separator, strip=True)
+    
     def _extract_basic_info(self) -> None:
         """Extract basic tender information like ID, title, and status."""
         try:
             # Extract tender title
-            title_elem = self.soup.select_one('.tender--head--title')
-            if title_elem:
-                self.tender_data['title'] = title_elem.get_text(strip=True)
+            title_elem = self._select_one('.tender--head--title')
+            if title_elem is not None:
+                self.tender_data['title'] = self._get_text(title_elem)
             
             # Extract tender ID and hash
-            tender_id_elem = self.soup.select_one('.tender--head--inf')
-            if tender_id_elem:
-                text = tender_id_elem.get_text(strip=True)
+            tender_id_elem = self._select_one('.tender--head--inf')
+            if tender_id_elem is not None:
+                text = self._get_text(tender_id_elem)
                 id_match = re.search(r'(UA-\d{4}-\d{2}-\d{2}-\d{6}-\w)', text)
                 hash_match = re.search(r'([a-f0-9]{32})', text)
                 
@@ -84,14 +282,14 @@ class TenderHTMLParser:
                     self.tender_data['tender_hash'] = hash_match.group(1)
             
             # Extract tender status
-            status_elem = self.soup.select_one('.tender--head--inf .marked')
-            if status_elem:
-                self.tender_data['status'] = status_elem.get_text(strip=True)
+            status_elem = self._select_one('.tender--head--inf .marked')
+            if status_elem is not None:
+                self.tender_data['status'] = self._get_text(status_elem)
             
             # Extract expected cost
-            cost_elem = self.soup.select_one('.tender--description--cost--number')
-            if cost_elem:
-                cost_text = cost_elem.get_text(strip=True)
+            cost_elem = self._select_one('.tender--description--cost--number')
+            if cost_elem is not None:
+                cost_text = self._get_text(cost_elem)
                 cost_match = re.search(r'([\d\s,.]+)\s*([A-Z]+)', cost_text)
                 if cost_match:
                     amount = cost_match.group(1).replace(' ', '').replace(',', '.')
@@ -102,9 +300,9 @@ class TenderHTMLParser:
                     }
             
             # Extract procurement type
-            procurement_type_elem = self.soup.select_one('.tender--head--inf')
-            if procurement_type_elem:
-                for text_part in procurement_type_elem.get_text(strip=True).split('\n'):
+            procurement_type_elem = self._select_one('.tender--head--inf')
+            if procurement_type_elem is not None:
+                for text_part in self._get_text(procurement_type_elem).split('\n'):
                     if 'Закупівля' in text_part:
                         self.tender_data['procurement_type'] = text_part.strip()
                         break
@@ -114,32 +312,32 @@ class TenderHTMLParser:
     def _extract_customer_info(self) -> None:
         """Extract information about the customer (procuring entity)."""
         try:
-            customer_section = self.soup.select_one('.tender--customer--inner')
-            if not customer_section:
+            customer_section = self._select_one('.tender--customer--inner')
+            if customer_section is None:
                 return
             
             customer_info = {}
             
             # Extract customer name
-            name_row = customer_section.find('tr', string=lambda s: 'Найменування' in str(s) if s else False)
-            if name_row:
-                name_cell = name_row.find_all('td')
+            name_row = self._find_containing('tr', 'Найменування', customer_section)
+            if name_row is not None:
+                name_cell = self._select('td', name_row)
                 if len(name_cell) > 1:
-                    customer_info['name'] = name_cell[1].get_text(strip=True)
+                    customer_info['name'] = self._get_text(name_cell[1])
             
             # Extract EDRPOU (company ID)
-            edrpou_row = customer_section.find('tr', string=lambda s: 'ЄДРПОУ' in str(s) if s else False)
-            if edrpou_row:
-                edrpou_cell = edrpou_row.find_all('td')
+            edrpou_row = self._find_containing('tr', 'ЄДРПОУ', customer_section)
+            if edrpou_row is not None:
+                edrpou_cell = self._select('td', edrpou_row)
                 if len(edrpou_cell) > 1:
-                    customer_info['edrpou'] = edrpou_cell[1].get_text(strip=True)
+                    customer_info['edrpou'] = self._get_text(edrpou_cell[1])
             
             # Extract location
-            location_row = customer_section.find('tr', string=lambda s: 'Місцезнаходження' in str(s) if s else False)
-            if location_row:
-                location_cell = location_row.find_all('td')
+            location_row = self._find_containing('tr', 'Місцезнаходження', customer_section)
+            if location_row is not None:
+                location_cell = self._select('td', location_row)
                 if len(location_cell) > 1:
-                    location_text = location_cell[1].get_text(strip=True)
+                    location_text = self._get_text(location_cell[1])
                     customer_info['location'] = location_text
                     
                     # Try to extract region from location
@@ -148,11 +346,11 @@ class TenderHTMLParser:
                         customer_info['region'] = region_match.group(1).strip()
             
             # Extract contact person
-            contact_row = customer_section.find('tr', string=lambda s: 'Контактна особа' in str(s) if s else False)
-            if contact_row:
-                contact_cell = contact_row.find_all('td')
+            contact_row = self._find_containing('tr', 'Контактна особа', customer_section)
+            if contact_row is not None:
+                contact_cell = self._select('td', contact_row)
                 if len(contact_cell) > 1:
-                    contact_text = contact_cell[1].get_text('\n', strip=True).split('\n')
+                    contact_text = self._get_text(contact_cell[1], '\n').split('\n')
                     if len(contact_text) >= 1:
                         customer_info['contact_name'] = contact_text[0]
                     if len(contact_text) >= 2:
@@ -161,11 +359,11 @@ class TenderHTMLParser:
                         customer_info['contact_email'] = contact_text[2]
             
             # Extract category
-            category_row = customer_section.find('tr', string=lambda s: 'Категорія' in str(s) if s else False)
-            if category_row:
-                category_cell = category_row.find_all('td')
+            category_row = self._find_containing('tr', 'Категорія', customer_section)
+            if category_row is not None:
+                category_cell = self._select('td', category_row)
                 if len(category_cell) > 1:
-                    customer_info['category'] = category_cell[1].get_text(strip=True)
+                    customer_info['category'] = self._get_text(category_cell[1])
             
             self.tender_data['customer'] = customer_info
         except Exception as e:
@@ -175,53 +373,53 @@ class TenderHTMLParser:
     def _extract_subject_info(self) -> None:
         """Extract information about the tender subject."""
         try:
-            subject_section = self.soup.select_one('.col-sm-9 .margin-bottom.margin-bottom-more')
-            if not subject_section:
+            subject_section = self._select_one('.col-sm-9 .margin-bottom.margin-bottom-more')
+            if subject_section is None:
                 return
             
             subject_info = {}
             
             # Extract subject type
-            type_elem = subject_section.find('p', string=lambda s: 'Вид предмету закупівлі' in str(s) if s else False)
-            if type_elem:
-                type_match = re.search(r'Вид предмету закупівлі:\s*(.+)', type_elem.get_text(strip=True))
+            type_elem = self._find_containing('p', 'Вид предмету закупівлі', subject_section)
+            if type_elem is not None:
+                type_match = re.search(r'Вид предмету закупівлі:\s*(.+)', self._get_text(type_elem))
                 if type_match:
                     subject_info['type'] = type_match.group(1)
             
             # Extract classifier code
-            classifier_elem = subject_section.find('p', string=lambda s: 'Класифікатор' in str(s) if s else False)
-            if classifier_elem:
-                classifier_text = classifier_elem.get_text(strip=True)
+            classifier_elem = self._find_containing('p', 'Класифікатор', subject_section)
+            if classifier_elem is not None:
+                classifier_text = self._get_text(classifier_elem)
                 classifier_match = re.search(r'ДК 021:2015:(\d+):([^:]+)', classifier_text)
                 if classifier_match:
                     subject_info['classifier_code'] = classifier_match.group(1)
                     subject_info['classifier_name'] = classifier_match.group(2).strip()
             
             # Extract delivery information
-            delivery_elem = subject_section.find('div', string=lambda s: 'Місце поставки товарів' in str(s) if s else False)
-            if delivery_elem:
-                delivery_text = delivery_elem.get_text(strip=True)
+            delivery_elem = self._find_containing('div', 'Місце поставки товарів', subject_section)
+            if delivery_elem is not None:
+                delivery_text = self._get_text(delivery_elem)
                 delivery_match = re.search(r'Місце поставки товарів або місце виконання робіт чи надання послуг:\s*(.+)', delivery_text)
                 if delivery_match:
                     subject_info['delivery_place'] = delivery_match.group(1)
             
             # Extract delivery deadline
-            deadline_elem = subject_section.find('div', string=lambda s: 'Строк поставки товарів' in str(s) if s else False)
-            if deadline_elem:
-                deadline_text = deadline_elem.get_text(strip=True)
+            deadline_elem = self._find_containing('div', 'Строк поставки товарів', subject_section)
+            if deadline_elem is not None:
+                deadline_text = self._get_text(deadline_elem)
                 deadline_match = re.search(r'Строк поставки товарів, виконання робіт чи надання послуг:\s*(.+)', deadline_text)
                 if deadline_match:
                     subject_info['delivery_deadline'] = deadline_match.group(1)
             
             # Extract description
-            description_elem = subject_section.select_one('.tender--description--text.description')
-            if description_elem:
-                subject_info['description'] = description_elem.get_text(strip=True)
+            description_elem = self._select_one('.tender--description--text.description', subject_section)
+            if description_elem is not None:
+                subject_info['description'] = self._get_text(description_elem)
             
             # Extract quantity
-            quantity_elem = subject_section.select_one('.col-md-4 .padding.margin-bottom')
-            if quantity_elem:
-                subject_info['quantity'] = quantity_elem.get_text(strip=True)
+            quantity_elem = self._select_one('.col-md-4 .padding.margin-bottom', subject_section)
+            if quantity_elem is not None:
+                subject_info['quantity'] = self._get_text(quantity_elem)
             
             self.tender_data['subject'] = subject_info
         except Exception as e:
@@ -231,15 +429,15 @@ class TenderHTMLParser:
     def _extract_award_info(self) -> None:
         """Extract information about tender awards (winners)."""
         try:
-            award_table = self.soup.select_one('.table.table-striped')
-            if not award_table:
+            award_table = self._select_one('.table.table-striped')
+            if award_table is None:
                 return
             
             awards = []
             
             # Process each row in the award table
-            for row in award_table.select('tbody tr'):
-                cells = row.select('td')
+            for row in self._select('tbody tr', award_table):
+                cells = self._select('td', row)
                 if len(cells) < 4:
                     continue
                     
@@ -247,7 +445,7 @@ class TenderHTMLParser:
                 
                 # Extract winner name and EDRPOU
                 participant_cell = cells[0]
-                participant_text = participant_cell.get_text('\n', strip=True).split('\n')
+                participant_text = self._get_text(participant_cell, '\n').split('\n')
                 if len(participant_text) >= 1:
                     award['participant_name'] = participant_text[0]
                 if len(participant_text) >= 2:
@@ -257,11 +455,11 @@ class TenderHTMLParser:
                 
                 # Extract award decision
                 decision_cell = cells[1]
-                award['decision'] = decision_cell.get_text(strip=True)
+                award['decision'] = self._get_text(decision_cell)
                 
                 # Extract bid amount
                 bid_cell = cells[2]
-                bid_text = bid_cell.get_text('\n', strip=True).split('\n')
+                bid_text = self._get_text(bid_cell, '\n').split('\n')
                 if len(bid_text) >= 1:
                     try:
                         bid_amount = float(bid_text[0].replace(' ', '').replace(',', '.'))
@@ -275,7 +473,7 @@ class TenderHTMLParser:
                 
                 # Extract publication date
                 date_cell = cells[3]
-                date_text = date_cell.get_text(strip=True)
+                date_text = self._get_text(date_cell)
                 award['publication_date'] = date_text
                 
                 awards.append(award)
@@ -291,11 +489,11 @@ class TenderHTMLParser:
             dates = {}
             
             # Extract publication date
-            publication_elem = self.soup.find('div', string=lambda s: 'Дата оприлюднення' in str(s) if s else False)
-            if publication_elem:
-                date_span = publication_elem.select_one('.date')
-                if date_span:
-                    dates['publication_date'] = date_span.get_text(strip=True)
+            publication_elem = self._find_containing('div', 'Дата оприлюднення')
+            if publication_elem is not None:
+                date_span = self._select_one('.date', publication_elem)
+                if date_span is not None:
+                    dates['publication_date'] = self._get_text(date_span)
             
             self.tender_data['dates'] = dates
         except Exception as e:
@@ -308,11 +506,11 @@ class TenderHTMLParser:
             documents = []
             
             # Find document tables
-            doc_tables = self.soup.select('.documents-tabs .tender--customer')
+            doc_tables = self._select('.documents-tabs .tender--customer')
             
             for table in doc_tables:
-                for row in table.select('tr'):
-                    cells = row.select('td')
+                for row in self._select('tr', table):
+                    cells = self._select('td', row)
                     if len(cells) < 2:
                         continue
                     
@@ -320,15 +518,15 @@ class TenderHTMLParser:
                     
                     # Extract document date
                     date_cell = cells[0]
-                    date_div = date_cell.select_one('.date')
-                    if date_div:
-                        doc['date'] = date_div.get_text(strip=True)
+                    date_div = self._select_one('.date', date_cell)
+                    if date_div is not None:
+                        doc['date'] = self._get_text(date_div)
                     
                     # Extract document title and link
                     doc_cell = cells[1]
-                    doc_link = doc_cell.select_one('a')
-                    if doc_link:
-                        doc['title'] = doc_link.get_text(strip=True)
+                    doc_link = self._select_one('a', doc_cell)
+                    if doc_link is not None:
+                        doc['title'] = self._get_text(doc_link)
                         doc['url'] = doc_link.get('href', '')
                     
                     documents.append(doc)
@@ -384,11 +582,10 @@ class TenderHTMLParser:
                 for award in self.tender_data['awards']:
                     if 'publication_date' in award and award['publication_date']:
                         # Fix broken date formatting (e.g., "07 червня 202313:24")
-                        date_str = award['publication_date']
-                        if ':' in date_str:
-                            parts = re.match(r'(.*?)(\d{4})(\d{2}:\d{2})', date_str)
-                            if parts:
-                                award['publication_date'] = f"{parts.group(1)} {parts.group(2)} {parts.group(3)}"
+                        award['publication_date'] = fix_glued_time(award['publication_date'])
+            
+            # Store ISO dates next to the original ones
+            add_iso_dates(self.tender_data)
         except Exception as e:
             logger.error(f"Error cleaning data: {str(e)}")
     
@@ -402,26 +599,63 @@ class TenderHTMLParser:
         return json.dumps(self.tender_data, ensure_ascii=False, indent=2)
 
 
-def parse_tender_html(html_content: str) -> Dict[str, Any]:
+PARSER_ENGINES = ('bs4', 'lxml')
+
+
+def get_parser_class(engine: str = 'lxml') -> type:
+    """
+    Return the parser class of an extraction engine.
+    
+    Args:
+        engine: 'lxml' for the lxml-native parser (the default) or 'bs4'
+            for the BeautifulSoup parser; both extract identical data
+        
+    Returns:
+        The parser class
+        
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    if engine == 'bs4':
+        return TenderHTMLParser
+    if engine == 'lxml':
+        from core.lxml_parser import LxmlTenderHTMLParser
+        return LxmlTenderHTMLParser
+    raise ValueError(f"Unknown parser engine: {engine}")
+
+
+def parse_tender_html(html_content: str, engine: str = 'lxml', stats: Optional[ParseStats] = None) -> Dict[str, Any]:
     """
     Parse a Prozorro tender HTML page and extract structured data.
     
     Args:
         html_content: Raw HTML content of the tender page
+        engine: Extraction engine, 'lxml' (the default) or 'bs4'
+        stats: Optional stats collecting the tree build time, step timings
+            and lookup counts
         
     Returns:
         Dictionary with extracted tender data
     """
-    parser = TenderHTMLParser(html_content)
+    started = time.perf_counter()
+    parser = get_parser_class(engine)(html_content, stats)
+    if stats is not None:
+        stats.add_time('build_tree', time.perf_counter() - started)
     return parser.parse()
 
 
-def parse_tender_html_file(html_file_path: str) -> Dict[str, Any]:
+def parse_tender_html_file(
+    html_file_path: str,
+    engine: str = 'lxml',
+    stats: Optional[ParseStats] = None
+) -> Dict[str, Any]:
     """
     Parse a Prozorro tender HTML file and extract structured data.
     
     Args:
         html_file_path: Path to the HTML file
+        engine: Extraction engine, 'lxml' (the default) or 'bs4'
+        stats: Optional stats collecting step timings and lookup counts
         
     Returns:
         Dictionary with extracted tender data
@@ -430,7 +664,7 @@ def parse_tender_html_file(html_file_path: str) -> Dict[str, Any]:
         with open(html_file_path, 'r', encoding='utf-8') as f:
             html_content = f.read()
         
-        return parse_tender_html(html_content)
+        return parse_tender_html(html_content, engine, stats)
     except Exception as e:
         logger.error(f"Error parsing HTML file {html_file_path}: {str(e)}")
-        return {} 
\ No newline at end of file
+        return {}
\ No newline at end of file
@@ -0,0 +1,363 @@
+"""
+On-disk HTTP response cache for the Prozorro clients.
+
+Response bodies are stored gzip-compressed next to a small SQLite index with
+their validators (ETag / Last-Modified). Stale entries are revalidated with
+conditional requests, freshness can depend on the tender status found in the
+page, and the total size of the cache is capped with LRU eviction.
+"""
+
+import codecs
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from core.utils import extract_tender_status
+
+logger = logging.getLogger(__name__)
+
+# Tender statuses whose pages no longer change, kept forever by default
+FINAL_TENDER_STATUSES = {
+    'Завершена': None,
+    'Торги відмінено': None,
+    'Торги не відбулися': None,
+}
+
+# Characters of a streamed body carried over between chunks when looking for its status
+STATUS_SEARCH_OVERLAP = 4096
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters of an HTTPCache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increase one of the counters.
+
+        Args:
+            name: Name of the counter attribute
+            amount: Amount to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            Dictionary mapping counter names to their values, with the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'stored': self.stored,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+            }
+
+
+class HTTPCache:
+    """
+    Persistent cache of HTTP responses with conditional revalidation.
+
+    An entry is served without any request while it is fresh. Freshness is
+    decided by the status extracted from the cached body: ``ttl_by_status``
+    maps a status to a TTL in seconds (``None`` meaning the entry never
+    expires), and other entries use ``default_ttl``. Stale entries are
+    revalidated with If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = 512 * 1024 * 1024,
+        ttl_by_status: Optional[Dict[str, Optional[float]]] = None,
+        default_ttl: Optional[float] = 0,
+        status_extractor: Callable[[str], Optional[str]] = extract_tender_status
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory to store the cache in
+            max_size: Maximum total size of the compressed bodies in bytes
+            ttl_by_status: TTL in seconds per status, None for entries that never expire
+            default_ttl: TTL in seconds for entries without a configured status
+            status_extractor: Function returning the status of a response body
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl_by_status = FINAL_TENDER_STATUSES if ttl_by_status is None else ttl_by_status
+        self.default_ttl = default_ttl
+        self.status_extractor = status_extractor
+        self.stats = CacheStats()
+
+        os.makedirs(os.path.join(directory, 'bodies'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                encoding TEXT,
+                status TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(method: str, url: str, data: Any = None) -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            data: Optional request body
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = f"{method.upper()} {url} {data!r}" if data is not None else f"{method.upper()} {url}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        """Return the path of the compressed body of an entry."""
+        return os.path.join(self.directory, 'bodies', f"{key}.gz")
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the index row of an entry, or None if it is not cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, content_type, encoding, status, stored_at "
+                "FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        columns = ('url', 'etag', 'last_modified', 'content_type', 'encoding', 'status', 'stored_at')
+        return dict(zip(columns, row))
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        ttl = self.ttl_by_status.get(entry['status'], self.default_ttl) if entry['status'] else self.default_ttl
+        if ttl is None:
+            return True
+        return time.time() - entry['stored_at'] < ttl
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        """Read and decompress the body of an entry."""
+        try:
+            with gzip.open(self._body_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _touch(self, key: str, revalidated: bool = False) -> None:
+        """Update the access time, and the storage time after a revalidation."""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._db.execute("UPDATE entries SET accessed_at = ?, stored_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _record(self, key: str, response: requests.Response, status: Optional[str]) -> None:
+        """Index a stored body and evict old entries if needed."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, response.url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    response.headers.get('Content-Type'), response.encoding, status,
+                    now, now, os.path.getsize(self._body_path(key))
+                )
+            )
+            self._db.commit()
+        self.stats.increment('stored')
+        self._evict()
+
+    def _store(self, key: str, response: requests.Response) -> None:
+        """Store a successful response and evict old entries if needed."""
+        body = response.content
+        path = self._body_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        status = None
+        if self.status_extractor:
+            status = self.status_extractor(body.decode(response.encoding or 'utf-8', errors='replace'))
+
+        self._record(key, response, status)
+
+    def _tee_chunks(self, key: str, response: requests.Response, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass the body chunks of a streamed response through, compressing them into the cache."""
+        path = self._body_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        status = None
+        tail = ''
+        complete = False
+
+        try:
+            with gzip.open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    if self.status_extractor and status is None:
+                        text = tail + decoder.decode(chunk)
+                        status = self.status_extractor(text)
+                        tail = text[-STATUS_SEARCH_OVERLAP:]
+                    yield chunk
+            complete = True
+        finally:
+            if complete:
+                os.replace(tmp_path, path)
+                self._record(key, response, status)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _tee(self, key: str, response: requests.Response) -> None:
+        """
+        Store a streamed response while the caller reads it.
+
+        The body is compressed into the cache chunk by chunk as it passes
+        through ``iter_content`` and the entry is indexed once the body has
+        been read to the end, so streamed downloads are cached without being
+        buffered in memory. A stream that is not read to the end is not cached.
+        """
+        iter_content = response.iter_content
+
+        def tee_content(chunk_size: Optional[int] = 1, decode_unicode: bool = False) -> Iterator[Any]:
+            chunks = self._tee_chunks(key, response, iter_content(chunk_size))
+            if decode_unicode:
+                return requests.utils.stream_decode_response_unicode(chunks, response)
+            return chunks
+
+        response.iter_content = tee_content
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its size cap."""
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_size:
+                return
+            evicted = []
+            for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                if total <= self.max_size:
+                    break
+                evicted.append(key)
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+            self._db.commit()
+
+        for key in evicted:
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+        self.stats.increment('evictions', len(evicted))
+
+    @staticmethod
+    def _build_response(url: str, entry: Dict[str, Any], body: bytes) -> requests.Response:
+        """Rebuild a requests.Response from a cached entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response._content_consumed = True
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict({
+            key: value for key, value in (
+                ('Content-Type', entry['content_type']),
+                ('ETag', entry['etag']),
+                ('Last-Modified', entry['last_modified']),
+            ) if value
+        })
+        return response
+
+    def fetch(self, governor: Any, session: Any, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the cache.
+
+        Fresh entries are returned without a request, stale entries are
+        revalidated and successful responses are stored. The body of a
+        ``stream=True`` request is stored as the caller reads it.
+
+        Args:
+            governor: The RequestGovernor used to send requests
+            session: The session to send requests with
+            method: HTTP method
+            url: Request URL
+            **kwargs: Extra arguments passed to the request
+
+        Returns:
+            The cached or fetched HTTP response
+        """
+        key = self.make_key(method, url, kwargs.get('data'))
+        entry = self._lookup(key)
+        body = self._read_body(key) if entry else None
+
+        if entry and body is not None:
+            if self._is_fresh(entry):
+                self.stats.increment('hits')
+                self._touch(key)
+                return self._build_response(url, entry, body)
+
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+            kwargs['headers'] = headers
+
+        response = governor.request(session, method, url, **kwargs)
+
+        if response.status_code == 304 and entry and body is not None:
+            self.stats.increment('revalidated')
+            self._touch(key, revalidated=True)
+            return self._build_response(url, entry, body)
+
+        self.stats.increment('misses')
+        if response.status_code == 200:
+            if kwargs.get('stream'):
+                self._tee(key, response)
+            else:
+                self._store(key, response)
+        return response
+
+    def close(self) -> None:
+        """Close the cache index."""
+        with self._lock:
+            self._db.close()
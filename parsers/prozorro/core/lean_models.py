@@ -0,0 +1,137 @@
+"""
+Lightweight tender records for bulk search crawls.
+
+Full validation of a search result builds a tree of nested pydantic models
+(procuring entity, address, contact point, periods) for every tender, while
+bulk crawls mostly read the ID, title, value, status and dates. The records
+in this module validate only those fields into slotted objects and run the
+full ``Tender`` validation lazily, the first time any other field is used.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from core.exceptions import ProzorroParsingError
+from core.models import Tender
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, keeping None as is."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+_OPTIONAL_BOOL = TypeAdapter(Optional[bool])
+
+
+def _parse_optional_bool(value: Any) -> Optional[bool]:
+    """Validate a flag the way the full model does, keeping None as is."""
+    if value is None or isinstance(value, bool):
+        return value
+    return _OPTIONAL_BOOL.validate_python(value)
+
+
+class TenderRecord:
+    """
+    Slotted tender record holding only the commonly used fields.
+
+    Any attribute that is not stored on the record (e.g. ``procuring_entity``)
+    is served from the full ``Tender`` model, which is validated on first use.
+    """
+
+    __slots__ = (
+        'tender_id', 'title', 'status', 'amount', 'currency',
+        'value_added_tax_included', 'tender_start_date', 'tender_end_date',
+        '_raw', '_full'
+    )
+
+    def __init__(self, raw: Dict[str, Any]):
+        """
+        Validate the lean fields of a raw search result.
+
+        Args:
+            raw: A tender object from the search API response
+
+        Raises:
+            ProzorroParsingError: If a required field is missing or invalid
+        """
+        try:
+            value = raw['value']
+            tender_period = raw.get('tenderPeriod') or {}
+
+            self.tender_id = str(raw['tenderID'])
+            self.title = str(raw['title'])
+            self.status = str(raw['status'])
+            self.amount = float(value['amount'])
+            self.currency = str(value['currency'])
+            self.value_added_tax_included = _parse_optional_bool(value.get('valueAddedTaxIncluded'))
+            self.tender_start_date = _parse_datetime(tender_period.get('startDate'))
+            self.tender_end_date = _parse_datetime(tender_period.get('endDate'))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ProzorroParsingError(f"Failed to validate tender record: {str(e)}")
+
+        self._raw = raw
+        self._full = None
+
+    @property
+    def full(self) -> Tender:
+        """
+        The fully validated tender model.
+
+        Raises:
+            ProzorroParsingError: If full validation fails
+        """
+        if self._full is None:
+            try:
+                self._full = Tender.model_validate(self._raw)
+            except Exception as e:
+                raise ProzorroParsingError(f"Failed to validate response data: {str(e)}")
+        return self._full
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not slots, i.e. the nested fields
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.full, name)
+
+    def __repr__(self) -> str:
+        return f"TenderRecord(tender_id={self.tender_id!r}, status={self.status!r}, amount={self.amount!r})"
+
+
+class LeanTenderSearchResponse:
+    """Search response whose tenders are lazily validated TenderRecords."""
+
+    __slots__ = ('page', 'per_page', 'total', 'data')
+
+    def __init__(self, page: int, per_page: int, total: int, data: List[TenderRecord]):
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.data = data
+
+
+def parse_lean_search_response(response_data: Dict[str, Any]) -> LeanTenderSearchResponse:
+    """
+    Parse a search API response into lean tender records.
+
+    Args:
+        response_data: The API response data
+
+    Returns:
+        A LeanTenderSearchResponse
+
+    Raises:
+        ProzorroParsingError: If validation fails
+    """
+    try:
+        return LeanTenderSearchResponse(
+            page=int(response_data['page']),
+            per_page=int(response_data['per_page']),
+            total=int(response_data['total']),
+            data=[TenderRecord(raw) for raw in response_data['data']]
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ProzorroParsingError(f"Failed to validate response data: {str(e)}")
@@ -0,0 +1,302 @@
+"""
+Fast loading of parsed tender data.
+
+Parsed tenders are read either from a directory of JSON files, with a
+thread pool reading files ahead of the consumer, or from a single snapshot
+file: NDJSON (``.ndjson``, optionally gzipped as ``.ndjson.gz``) or a binary
+pickle stream (``.pickle``). JSON is decoded with orjson when it is
+installed. Every source can be consumed as an iterator, so analyses can
+stream tenders instead of holding them all in memory.
+"""
+
+import gzip
+import json
+import logging
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Name of the JSON decoder in use
+JSON_DECODER = 'orjson' if orjson is not None else 'json'
+
+# Tenders per pickle record in binary snapshots
+_PICKLE_CHUNK = 1000
+
+
+def decode_json(data: bytes) -> Any:
+    """Decode JSON bytes with the fastest available decoder."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON with the fastest available encoder."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def is_snapshot(path: str) -> bool:
+    """Check whether a path names a snapshot file rather than a directory of JSON files."""
+    return path.endswith(('.ndjson', '.ndjson.gz', '.pickle'))
+
+
+def list_tender_files(directory: str) -> List[str]:
+    """
+    List the tender JSON files of a directory.
+
+    Files whose names start with an underscore hold run metadata (e.g. the
+    parse summary) rather than tenders and are skipped.
+
+    Args:
+        directory: Directory with parsed tender JSON files
+
+    Returns:
+        Paths of the tender files
+    """
+    return [
+        os.path.join(directory, filename)
+        for filename in os.listdir(directory)
+        if filename.endswith('.json') and not filename.startswith('_')
+    ]
+
+
+def read_tender_file(path: str) -> Optional[Dict[str, Any]]:
+    """Read and decode one tender file, or return None if it cannot be loaded."""
+    try:
+        with open(path, 'rb') as f:
+            return decode_json(f.read())
+    except Exception as e:
+        logger.error(f"Error loading JSON data from {path}: {str(e)}")
+        return None
+
+
+class _Progress:
+    """Logs loading progress every ``every`` items and the total at the end."""
+
+    def __init__(self, source: str, total: Optional[int] = None, every: int = 10000):
+        self.source = source
+        self.total = total
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def step(self) -> None:
+        self.count += 1
+        if self.count % self.every == 0:
+            of_total = f"/{self.total}" if self.total is not None else ''
+            logger.info(f"Loaded {self.count}{of_total} tenders from {self.source}")
+
+    def done(self) -> None:
+        elapsed = time.perf_counter() - self.started
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Loaded {self.count} tenders from {self.source} in {elapsed:.2f}s "
+            f"({rate:,.0f} tenders/s, {JSON_DECODER} decoder)"
+        )
+
+
+def _read_tender_files(paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Read a batch of tender files."""
+    return [read_tender_file(path) for path in paths]
+
+
+def iter_tender_files(directory: str, workers: int = 8, batch_size: int = 64) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily load the tender files of a directory with a pool of reader threads.
+
+    Each thread reads batches of files, and at most a few batches per thread
+    are read ahead of the consumer, so memory stays bounded however many
+    files there are. Files that cannot be loaded or hold no data are logged
+    and skipped.
+
+    Args:
+        directory: Directory with parsed tender JSON files
+        workers: Number of reader threads (1 reads serially)
+        batch_size: Number of files read per task
+
+    Yields:
+        Tender data dictionaries in directory listing order
+    """
+    paths = list_tender_files(directory)
+    progress = _Progress(directory, len(paths))
+
+    def emit(batch: List[Optional[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        for data in batch:
+            if data:
+                progress.step()
+                yield data
+
+    batches = [paths[start:start + batch_size] for start in range(0, len(paths), batch_size)]
+    if workers <= 1:
+        for batch in batches:
+            yield from emit(_read_tender_files(batch))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            window = deque()
+            for batch in batches:
+                window.append(executor.submit(_read_tender_files, batch))
+                if len(window) >= workers * 2:
+                    yield from emit(window.popleft().result())
+            while window:
+                yield from emit(window.popleft().result())
+    progress.done()
+
+
+def iter_snapshot(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read tenders from a snapshot file.
+
+    Binary snapshots are pickle streams; only load snapshots you wrote
+    yourself, as unpickling untrusted data can execute code.
+
+    Args:
+        path: Path of an ``.ndjson``, ``.ndjson.gz`` or ``.pickle`` snapshot
+
+    Yields:
+        Tender data dictionaries in snapshot order
+
+    Raises:
+        ValueError: If the file extension is not a snapshot format
+    """
+    progress = _Progress(path)
+    if path.endswith('.pickle'):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    break
+                for tender in chunk:
+                    progress.step()
+                    yield tender
+    elif path.endswith(('.ndjson', '.ndjson.gz')):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    progress.step()
+                    yield decode_json(line)
+    else:
+        raise ValueError(f"Unknown snapshot format: {path}")
+    progress.done()
+
+
+def iter_tenders(source: str, workers: int = 8) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily load tenders from a directory of JSON files or a snapshot file.
+
+    Args:
+        source: Directory with parsed tender JSON files, or a snapshot file
+        workers: Number of reader threads for directories
+
+    Yields:
+        Tender data dictionaries
+    """
+    if is_snapshot(source):
+        return iter_snapshot(source)
+    return iter_tender_files(source, workers)
+
+
+class SnapshotWriter:
+    """
+    Writes tenders to a consolidated snapshot file.
+
+    The format follows the file extension: ``.ndjson``, ``.ndjson.gz`` or
+    ``.pickle``. The snapshot is written to a temporary file and moved into
+    place when the writer is closed, so a failed run never leaves a partial
+    snapshot behind. Use it as a context manager.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Path of the snapshot file
+
+        Raises:
+            ValueError: If the file extension is not a snapshot format
+        """
+        if not is_snapshot(path):
+            raise ValueError(f"Unknown snapshot format: {path}")
+        self.path = path
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = None
+        self._chunk: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> 'SnapshotWriter':
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        opener = gzip.open if self.path.endswith('.gz') else open
+        self._file = opener(self._tmp_path, 'wb')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(commit=exc_type is None)
+
+    def write(self, tender: Dict[str, Any]) -> None:
+        """
+        Add a tender to the snapshot.
+
+        Args:
+            tender: Tender data dictionary
+        """
+        if self.path.endswith('.pickle'):
+            self._chunk.append(tender)
+            if len(self._chunk) >= _PICKLE_CHUNK:
+                self._flush_chunk()
+        else:
+            self._file.write(encode_json(tender))
+            self._file.write(b'\n')
+        self.count += 1
+
+    def tee(self, tenders: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Write tenders to the snapshot while passing them on.
+
+        Args:
+            tenders: Iterable of tender data dictionaries
+
+        Yields:
+            The same tenders, each one after it has been written
+        """
+        for tender in tenders:
+            self.write(tender)
+            yield tender
+
+    def _flush_chunk(self) -> None:
+        pickle.dump(self._chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._chunk = []
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Finish the snapshot.
+
+        Args:
+            commit: Move the snapshot into place; otherwise discard it
+        """
+        if self._file is None:
+            return
+        if commit and self._chunk:
+            self._flush_chunk()
+        self._file.close()
+        self._file = None
+        if commit:
+            os.replace(self._tmp_path, self.path)
+            logger.info(f"Wrote {self.count} tenders to snapshot {self.path}")
+        else:
+            os.remove(self._tmp_path)
@@ -0,0 +1,245 @@
+"""
+lxml-native extraction engine for Prozorro tender pages.
+
+``TenderHTMLParser`` builds a BeautifulSoup tree on top of lxml and runs its
+lookups through soupsieve and BeautifulSoup's ``find``. This engine parses
+the page into a plain lxml tree and answers the same lookups with
+precompiled XPath expressions, reproducing BeautifulSoup's notion of an
+element's ``string`` and ``get_text`` so that the extracted data is
+identical.
+"""
+
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+import logging
+import re
+
+from lxml import etree
+
+from core.html_parser import ParseStats, TenderHTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Whitespace BeautifulSoup splits class attributes on, beyond what XPath's
+# normalize-space() handles (characters not allowed in XML are left out, as
+# libxml2 never puts them in attribute values)
+_EXTRA_CLASS_WHITESPACE = ''.join(
+    c for c in map(chr, range(0x80, 0x3001)) if c.isspace()
+)
+
+_CLASS_TOKENS = "concat(' ', normalize-space(translate(@class, '{}', '{}')), ' ')".format(
+    _EXTRA_CLASS_WHITESPACE, ' ' * len(_EXTRA_CLASS_WHITESPACE)
+)
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:\.[\w-]+)*)$')
+
+# Tags whose strings BeautifulSoup keeps apart from the main text content
+_STRING_CONTAINERS = frozenset(('rt', 'rp', 'style', 'script', 'template'))
+
+
+def _parse_compound(compound: str) -> Tuple[str, Tuple[str, ...]]:
+    """Split a compound selector like ``div.a.b`` into its tag (``*`` if any) and class names."""
+    match = _SIMPLE_SELECTOR_RE.match(compound)
+    if not match or not compound:
+        raise ValueError(f"Unsupported CSS selector: {compound}")
+    return match.group(1) or '*', tuple(name for name in match.group(2).split('.') if name)
+
+
+def _compound_to_xpath(compound: str) -> str:
+    """Translate a compound selector like ``div.a.b`` into an XPath node test."""
+    tag, classes = _parse_compound(compound)
+    if not classes:
+        return tag
+    # The plain substring test is cheap and rules out most elements before
+    # the exact class token test
+    conditions = ' and '.join(
+        f"contains(@class, '{name}') and contains({_CLASS_TOKENS}, ' {name} ')" for name in classes
+    )
+    return f"{tag}[{conditions}]"
+
+
+@lru_cache(maxsize=None)
+def css_to_xpath(selector: str, first: bool = False, include_self: bool = False) -> etree.XPath:
+    """
+    Compile a CSS selector into an XPath expression.
+
+    Only the selectors used by the tender parser are supported: tag names,
+    class names and the descendant combinator. Like soupsieve, the
+    ancestors matched by the combinator may lie outside the element the
+    selector is evaluated on.
+
+    Args:
+        selector: CSS selector, e.g. ``.col-md-4 .padding.margin-bottom``
+        first: Return only the first match
+        include_self: Match the context element itself as well as its
+            descendants (for queries on the whole document)
+
+    Returns:
+        Compiled XPath returning the matching elements in document order
+
+    Raises:
+        ValueError: If the selector uses unsupported syntax
+    """
+    compounds = selector.split()
+    if not compounds:
+        raise ValueError(f"Unsupported CSS selector: {selector!r}")
+
+    expression = _compound_to_xpath(compounds[-1])
+    ancestors = ''
+    for compound in compounds[:-1]:
+        ancestors = f"[ancestor::{_compound_to_xpath(compound)}{ancestors}]"
+
+    axis = 'descendant-or-self' if include_self else 'descendant'
+    expression = f"{axis}::{expression}{ancestors}"
+    if first:
+        expression = f"({expression})[1]"
+    return etree.XPath(expression)
+
+
+def bs4_string(element: Any) -> Optional[str]:
+    """
+    Return the string of an element as BeautifulSoup's ``Tag.string`` does.
+
+    An element has a string if its only child is a string, or if its only
+    child is an element that has one. Comments count as strings here.
+    Whitespace-only strings are returned as they are in the page, where
+    BeautifulSoup collapses them, which makes no difference to substring
+    tests.
+
+    Args:
+        element: lxml element
+
+    Returns:
+        The string, or None if the element has no single string
+    """
+    while True:
+        if len(element) == 0:
+            return element.text or None
+        if len(element) > 1 or element.text:
+            return None
+
+        child = element[0]
+        if child.tail:
+            return None
+        if child.tag is etree.Comment:
+            # BeautifulSoup keeps empty comments as a single space
+            return child.text or ' '
+        if child.tag is etree.ProcessingInstruction:
+            return f"{child.target} {child.text or ''}"
+        element = child
+
+
+def _string_container(element: Any) -> Optional[str]:
+    """Return the tag of the nearest string container around an element, if any."""
+    for node in element.iterancestors(*_STRING_CONTAINERS):
+        return node.tag
+    return None
+
+
+def _collect_text(element: Any, container: Optional[str], target: Optional[str], parts: List[str]) -> None:
+    """Collect the strings of an element that belong to the target container."""
+    if element.text and container == target:
+        parts.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str):
+            _collect_text(child, child.tag if child.tag in _STRING_CONTAINERS else container, target, parts)
+        if child.tail and container == target:
+            parts.append(child.tail)
+
+
+def bs4_get_text(element: Any, separator: str = '') -> str:
+    """
+    Return the stripped text of an element as BeautifulSoup's ``get_text(separator, strip=True)`` does.
+
+    Comments and the contents of scripts, stylesheets and templates are not
+    part of an element's text.
+
+    Args:
+        element: lxml element
+        separator: String joining the text fragments
+
+    Returns:
+        The text of the element
+    """
+    tag = element.tag if element.tag in _STRING_CONTAINERS else None
+    container = tag or _string_container(element)
+
+    if container is None and next(element.iterdescendants(*_STRING_CONTAINERS), None) is None:
+        # Fast path: no text to leave out but comments, which itertext skips
+        strings = element.itertext()
+    else:
+        strings = []
+        _collect_text(element, container, tag, strings)
+
+    return separator.join(text for text in (s.strip() for s in strings) if text)
+
+
+def parse_html_document(html_content: str) -> Any:
+    """
+    Parse an HTML page into an lxml tree the way BeautifulSoup's lxml builder does.
+
+    Args:
+        html_content: Raw HTML content
+
+    Returns:
+        The root element of the page
+    """
+    if html_content[:1] == '\ufeff':
+        html_content = html_content[1:]
+
+    parser = etree.HTMLParser()
+    parser.feed(html_content)
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        # Empty document
+        root = None
+
+    if root is None:
+        root = etree.Element('html')
+    return root
+
+
+class LxmlTenderHTMLParser(TenderHTMLParser):
+    """
+    Tender page parser working directly on an lxml tree.
+
+    Extraction logic is inherited from ``TenderHTMLParser``; only the
+    element lookups are answered differently, with CSS selectors compiled
+    once into XPath expressions.
+    """
+
+    def __init__(self, html_content: str, stats: Optional[ParseStats] = None):
+        """
+        Initialize the parser with HTML content.
+
+        Args:
+            html_content: Raw HTML content of the tender page
+            stats: Optional stats collecting step timings and lookup counts
+        """
+        self.root = parse_html_document(html_content)
+        self.tender_data = {}
+        self.stats = stats
+
+    def _select_one(self, selector: str, scope: Optional[Any] = None) -> Optional[Any]:
+        if scope is None:
+            matches = css_to_xpath(selector, first=True, include_self=True)(self.root)
+        else:
+            matches = css_to_xpath(selector, first=True)(scope)
+        return matches[0] if matches else None
+
+    def _select(self, selector: str, scope: Optional[Any] = None) -> List[Any]:
+        if scope is None:
+            return css_to_xpath(selector, include_self=True)(self.root)
+        return css_to_xpath(selector)(scope)
+
+    def _find_containing(self, name: str, text: str, scope: Optional[Any] = None) -> Optional[Any]:
+        elements = self.root.iter(name) if scope is None else scope.iterdescendants(name)
+        for element in elements:
+            string = bs4_string(element)
+            if string and text in string:
+                return element
+        return None
+
+    def _get_text(self, element: Any, separator: str = '') -> str:
+        return bs4_get_text(element, separator)
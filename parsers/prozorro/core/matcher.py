@@ -0,0 +1,130 @@
+"""
+Multi-keyword matching for text classification.
+
+``KeywordMatcher`` holds a configurable list of keywords with weights and
+finds them in text: which keywords occur, their weighted score, and the
+position of every occurrence.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Union
+
+
+class KeywordMatch(NamedTuple):
+    """One occurrence of a keyword in a text."""
+    keyword: str
+    start: int
+    end: int
+    weight: float
+
+
+class KeywordMatcher:
+    """
+    Finds a set of keywords in text, including overlapping occurrences.
+
+    Keywords match anywhere in a word, like ``in`` substring tests, so
+    ``пошкодж`` matches ``непошкоджений``. Duplicate keywords are merged.
+
+    Which keywords occur is decided with one substring search per keyword,
+    which on Cyrillic text is several times faster in CPython than a regex
+    alternation scanning the text once; it runs at the speed of the keyword
+    loop it replaces. The positions of occurrences come from a single
+    compiled regex that tries every keyword, longest first, at each position
+    of the text.
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, float]], ignore_case: bool = True):
+        """
+        Initialize the matcher.
+
+        Args:
+            keywords: Keywords, or a mapping of keywords to their weights
+                (keywords given as a plain list weigh 1.0)
+            ignore_case: Match regardless of case; texts and keywords are
+                lowercased and positions refer to the lowercased text
+
+        Raises:
+            ValueError: If there are no keywords or one of them is empty
+        """
+        weights = keywords if isinstance(keywords, Mapping) else dict.fromkeys(keywords, 1.0)
+        self.ignore_case = ignore_case
+        self.weights: Dict[str, float] = {}
+        for keyword, weight in weights.items():
+            if not keyword:
+                raise ValueError("Keywords must not be empty")
+            if ignore_case:
+                keyword = keyword.lower()
+            self.weights.setdefault(keyword, float(weight))
+        if not self.weights:
+            raise ValueError("At least one keyword is required")
+        self.keywords = tuple(self.weights)
+
+        # The regex reports the longest keyword starting at each position;
+        # keywords that are prefixes of it start there as well
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+        self._pattern = re.compile(f'(?=({alternation}))')
+        self._prefixes = {
+            keyword: [other for other in sorted(self.keywords, key=len, reverse=True)
+                      if other != keyword and keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def _prepare(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """
+        Find every occurrence of every keyword.
+
+        Args:
+            text: Text to search
+
+        Yields:
+            Matches ordered by start position, longer keywords first
+        """
+        for match in self._pattern.finditer(self._prepare(text)):
+            start = match.start()
+            keyword = match.group(1)
+            yield KeywordMatch(keyword, start, start + len(keyword), self.weights[keyword])
+            for prefix in self._prefixes[keyword]:
+                yield KeywordMatch(prefix, start, start + len(prefix), self.weights[prefix])
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        Return every occurrence of every keyword.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            List of matches ordered by start position, longer keywords first
+        """
+        return list(self.finditer(text))
+
+    def keywords_in(self, *texts: Optional[str]) -> List[str]:
+        """
+        Return the keywords occurring in any of the texts.
+
+        Args:
+            texts: Texts to search; None is skipped
+
+        Returns:
+            Distinct matched keywords in the order they were configured
+        """
+        # The texts are lowercased once, joined by a separator that cannot be part of a match
+        text = self._prepare('\x00'.join(text for text in texts if text))
+        return [keyword for keyword in self.keywords if keyword in text]
+
+    def score(self, *texts: Optional[str]) -> float:
+        """
+        Return the total weight of the keywords occurring in any of the texts.
+
+        Each keyword counts once, however often it occurs.
+
+        Args:
+            texts: Texts to search; None is skipped
+
+        Returns:
+            Sum of the weights of the matched keywords
+        """
+        return sum(self.weights[keyword] for keyword in self.keywords_in(*texts))
@@ -42,7 +42,7 @@ class Period(BaseModel):
 
 class Value(BaseModel):
     amount: float
-    value_added_tax_included: bool = Field(alias="valueAddedTaxIncluded")
+    value_added_tax_included: Optional[bool] = Field(default=None, alias="valueAddedTaxIncluded")
     currency: str
 
 
@@ -67,4 +67,27 @@ class SearchParams(BaseModel):
     text: Optional[str] = None
     region: Optional[str] = None
     page: int = 0
-    per_page: int = 20 
\ No newline at end of file
+    per_page: int = 20
+
+
+class TenderDownloadResult(BaseModel):
+    saved: Dict[str, str] = Field(default_factory=dict)
+    failed: Dict[str, str] = Field(default_factory=dict)
+
+
+class CrawlShard(BaseModel):
+    text: Optional[str] = None
+    region: Optional[str] = None
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        filters = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"region={self.region}" + (f",{filters}" if filters else "")
+
+
+class ShardedCrawlResult(BaseModel):
+    tenders: List[Tender] = Field(default_factory=list)
+    shard_counts: Dict[str, int] = Field(default_factory=dict)
+    duplicates: int = 0
+    failed: Dict[str, str] = Field(default_factory=dict)
@@ -0,0 +1,98 @@
+from typing import Iterable, Iterator
+import logging
+import os
+
+from core.models import Tender
+
+logger = logging.getLogger(__name__)
+
+
+class TenderNDJSONWriter:
+    """
+    Append-only NDJSON sink for validated tenders.
+
+    Every tender is written as one JSON line as soon as it arrives and the
+    file is flushed regularly, so a crash mid-crawl keeps everything written
+    so far. Use it as a context manager.
+    """
+
+    def __init__(self, path: str, flush_every: int = 20):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Path of the NDJSON file to append to
+            flush_every: Number of tenders written between flushes
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'TenderNDJSONWriter':
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, tender: Tender) -> None:
+        """
+        Append a tender to the file.
+
+        Args:
+            tender: The tender to write
+        """
+        self._file.write(tender.model_dump_json(by_alias=True))
+        self._file.write('\n')
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def tee(self, tenders: Iterable[Tender]) -> Iterator[Tender]:
+        """
+        Write tenders to the file while passing them on to the next stage.
+
+        Args:
+            tenders: Iterable of tenders, typically a lazy crawl
+
+        Yields:
+            The same tenders, each one after it has been written
+        """
+        for tender in tenders:
+            self.write(tender)
+            yield tender
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Wrote {self.count} tenders to {self.path}")
+
+
+def read_tenders_ndjson(path: str, skip_invalid: bool = True) -> Iterator[Tender]:
+    """
+    Lazily read tenders from an NDJSON file.
+
+    Args:
+        path: Path of the NDJSON file
+        skip_invalid: Skip lines that fail to validate (e.g. a truncated last line)
+            instead of raising
+
+    Yields:
+        Tender objects in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield Tender.model_validate_json(line)
+            except Exception as e:
+                if not skip_invalid:
+                    raise
+                logger.warning(f"Skipping invalid line {line_number} in {path}: {str(e)}")
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable
+
+from core.html_parser import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file's content.
+
+    Args:
+        path: Path of the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        Hex digest of the content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseManifest:
+    """
+    Record of the HTML files a parsed-data directory was produced from.
+
+    For every input file the manifest keeps the hash of its HTML and the
+    parser version that produced its JSON, so a later run can skip files
+    whose HTML and parser are both unchanged. It is stored as a JSON file
+    and rewritten atomically.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: Path of the manifest JSON file
+        """
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'ParseManifest':
+        """
+        Load a manifest from disk, or create an empty one.
+
+        Args:
+            path: Path of the manifest JSON file
+
+        Returns:
+            A ParseManifest instance
+        """
+        manifest = cls(path)
+        if not os.path.exists(path):
+            return manifest
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest.files = json.load(f).get('files', {})
+        except Exception as e:
+            logger.error(f"Error loading parse manifest from {path}: {str(e)}")
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'parser_version': PARSER_VERSION, 'files': self.files}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def is_current(self, name: str, sha256: str, output_file: str) -> bool:
+        """
+        Check whether a file's parsed output is up to date.
+
+        Args:
+            name: Name of the HTML file
+            sha256: Hash of the HTML file's current content
+            output_file: Path of the parsed JSON file
+
+        Returns:
+            True if the output exists and was produced from the same HTML by
+            the current parser version
+        """
+        entry = self.files.get(name)
+        return (
+            entry is not None
+            and entry.get('sha256') == sha256
+            and entry.get('parser_version') == PARSER_VERSION
+            and os.path.exists(output_file)
+        )
+
+    def record(self, name: str, sha256: str, output_file: str) -> None:
+        """
+        Record that a file was parsed by the current parser version.
+
+        Args:
+            name: Name of the HTML file
+            sha256: Hash of the parsed HTML
+            output_file: Path of the parsed JSON file
+        """
+        self.files[name] = {
+            'sha256': sha256,
+            'parser_version': PARSER_VERSION,
+            'output': os.path.basename(output_file),
+        }
+
+    def discard(self, name: str) -> None:
+        """
+        Forget a file, e.g. one that failed to parse.
+
+        Args:
+            name: Name of the HTML file
+        """
+        self.files.pop(name, None)
+
+    def retain(self, names: Iterable[str]) -> None:
+        """
+        Forget every file not in the given names, e.g. deleted HTML files.
+
+        Args:
+            names: Names of the HTML files to keep
+        """
+        keep = set(names)
+        self.files = {name: entry for name, entry in self.files.items() if name in keep}
@@ -0,0 +1,318 @@
+"""
+Staged pipeline for the crawl → classify → download → parse workflow.
+
+Each stage runs in its own pool of worker threads and is connected to the
+next one by a bounded queue, so stages overlap and a slow stage pushes back
+on the ones before it instead of letting work pile up in memory.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.base import BaseAPIClient
+from core.html_parser import parse_tender_html_file
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class StageStats:
+    """Counters of a single pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.received = 0
+        self.emitted = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def record(self, emitted: bool, busy: float, error: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record the outcome of processing one item.
+
+        Args:
+            emitted: Whether the item was passed on to the next stage
+            busy: Seconds spent processing the item
+            error: The failed item and its error message, if processing failed
+        """
+        with self._lock:
+            self.received += 1
+            self.emitted += int(emitted)
+            self.busy_seconds += busy
+            if error:
+                self.errors.append(error)
+
+    def observe_queue(self, depth: int) -> None:
+        """
+        Record the depth of the stage's input queue.
+
+        Args:
+            depth: Number of items waiting in the queue
+        """
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Return a summary of the stage.
+
+        Args:
+            elapsed: Wall time of the whole pipeline run in seconds
+
+        Returns:
+            Dictionary with counts, throughput and queue depth
+        """
+        return {
+            'received': self.received,
+            'emitted': self.emitted,
+            'errors': len(self.errors),
+            'items_per_second': round(self.received / elapsed, 2) if elapsed > 0 else 0.0,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+
+class Stage:
+    """
+    A pipeline stage applying a function to every item.
+
+    The function returns the item to pass on to the next stage, or None to
+    drop it (e.g. a tender that is not building-related). Exceptions are
+    recorded per item and do not stop the stage.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = 100):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Name used in logs and statistics
+            func: Function applied to every item
+            workers: Number of worker threads
+            queue_size: Capacity of the stage's input queue
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = StageStats(name)
+
+
+class Pipeline:
+    """Runs items from a source through a sequence of stages."""
+
+    def __init__(self, stages: List[Stage], report_interval: float = 10.0):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in processing order
+            report_interval: Seconds between progress log lines (0 to disable)
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.report_interval = report_interval
+        self.source_stats = StageStats('source')
+        self.results: List[Any] = []
+        self.source_error: Optional[Exception] = None
+        self.elapsed = 0.0
+        self._results_lock = threading.Lock()
+
+    def stage(self, name: str) -> Stage:
+        """
+        Return the stage with the given name.
+
+        Args:
+            name: Name of the stage
+
+        Returns:
+            The stage
+
+        Raises:
+            KeyError: If the pipeline has no stage with that name
+        """
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def _put(self, stage: Stage, item: Any) -> None:
+        """Put an item into a stage's queue, blocking while it is full."""
+        stage.queue.put(item)
+        stage.stats.observe_queue(stage.queue.qsize())
+
+    def _feed(self, source: Iterable[Any]) -> None:
+        """Push the items of the source into the first stage, keeping the error it fails with."""
+        first = self.stages[0]
+        started = time.perf_counter()
+        try:
+            for item in source:
+                self.source_stats.record(True, time.perf_counter() - started)
+                self._put(first, item)
+                started = time.perf_counter()
+        except Exception as e:
+            logger.error(f"Pipeline source failed: {str(e)}")
+            self.source_stats.errors.append({'item': None, 'error': str(e)})
+            self.source_error = e
+
+    def _work(self, index: int) -> None:
+        """Process items of one stage until it is told to stop."""
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                break
+
+            started = time.perf_counter()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                logger.error(f"Stage {stage.name} failed on {getattr(item, 'tender_id', item)}: {str(e)}")
+                stage.stats.record(False, time.perf_counter() - started, {'item': item, 'error': str(e)})
+                continue
+
+            stage.stats.record(result is not None, time.perf_counter() - started)
+            if result is None:
+                continue
+            if next_stage is not None:
+                self._put(next_stage, result)
+            else:
+                with self._results_lock:
+                    self.results.append(result)
+
+    def _report(self, done: threading.Event, started: float) -> None:
+        """Periodically log the progress of every stage."""
+        while not done.wait(self.report_interval):
+            elapsed = time.perf_counter() - started
+            progress = ", ".join(
+                f"{stage.name}: {stage.stats.received} done, {stage.queue.qsize()} queued"
+                for stage in self.stages
+            )
+            logger.info(f"Pipeline after {elapsed:.0f}s - source: {self.source_stats.received} items, {progress}")
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        """
+        Run the pipeline until the source is exhausted and all stages are drained.
+
+        If the source fails, the items it produced before failing are still
+        processed by every stage, then its error is raised.
+
+        Args:
+            source: Iterable producing the input items, consumed in a separate thread
+
+        Returns:
+            The items emitted by the last stage
+
+        Raises:
+            Exception: The error the source failed with, if any
+        """
+        started = time.perf_counter()
+        done = threading.Event()
+
+        workers = [
+            [threading.Thread(target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+             for n in range(stage.workers)]
+            for index, stage in enumerate(self.stages)
+        ]
+        for stage_workers in workers:
+            for thread in stage_workers:
+                thread.start()
+
+        feeder = threading.Thread(target=self._feed, args=(source,), name="source", daemon=True)
+        feeder.start()
+
+        if self.report_interval:
+            threading.Thread(target=self._report, args=(done, started), daemon=True).start()
+
+        # Shut the stages down in order once everything upstream has finished
+        feeder.join()
+        for stage, stage_workers in zip(self.stages, workers):
+            for _ in stage_workers:
+                stage.queue.put(_STOP)
+            for thread in stage_workers:
+                thread.join()
+
+        done.set()
+        self.elapsed = time.perf_counter() - started
+        if self.source_error is not None:
+            raise self.source_error
+        return self.results
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-stage throughput and queue depth of the last run.
+
+        Returns:
+            Dictionary mapping stage names to their statistics
+        """
+        report = {'source': self.source_stats.to_dict(self.elapsed)}
+        for stage in self.stages:
+            report[stage.name] = stage.stats.to_dict(self.elapsed)
+        return report
+
+
+def build_tender_pipeline(
+    client: BaseAPIClient,
+    classifier: Any,
+    html_dir: str,
+    parsed_dir: Optional[str] = None,
+    classify_workers: int = 4,
+    download_workers: int = 8,
+    parse_workers: int = 2,
+    queue_size: int = 100
+) -> Pipeline:
+    """
+    Build the classify → download → parse pipeline for tender search results.
+
+    Args:
+        client: API client used to download tender pages
+        classifier: Object with an ``is_building_related(title)`` method
+        html_dir: Directory to save tender HTML pages to
+        parsed_dir: Directory to save parsed tender JSON to (None to skip parsing)
+        classify_workers: Number of classification threads
+        download_workers: Number of download threads
+        parse_workers: Number of parsing threads
+        queue_size: Capacity of the queue in front of each stage
+
+    Returns:
+        A Pipeline to be run with a stream of tenders as its source
+    """
+    os.makedirs(html_dir, exist_ok=True)
+    if parsed_dir:
+        os.makedirs(parsed_dir, exist_ok=True)
+
+    def classify(tender):
+        return tender if classifier.is_building_related(tender.title) else None
+
+    def download(tender):
+        return client.download_tender_html(tender.tender_id, os.path.join(html_dir, f"{tender.tender_id}.html"))
+
+    def parse(html_file):
+        parsed_data = parse_tender_html_file(html_file)
+        if not parsed_data:
+            raise ValueError(f"No data extracted from {html_file}")
+        stem = os.path.splitext(os.path.basename(html_file))[0]
+        output_file = os.path.join(parsed_dir, f"{stem}.json")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(parsed_data, f, ensure_ascii=False, indent=2)
+        return output_file
+
+    stages = [
+        Stage('classify', classify, classify_workers, queue_size),
+        Stage('download', download, download_workers, queue_size),
+    ]
+    if parsed_dir:
+        stages.append(Stage('parse', parse, parse_workers, queue_size))
+
+    return Pipeline(stages)
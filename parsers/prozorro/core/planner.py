@@ -0,0 +1,198 @@
+from typing import List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import logging
+
+from core.governor import RequestGovernor
+from core.models import CrawlShard, ShardedCrawlResult, Tender
+from core.scraper import ProzorroScraper
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, date]
+
+
+def expand_regions(regions: str) -> List[str]:
+    """
+    Expand a region filter into individual region codes.
+
+    Args:
+        regions: Region filter such as '61-64' or '61,63,70-71'
+
+    Returns:
+        List of region codes, e.g. ['61', '62', '63', '64']
+    """
+    codes = []
+    for part in regions.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            width = len(start.strip())
+            codes.extend(str(code).zfill(width) for code in range(int(start), int(end) + 1))
+        else:
+            codes.append(part)
+    return list(dict.fromkeys(codes))
+
+
+class CrawlPlanner:
+    """
+    Splits a tender search into independent shards and crawls them in parallel.
+
+    A query is sharded by region code and, optionally, by date window. Shards
+    are crawled by a pool of workers that share one scraper, so the request
+    budget of its governor applies globally to all of them. Tenders found in
+    several shards are kept once.
+    """
+
+    def __init__(
+        self,
+        scraper: Optional[ProzorroScraper] = None,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        date_from_param: str = "date_from",
+        date_to_param: str = "date_to"
+    ):
+        """
+        Initialize the crawl planner.
+
+        Args:
+            scraper: Scraper shared by all workers (a new one is created if omitted)
+            max_workers: Number of shards crawled at the same time
+            requests_per_second: Global search API request budget for a newly
+                created scraper, never exceeded (tender page downloads keep the
+                shared 'pages' budget)
+            date_from_param: Name of the search parameter starting a date window
+            date_to_param: Name of the search parameter ending a date window
+        """
+        if scraper is None:
+            governor = None
+            if requests_per_second:
+                governor = RequestGovernor(
+                    requests_per_second=requests_per_second,
+                    max_requests_per_second=requests_per_second
+                )
+            scraper = ProzorroScraper(governor=governor, pool_size=max_workers)
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.date_from_param = date_from_param
+        self.date_to_param = date_to_param
+
+    def plan(
+        self,
+        text: Optional[str] = None,
+        regions: Optional[str] = None,
+        date_windows: Optional[List[Tuple[DateLike, DateLike]]] = None
+    ) -> List[CrawlShard]:
+        """
+        Split a search query into shards.
+
+        Args:
+            text: Optional search text
+            regions: Optional region filter such as '61-64'
+            date_windows: Optional list of (start, end) date windows
+
+        Returns:
+            List of CrawlShard objects, one per region and date window
+        """
+        region_codes = expand_regions(regions) if regions else [None]
+
+        windows = [{}]
+        if date_windows:
+            windows = [
+                {self.date_from_param: str(start), self.date_to_param: str(end)}
+                for start, end in date_windows
+            ]
+
+        return [
+            CrawlShard(text=text, region=region, params=window)
+            for region in region_codes
+            for window in windows
+        ]
+
+    def _crawl_shard(self, shard: CrawlShard, per_page: int, max_pages: Optional[int]) -> List[Tender]:
+        """Crawl every page of a single shard."""
+        tenders = self.scraper.get_all_tender_pages(
+            text=shard.text,
+            region=shard.region,
+            per_page=per_page,
+            max_pages=max_pages,
+            extra_params=shard.params or None
+        )
+        logger.info(f"Shard {shard.key} returned {len(tenders)} tenders")
+        return tenders
+
+    def crawl(
+        self,
+        shards: List[CrawlShard],
+        per_page: int = 20,
+        max_pages: Optional[int] = None
+    ) -> ShardedCrawlResult:
+        """
+        Crawl shards in parallel and merge their results.
+
+        A failing shard does not stop the others; its error is reported in the
+        result. Tenders are merged in shard order and deduplicated by tender ID.
+
+        Args:
+            shards: Shards to crawl, usually produced by ``plan``
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve per shard (None for all)
+
+        Returns:
+            A ShardedCrawlResult with the merged tenders and per-shard statistics
+        """
+        result = ShardedCrawlResult()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._crawl_shard, shard, per_page, max_pages)
+                for shard in shards
+            ]
+
+            seen = set()
+            for shard, future in zip(shards, futures):
+                try:
+                    tenders = future.result()
+                except Exception as e:
+                    logger.error(f"Error crawling shard {shard.key}: {str(e)}")
+                    result.failed[shard.key] = str(e)
+                    continue
+
+                result.shard_counts[shard.key] = len(tenders)
+                for tender in tenders:
+                    if tender.tender_id in seen:
+                        result.duplicates += 1
+                        continue
+                    seen.add(tender.tender_id)
+                    result.tenders.append(tender)
+
+        logger.info(
+            f"Crawled {len(shards)} shards: {len(result.tenders)} unique tenders, "
+            f"{result.duplicates} duplicates, {len(result.failed)} failed shards"
+        )
+        return result
+
+    def run(
+        self,
+        text: Optional[str] = None,
+        regions: Optional[str] = None,
+        date_windows: Optional[List[Tuple[DateLike, DateLike]]] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None
+    ) -> ShardedCrawlResult:
+        """
+        Plan and crawl a search query.
+
+        Args:
+            text: Optional search text
+            regions: Optional region filter such as '61-64'
+            date_windows: Optional list of (start, end) date windows
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve per shard (None for all)
+
+        Returns:
+            A ShardedCrawlResult with the merged tenders and per-shard statistics
+        """
+        return self.crawl(self.plan(text, regions, date_windows), per_page, max_pages)
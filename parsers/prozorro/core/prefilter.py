@@ -0,0 +1,465 @@
+"""
+Local pre-filter cascade for tender classification.
+
+Most tender titles are easy: "Капітальний ремонт покрівлі будинку" is about
+restoring a building and "Бензин А-95" is not. The cascade decides such
+titles locally and leaves only the ambiguous ones to the language model:
+
+1. ``RuleClassifier`` settles titles by keywords and ДК 021 codes quoted
+   in them.
+2. ``TitleModel``, an optional TF-IDF logistic regression trained on past
+   model verdicts, settles titles it is confident about.
+3. The remaining titles are escalated to the language model.
+
+``CascadeStats`` counts how many titles each tier decided.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.classification_cache import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Restoration and construction works
+WORK_KEYWORDS = [
+    'ремонт', 'реконструкц', 'відновл', 'віднов', 'відбудов', 'реставрац',
+    'будівництв', 'будівельн', 'капітальн', 'утеплен', 'термомодерніз'
+]
+
+# Buildings and their parts
+OBJECT_KEYWORDS = [
+    'будин', 'будівл', 'житл', 'квартир', 'гуртожит', 'покрівл', 'дах', 'фасад',
+    'приміщен', 'вікон', 'вікна', 'віконн', 'школ', 'гімназ', 'ліцей', 'садк', 'лікарн', 'амбулатор'
+]
+
+# Goods and services unrelated to buildings
+NEGATIVE_KEYWORDS = [
+    'папір', 'бензин', 'дизельн', 'паливо', 'пальн', 'продукт', 'харчуван', 'медичн', 'лікарськ',
+    'препарат', 'канцеляр', "комп'ютер", 'охорон', "зв'язк", 'автомобіл', 'транспортн', 'вугілл',
+    'дров', 'одяг', 'взутт', 'миюч', 'програмн', 'страхуван', 'навчанн'
+]
+
+# ДК 021 code prefixes of building construction, installation and completion works
+POSITIVE_CODES = ('4521', '4526', '453', '454')
+
+# ДК 021 code prefixes of goods and services unrelated to buildings
+NEGATIVE_CODES = (
+    '03', '09', '15', '18', '22', '30', '32', '33', '34', '35', '38',
+    '48', '55', '60', '64', '66', '72', '79', '80', '85'
+)
+
+_DK_CODE_RE = re.compile(r'ДК\s*021\s*:\s*2015\s*:\s*(\d{8})', re.IGNORECASE)
+_TOKEN_RE = re.compile(r'\w{3,}')
+
+# Tiers of the cascade, in the order they are tried
+TIERS = ('rules', 'model', 'llm')
+
+
+def _stem_pattern(stems: Iterable[str]) -> 're.Pattern[str]':
+    """Compile a regex finding words that start with one of the stems."""
+    alternation = '|'.join(re.escape(stem) for stem in sorted(set(stems), key=len, reverse=True))
+    return re.compile(rf'\b(?:{alternation})')
+
+
+class RuleClassifier:
+    """
+    Keyword and ДК 021 code rules deciding the clear-cut titles.
+
+    Keywords are word stems and match at the start of words only. A title
+    is building-related only if it quotes a building works code and no
+    keyword of unrelated goods and services. It is not building-related if
+    its code or its keywords belong to unrelated goods and services and it
+    mentions neither works nor buildings. Titles naming both works and a
+    building without such a code are left to the model, since "Ремонт
+    медичного обладнання для лікарні" reads like building work as well.
+    """
+
+    def __init__(
+        self,
+        work_keywords: Iterable[str] = WORK_KEYWORDS,
+        object_keywords: Iterable[str] = OBJECT_KEYWORDS,
+        negative_keywords: Iterable[str] = NEGATIVE_KEYWORDS,
+        positive_codes: Sequence[str] = POSITIVE_CODES,
+        negative_codes: Sequence[str] = NEGATIVE_CODES
+    ):
+        """
+        Initialize the rules.
+
+        Args:
+            work_keywords: Stems of restoration and construction works
+            object_keywords: Stems of buildings and their parts
+            negative_keywords: Stems of unrelated goods and services
+            positive_codes: ДК 021 code prefixes of building works
+            negative_codes: ДК 021 code prefixes of unrelated goods and services
+        """
+        self.work_pattern = _stem_pattern(work_keywords)
+        self.object_pattern = _stem_pattern(object_keywords)
+        self.negative_pattern = _stem_pattern(negative_keywords)
+        self.positive_codes = tuple(positive_codes)
+        self.negative_codes = tuple(negative_codes)
+
+    def decide(self, title: str) -> Optional[bool]:
+        """
+        Decide a title by the rules.
+
+        Args:
+            title: Tender title; a ДК 021 code quoted in it is taken into account
+
+        Returns:
+            True or False if the rules settle the title, None otherwise
+        """
+        text = normalize_title(title)
+        code_match = _DK_CODE_RE.search(title)
+        code = code_match.group(1) if code_match else None
+
+        related = self.work_pattern.search(text) or self.object_pattern.search(text)
+        if self.negative_pattern.search(text):
+            return None if related else False
+        if code and code.startswith(self.positive_codes):
+            return True
+        if code and code.startswith(self.negative_codes) and not related:
+            return False
+        return None
+
+
+def title_features(title: str) -> List[str]:
+    """
+    Return the features of a title for the TF-IDF model.
+
+    Features are word stems (the first six characters of the words of the
+    normalised title) and pairs of adjacent stems.
+
+    Args:
+        title: Tender title
+
+    Returns:
+        Distinct features of the title
+    """
+    stems = [token[:6] for token in _TOKEN_RE.findall(normalize_title(title)) if not token.isdigit()]
+    features = [f"w:{stem}" for stem in stems]
+    features.extend(f"b:{first}_{second}" for first, second in zip(stems, stems[1:]))
+    return list(dict.fromkeys(features))
+
+
+class TitleModel:
+    """
+    TF-IDF logistic regression over title features.
+
+    Trained on past language model verdicts (e.g. the contents of a
+    ClassificationCache) with plain stochastic gradient descent, so it
+    needs no third-party libraries.
+    """
+
+    def __init__(self, idf: Dict[str, float], weights: Dict[str, float], bias: float):
+        """
+        Initialize the model.
+
+        Args:
+            idf: Inverse document frequency of every known feature
+            weights: Weight of every known feature
+            bias: Bias term
+        """
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+
+    def _vector(self, title: str) -> Dict[str, float]:
+        values = {feature: self.idf[feature] for feature in title_features(title) if feature in self.idf}
+        norm = math.sqrt(sum(value * value for value in values.values()))
+        return {feature: value / norm for feature, value in values.items()} if norm else {}
+
+    def predict_proba(self, title: str) -> float:
+        """
+        Return the probability that a title is building-related.
+
+        Args:
+            title: Tender title
+
+        Returns:
+            Probability between 0 and 1
+        """
+        score = self.bias + sum(self.weights.get(feature, 0.0) * value for feature, value in self._vector(title).items())
+        return 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0)))
+
+    @classmethod
+    def train(
+        cls,
+        titles: Sequence[str],
+        labels: Sequence[bool],
+        epochs: int = 15,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        min_df: int = 2,
+        seed: int = 0
+    ) -> 'TitleModel':
+        """
+        Train a model on labelled titles.
+
+        Args:
+            titles: Tender titles
+            labels: Whether each title is building-related
+            epochs: Passes over the training data
+            learning_rate: Initial step size of gradient descent
+            l2: L2 regularisation strength
+            min_df: Minimum number of titles a feature must occur in
+            seed: Seed of the shuffling of the training data
+
+        Returns:
+            The trained model
+
+        Raises:
+            ValueError: If there are no titles or their number differs from
+                the number of labels
+        """
+        if not titles or len(titles) != len(labels):
+            raise ValueError("Training needs as many labels as titles, and at least one title")
+
+        document_frequency: Dict[str, int] = {}
+        for title in titles:
+            for feature in title_features(title):
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        count = len(titles)
+        idf = {
+            feature: math.log((1 + count) / (1 + frequency)) + 1.0
+            for feature, frequency in document_frequency.items() if frequency >= min_df
+        }
+        model = cls(idf, {}, 0.0)
+        examples = [(model._vector(title), 1.0 if label else 0.0) for title, label in zip(titles, labels)]
+
+        rng = random.Random(seed)
+        weights = model.weights
+        for epoch in range(epochs):
+            rng.shuffle(examples)
+            rate = learning_rate / (1.0 + epoch)
+            for vector, target in examples:
+                score = model.bias + sum(weights.get(feature, 0.0) * value for feature, value in vector.items())
+                error = 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0))) - target
+                model.bias -= rate * error
+                for feature, value in vector.items():
+                    weight = weights.get(feature, 0.0)
+                    weights[feature] = weight - rate * (error * value + l2 * weight)
+        logger.info(f"Trained title model on {count} titles with {len(idf)} features")
+        return model
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the model as a JSON-serialisable dictionary."""
+        return {'idf': self.idf, 'weights': self.weights, 'bias': self.bias}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TitleModel':
+        """Create a model from the dictionary produced by ``to_dict``."""
+        return cls(data['idf'], data['weights'], data['bias'])
+
+    def save(self, path: str) -> None:
+        """
+        Save the model to a JSON file.
+
+        Args:
+            path: Path of the file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'TitleModel':
+        """
+        Load a model saved with ``save``.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            The loaded model
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class CascadeStats:
+    """Thread-safe counters of the titles decided by each tier of a cascade."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rules = 0
+        self.model = 0
+        self.llm = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increase one of the counters.
+
+        Args:
+            name: Name of the tier
+            amount: Amount to add
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            Dictionary mapping tier names to their counts, with the share of
+            titles decided locally
+        """
+        with self._lock:
+            total = self.rules + self.model + self.llm
+            return {
+                'rules': self.rules,
+                'model': self.model,
+                'llm': self.llm,
+                'local_share': round((self.rules + self.model) / total, 3) if total else 0.0,
+            }
+
+
+class ClassificationCascade:
+    """
+    Decides titles with the cheap local tiers and picks the rest for the language model.
+
+    The model tier decides a title only if its probability is at most
+    ``lower`` or at least ``upper``; the band in between is escalated.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[RuleClassifier] = None,
+        model: Optional[TitleModel] = None,
+        lower: float = 0.05,
+        upper: float = 0.95
+    ):
+        """
+        Initialize the cascade.
+
+        Args:
+            rules: Rule tier (the default RuleClassifier if not given)
+            model: Optional model tier
+            lower: Probability at or below which the model decides NO
+            upper: Probability at or above which the model decides YES
+
+        Raises:
+            ValueError: If the thresholds are not ordered within 0 and 1
+        """
+        if not 0.0 <= lower < upper <= 1.0:
+            raise ValueError("Thresholds must satisfy 0 <= lower < upper <= 1")
+        self.rules = rules or RuleClassifier()
+        self.model = model
+        self.lower = lower
+        self.upper = upper
+        self.stats = CascadeStats()
+
+    def route(self, title: str) -> Tuple[Optional[bool], str]:
+        """
+        Decide a title with the local tiers without counting it in the stats.
+
+        Args:
+            title: Tender title
+
+        Returns:
+            Tuple of (verdict, or None if the title must be escalated, and
+            the name of the deciding tier: 'rules', 'model' or 'llm')
+        """
+        verdict = self.rules.decide(title)
+        if verdict is not None:
+            tier = 'rules'
+        elif self.model is not None:
+            probability = self.model.predict_proba(title)
+            if probability >= self.upper:
+                verdict, tier = True, 'model'
+            elif probability <= self.lower:
+                verdict, tier = False, 'model'
+            else:
+                tier = 'llm'
+        else:
+            tier = 'llm'
+        return verdict, tier
+
+    def decide(self, title: str) -> Tuple[Optional[bool], str]:
+        """
+        Decide a title with the local tiers and count it in the stats.
+
+        Args:
+            title: Tender title
+
+        Returns:
+            Tuple of (verdict, or None if the title must be escalated, and
+            the name of the deciding tier: 'rules', 'model' or 'llm')
+        """
+        verdict, tier = self.route(title)
+        self.stats.increment(tier)
+        return verdict, tier
+
+    def split(self, titles: Iterable[str]) -> Tuple[Dict[str, bool], List[str]]:
+        """
+        Decide what the local tiers can and collect the rest.
+
+        Args:
+            titles: Distinct tender titles
+
+        Returns:
+            Tuple of (verdicts of the titles decided locally, titles to escalate)
+        """
+        decided = {}
+        escalated = []
+        for title in titles:
+            verdict, _ = self.decide(title)
+            if verdict is None:
+                escalated.append(title)
+            else:
+                decided[title] = verdict
+        return decided, escalated
+
+
+def evaluate_cascade(
+    cascade: ClassificationCascade,
+    titles: Sequence[str],
+    labels: Sequence[bool]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure the verdicts of each local tier against reference labels.
+
+    Titles should be held out from the training data of the model tier,
+    and labels should come from the language model or from people, not
+    from the rules themselves. The titles are routed without touching the
+    runtime stats of the cascade.
+
+    Args:
+        cascade: Cascade to evaluate
+        titles: Tender titles
+        labels: Reference verdict of each title
+
+    Returns:
+        Dictionary mapping each tier to the number of titles it decided, its
+        accuracy, and the precision and recall of its YES verdicts on those
+        titles (None where undefined); the 'llm' tier only has a count
+    """
+    counts = {tier: {'true_yes': 0, 'false_yes': 0, 'true_no': 0, 'false_no': 0} for tier in TIERS}
+    escalated = 0
+    for title, label in zip(titles, labels):
+        verdict, tier = cascade.route(title)
+        if verdict is None:
+            escalated += 1
+            continue
+        outcome = ('true_' if verdict == label else 'false_') + ('yes' if verdict else 'no')
+        counts[tier][outcome] += 1
+
+    report = {}
+    for tier in TIERS[:-1]:
+        tier_counts = counts[tier]
+        decided = sum(tier_counts.values())
+        positives = tier_counts['true_yes'] + tier_counts['false_no']
+        predicted = tier_counts['true_yes'] + tier_counts['false_yes']
+        report[tier] = {
+            'decided': decided,
+            'accuracy': round((tier_counts['true_yes'] + tier_counts['true_no']) / decided, 3) if decided else None,
+            'precision': round(tier_counts['true_yes'] / predicted, 3) if predicted else None,
+            'recall': round(tier_counts['true_yes'] / positives, 3) if positives else None,
+        }
+    report['llm'] = {'decided': escalated}
+    return report
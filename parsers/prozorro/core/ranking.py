@@ -0,0 +1,306 @@
+"""
+Incremental top-k rankings of suppliers and customers.
+
+The summary report only needs the ten largest suppliers and customers.
+Rather than building a full record with every tender ID for each of them
+and sorting them all at the end, the ranking accumulators keep a few
+counters per entity and bounded heaps of the current top k by total value
+and by tender count, both updated as tenders are added. Tender ID lists
+are only kept when details are asked for; otherwise only their count is.
+"""
+
+import heapq
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from core.aggregation import Accumulator
+
+# A rank orders entities by score, ties by first appearance: (score, -order)
+Rank = Tuple[float, int]
+
+
+class TopK:
+    """
+    The k keys with the highest rank, kept up to date as ranks grow.
+
+    Ranks of keys may only increase: a key that drops out of the top k can
+    then only come back through an update of its own rank, which is checked
+    against the lowest rank in the top k. Updates are pushed onto a min-heap
+    and outdated heap entries are discarded lazily.
+    """
+
+    def __init__(self, k: int):
+        """
+        Initialize the selection.
+
+        Args:
+            k: Number of keys to keep
+
+        Raises:
+            ValueError: If k is less than 1
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = k
+        self._members: Dict[Hashable, Rank] = {}
+        self._heap: List[Tuple[Rank, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _discard_outdated(self) -> None:
+        heap = self._heap
+        members = self._members
+        while heap and members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def offer(self, key: Hashable, rank: Rank) -> None:
+        """
+        Report the current rank of a key.
+
+        Args:
+            key: The key
+            rank: Its rank, at least as high as any rank offered for it before
+        """
+        members = self._members
+        if key in members:
+            if members[key] != rank:
+                members[key] = rank
+                heapq.heappush(self._heap, (rank, key))
+                if len(self._heap) > 4 * self.k + 16:
+                    # Drop the outdated entries of frequently updated keys
+                    self._heap = [(member_rank, member) for member, member_rank in members.items()]
+                    heapq.heapify(self._heap)
+        elif len(members) < self.k:
+            members[key] = rank
+            heapq.heappush(self._heap, (rank, key))
+        else:
+            self._discard_outdated()
+            if rank > self._heap[0][0]:
+                _, evicted = heapq.heapreplace(self._heap, (rank, key))
+                del members[evicted]
+                members[key] = rank
+
+    def keys(self) -> List[Hashable]:
+        """
+        Return the keys in the top k.
+
+        Returns:
+            Keys by descending rank
+        """
+        return sorted(self._members, key=self._members.__getitem__, reverse=True)
+
+
+class _EntityCounters:
+    """Compact running totals of one supplier or customer."""
+
+    __slots__ = ('order', 'tender_count', 'total_value', 'currencies', 'tender_ids',
+                 'tender_id_count', 'last_tender_id', 'edrpou', 'region')
+
+    def __init__(self, order: int, details: bool):
+        self.order = order
+        self.tender_count = 0
+        self.total_value = 0
+        self.currencies = set()
+        self.tender_ids = set() if details else None
+        self.tender_id_count = 0
+        self.last_tender_id = None
+        self.edrpou = None
+        self.region = None
+
+
+class EntityRanking:
+    """
+    Running totals of entities with their top k by total value and by tender count.
+
+    Distinct tender IDs are counted without storing them, which relies on
+    every tender being added once, with all of its mentions of an entity
+    added together.
+    """
+
+    def __init__(self, k: int = 10, details: bool = False):
+        """
+        Initialize the ranking.
+
+        Args:
+            k: Number of entities in each top list
+            details: Keep the tender IDs of every entity, not only their count
+        """
+        self.k = k
+        self.details = details
+        self.entities: Dict[str, _EntityCounters] = {}
+        self.by_value = TopK(k)
+        self.by_count = TopK(k)
+        # Set when a total value decreases, which the heap cannot follow
+        self._values_decreased = False
+
+    def add(self, name: str, tender_id: Optional[str] = None,
+            amount: Optional[float] = None, currency: Optional[str] = None) -> _EntityCounters:
+        """
+        Account for one mention of an entity.
+
+        Args:
+            name: Entity name
+            tender_id: ID of the tender mentioning it, if any
+            amount: Value to add to its total, if any
+            currency: Currency of the value, if any
+
+        Returns:
+            The entity's counters, for callers tracking further attributes
+        """
+        entity = self.entities.get(name)
+        if entity is None:
+            entity = self.entities[name] = _EntityCounters(len(self.entities), self.details)
+        entity.tender_count += 1
+        self.by_count.offer(name, (entity.tender_count, -entity.order))
+
+        if tender_id is not None:
+            if self.details:
+                entity.tender_ids.add(tender_id)
+            if tender_id != entity.last_tender_id:
+                entity.tender_id_count += 1
+                entity.last_tender_id = tender_id
+
+        if currency is not None:
+            entity.currencies.add(currency)
+        if amount is not None:
+            entity.total_value += amount
+            if amount < 0:
+                self._values_decreased = True
+        if not self._values_decreased:
+            self.by_value.offer(name, (entity.total_value, -entity.order))
+        return entity
+
+    def top_by_value(self) -> List[str]:
+        """Return the names of the top k entities by total value, best first."""
+        if self._values_decreased:
+            entities = self.entities
+            return heapq.nlargest(self.k, entities, key=lambda name: (entities[name].total_value, -entities[name].order))
+        return self.by_value.keys()
+
+    def top_by_count(self) -> List[str]:
+        """Return the names of the top k entities by tender count, best first."""
+        return self.by_count.keys()
+
+    def record(self, name: str, attributes: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Return the report record of an entity.
+
+        Args:
+            name: Entity name
+            attributes: Further counter attributes to include, e.g. 'edrpou'
+
+        Returns:
+            Dictionary with the tender count, total value, currencies, and
+            the tender IDs (with details) or their count
+        """
+        entity = self.entities[name]
+        record = {
+            'tender_count': entity.tender_count,
+            'total_value': entity.total_value,
+            'currencies': sorted(entity.currencies),
+        }
+        if self.details:
+            record['tender_ids'] = sorted(entity.tender_ids)
+        else:
+            record['tender_id_count'] = entity.tender_id_count
+        for attribute in attributes:
+            record[attribute] = getattr(entity, attribute)
+        return record
+
+    def result(self, attributes: Iterable[str] = ()) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Return the top entities.
+
+        Args:
+            attributes: Further counter attributes to include in the records
+
+        Returns:
+            Dictionary with 'by_value' and 'by_count', each mapping the
+            names of the top k entities, best first, to their records
+        """
+        return {
+            'by_value': {name: self.record(name, attributes) for name in self.top_by_value()},
+            'by_count': {name: self.record(name, attributes) for name in self.top_by_count()},
+        }
+
+
+class SupplierRankingAccumulator(Accumulator):
+    """Top winning suppliers by total bid value and by tender count."""
+
+    def __init__(self, k: int = 10, details: bool = False):
+        """
+        Initialize the accumulator.
+
+        Args:
+            k: Number of suppliers in each top list
+            details: Keep the tender IDs of every supplier, not only their count
+        """
+        self.ranking = EntityRanking(k, details)
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        if 'awards' not in tender or not tender['awards']:
+            return
+        tender_id = tender.get('tender_id')
+        for award in tender['awards']:
+            if 'participant_name' in award and award['decision'] == 'Переможець':
+                if 'bid_amount' in award and 'bid_currency' in award:
+                    self.ranking.add(award['participant_name'], tender_id, award['bid_amount'], award['bid_currency'])
+                else:
+                    self.ranking.add(award['participant_name'], tender_id)
+
+    def result(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return self.ranking.result()
+
+
+class CustomerRankingAccumulator(Accumulator):
+    """Top procuring entities by total expected value and by tender count."""
+
+    def __init__(self, k: int = 10, details: bool = False):
+        """
+        Initialize the accumulator.
+
+        Args:
+            k: Number of customers in each top list
+            details: Keep the tender IDs of every customer, not only their count
+        """
+        self.ranking = EntityRanking(k, details)
+
+    def add(self, tender: Dict[str, Any]) -> None:
+        if 'customer' not in tender or 'name' not in tender['customer']:
+            return
+        customer_data = tender['customer']
+        tender_id = tender.get('tender_id')
+        if 'expected_cost' in tender:
+            cost = tender['expected_cost']
+            customer = self.ranking.add(customer_data['name'], tender_id,
+                                        cost.get('amount', 0), cost.get('currency', 'UAH'))
+        else:
+            customer = self.ranking.add(customer_data['name'], tender_id)
+
+        if 'edrpou' in customer_data and not customer.edrpou:
+            customer.edrpou = customer_data['edrpou']
+
+        if 'region' in customer_data and not customer.region:
+            customer.region = customer_data['region']
+
+    def result(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return self.ranking.result(('edrpou', 'region'))
+
+
+def top_entities(entities: Dict[str, Dict[str, Any]], k: int = 10,
+                 field: str = 'total_value') -> Dict[str, Dict[str, Any]]:
+    """
+    Select the top entities of a full supplier or customer analysis.
+
+    Args:
+        entities: Result of ``analyze_suppliers`` or ``analyze_customers``
+        k: Number of entities to select
+        field: Field to rank by, 'total_value' or 'tender_count'
+
+    Returns:
+        The k entities with the highest field value, best first; ties keep
+        their original order
+    """
+    order = {name: index for index, name in enumerate(entities)}
+    top = heapq.nlargest(k, entities, key=lambda name: (entities[name][field], -order[name]))
+    return {name: entities[name] for name in top}
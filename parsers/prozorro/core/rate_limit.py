@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at ``rate`` tokens per second up to
+    ``capacity``. Callers acquire tokens before making a request and are
+    delayed only as long as needed to stay within the configured rate.
+    The same bucket can be shared between threads.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Number of tokens added per second
+            capacity: Maximum number of tokens (burst size), defaults to max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update."""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the refill rate, keeping the tokens accumulated so far.
+
+        Args:
+            rate: New number of tokens added per second
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Try to take tokens from the bucket without blocking.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the number of seconds
+            to wait before trying again
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Total number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
@@ -1,7 +1,10 @@
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator
 import logging
-import time
 from core.base import BaseAPIClient
+from core.checkpoint import CrawlCheckpoint
+from core.governor import RequestGovernor
+from core.http_cache import HTTPCache
+from core.lean_models import LeanTenderSearchResponse, parse_lean_search_response
 from core.models import TenderSearchResponse, SearchParams, Tender
 from core.utils import encode_text_param
 
@@ -13,14 +16,31 @@ class ProzorroScraper(BaseAPIClient):
     This class provides methods to search for tenders and retrieve tender details.
     """
     
-    def __init__(self, base_url: str = "https://prozorro.gov.ua/api"):
+    def __init__(
+        self,
+        base_url: str = "https://prozorro.gov.ua/api",
+        governor: Optional[RequestGovernor] = None,
+        pool_size: int = 10,
+        cache: Optional[HTTPCache] = None,
+        lean: bool = False,
+        page_governor: Optional[RequestGovernor] = None
+    ):
         """
         Initialize the Prozorro scraper.
         
         Args:
             base_url: The base URL for the Prozorro API
+            governor: Request governor pacing and retrying search API requests
+                (defaults to the shared 'api' one)
+            pool_size: Number of keep-alive connections kept open per host
+            cache: Optional HTTP response cache for search results and tender pages
+            lean: Parse search results into lightweight TenderRecords whose nested
+                fields are validated lazily, instead of full Tender models
+            page_governor: Request governor pacing and retrying tender page
+                downloads (defaults to the shared 'pages' one)
         """
-        super().__init__(base_url)
+        super().__init__(base_url, governor, pool_size, cache, page_governor)
+        self.lean = lean
         self.logger = logging.getLogger(__name__)
     
     def search_tenders(
@@ -28,19 +48,22 @@ class ProzorroScraper(BaseAPIClient):
         text: Optional[str] = None,
         region: Optional[str] = None,
         page: int = 0,
-        per_page: int = 20
-    ) -> TenderSearchResponse:
+        per_page: int = 20,
+        extra_params: Optional[Dict[str, Any]] = None
+    ) -> Union[TenderSearchResponse, LeanTenderSearchResponse]:
         """
         Search for tenders using the Prozorro API.
         
         Args:
             text: Optional search text
             region: Optional region filter (format: '61-64' for regions 61 through 64)
-            page: Page number (0-based)
+            page: Page number (1-based)
             per_page: Number of results per page
+            extra_params: Optional additional search filters (e.g. a date window)
             
         Returns:
             A TenderSearchResponse object containing search results
+            (a LeanTenderSearchResponse in lean mode)
             
         Raises:
             ProzorroAPIError: If the API request fails
@@ -55,6 +78,8 @@ class ProzorroScraper(BaseAPIClient):
         
         # Convert to dict for URL params
         params = search_params.model_dump(exclude_none=True)
+        if extra_params:
+            params.update(extra_params)
         
         self.logger.info(f"Searching tenders with params: {params}")
         
@@ -62,40 +87,44 @@ class ProzorroScraper(BaseAPIClient):
         response_data = self._post("search/tenders", params=params)
         
         # Parse the response
+        if self.lean:
+            return parse_lean_search_response(response_data)
         return self.parse_response(response_data, TenderSearchResponse)
     
-    def get_all_tender_pages(
+    def iter_tenders(
         self,
         text: Optional[str] = None,
         region: Optional[str] = None,
         per_page: int = 20,
-        max_pages: Optional[int] = None
-    ) -> List[Tender]:
+        max_pages: Optional[int] = None,
+        extra_params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tender]:
         """
-        Retrieve all pages of tender search results.
+        Lazily iterate over all pages of tender search results.
+        
+        Each page is requested only when the tenders of the previous one have
+        been consumed, so callers can process or persist results while the
+        crawl is still running.
         
         Args:
             text: Optional search text
             region: Optional region filter
             per_page: Number of results per page
             max_pages: Maximum number of pages to retrieve (None for all)
+            extra_params: Optional additional search filters (e.g. a date window)
             
-        Returns:
-            A list of Tender objects
+        Yields:
+            Tender objects in the order returned by the API
             
         Raises:
             ProzorroAPIError: If the API request fails
         """
-        results = []
         page = 1
         total_pages = None
         
         while True:
             # Get the current page of results
-            response = self.search_tenders(text, region, page, per_page)
-            
-            # Add the tenders to our results
-            results.extend(response.data)
+            response = self.search_tenders(text, region, page, per_page, extra_params)
             
             # Calculate total pages if this is the first request
             if total_pages is None:
@@ -104,8 +133,10 @@ class ProzorroScraper(BaseAPIClient):
             # Logging
             self.logger.info(f"Retrieved page {page}/{total_pages} with {len(response.data)} tenders")
             
+            # Hand the tenders of this page to the caller
+            yield from response.data
+            
             # Check if we've reached the end
-            page += 1
             if page >= total_pages:
                 break
                 
@@ -113,11 +144,108 @@ class ProzorroScraper(BaseAPIClient):
             if max_pages is not None and page >= max_pages:
                 self.logger.info(f"Reached maximum number of pages ({max_pages})")
                 break
-
-            # add a delay between requests
-            time.sleep(1)
+            
+            page += 1
+    
+    def get_all_tender_pages(
+        self,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None,
+        extra_params: Optional[Dict[str, Any]] = None
+    ) -> List[Tender]:
+        """
+        Retrieve all pages of tender search results.
+        
+        Args:
+            text: Optional search text
+            region: Optional region filter
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve (None for all)
+            extra_params: Optional additional search filters (e.g. a date window)
+            
+        Returns:
+            A list of Tender objects
+            
+        Raises:
+            ProzorroAPIError: If the API request fails
+        """
+        return list(self.iter_tenders(text, region, per_page, max_pages, extra_params))
+    
+    def sync_tender_pages(
+        self,
+        checkpoint: CrawlCheckpoint,
+        text: Optional[str] = None,
+        region: Optional[str] = None,
+        per_page: int = 20,
+        max_pages: Optional[int] = None,
+        stop_after_unchanged_pages: Optional[int] = None
+    ) -> List[Tender]:
+        """
+        Incrementally crawl tender search results using a checkpoint.
+        
+        The checkpoint is saved after every page, so an interrupted crawl
+        resumes from the page after the last one recorded. Tenders whose search
+        record is unchanged since the previous crawl are not returned again.
+        
+        Args:
+            checkpoint: The crawl checkpoint to read and update
+            text: Optional search text
+            region: Optional region filter
+            per_page: Number of results per page
+            max_pages: Maximum number of pages to retrieve in this run (None for
+                all); a crawl stopped by it stays in progress and the next run
+                resumes it
+            stop_after_unchanged_pages: Stop a fresh crawl after this many consecutive
+                pages without new or changed tenders (assumes newest results come first)
+            
+        Returns:
+            The new or changed tenders that have not been marked as processed
+            in the checkpoint yet, including ones left over from earlier runs
+            
+        Raises:
+            ProzorroAPIError: If the API request fails
+        """
+        if checkpoint.in_progress:
+            page = checkpoint.last_page + 1
+            total_pages = checkpoint.total_pages
+            self.logger.info(f"Resuming crawl from page {page}/{total_pages}")
+        else:
+            page = 1
+            total_pages = None
+        
+        fetched_pages = 0
+        unchanged_pages = 0
+        
+        while total_pages is None or page <= total_pages:
+            if max_pages is not None and fetched_pages >= max_pages:
+                self.logger.info(f"Reached maximum number of pages for this run ({max_pages}), stopping at page {page - 1}/{total_pages}")
+                return checkpoint.pending_tenders()
+            
+            response = self.search_tenders(text, region, page, per_page)
+            fetched_pages += 1
+            
+            if total_pages is None:
+                total_pages = (response.total + per_page - 1) // per_page
+                checkpoint.start_crawl(total_pages)
+            
+            changed = checkpoint.record_page(page, response.data)
+            checkpoint.save()
+            
+            self.logger.info(f"Synced page {page}/{total_pages}: {len(changed)} new or changed of {len(response.data)} tenders")
+            
+            unchanged_pages = 0 if changed else unchanged_pages + 1
+            page += 1
+            
+            if stop_after_unchanged_pages and unchanged_pages >= stop_after_unchanged_pages:
+                self.logger.info(f"No changes in the last {unchanged_pages} pages, stopping")
+                break
+        
+        checkpoint.finish_crawl()
+        checkpoint.save()
         
-        return results
+        return checkpoint.pending_tenders()
         
     def get_tender_html(self, tender_id: str) -> str:
         """
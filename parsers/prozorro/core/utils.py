@@ -1,4 +1,5 @@
 from typing import Dict, Any, Optional
+import re
 import urllib.parse
 from urllib.parse import urlencode
 
@@ -31,6 +32,26 @@ def build_api_url(
     return url
 
 
+_TENDER_STATUS_RE = re.compile(
+    r'tender--head--inf.*?class="[^"]*\bmarked\b[^"]*"[^>]*>\s*([^<]+?)\s*<',
+    re.DOTALL
+)
+
+
+def extract_tender_status(html_content: str) -> Optional[str]:
+    """
+    Quickly find the status label of a tender page without parsing the HTML.
+    
+    Args:
+        html_content: Raw HTML content of the tender page
+        
+    Returns:
+        The status label (e.g. "Завершена"), or None if it was not found
+    """
+    match = _TENDER_STATUS_RE.search(html_content)
+    return match.group(1) if match else None
+
+
 def encode_text_param(text: str) -> str:
     """
     Properly encode a text parameter for URL usage.
@@ -55,4 +76,17 @@ def get_required_headers() -> Dict[str, str]:
         "accept": "application/json, text/plain, */*",
         "content-type": "application/x-www-form-urlencoded",
         "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"
-    } 
\ No newline at end of file
+    }
+
+
+def get_html_headers() -> Dict[str, str]:
+    """
+    Return the headers used when requesting tender web pages.
+    
+    Returns:
+        Dictionary of headers for HTML requests
+    """
+    return {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
+    }
@@ -1,6 +1,14 @@
+import argparse
 import logging
 import os
+from contextlib import nullcontext
 from core import ProzorroScraper
+from core.checkpoint import CrawlCheckpoint
+from core.classification_cache import ClassificationCache
+from core.http_cache import HTTPCache
+from core.ndjson import TenderNDJSONWriter
+from core.prefilter import ClassificationCascade, TitleModel
+from core.pipeline import build_tender_pipeline
 from parsers.prozorro.ai_analyzer import BuildingAnalyzer
 from dotenv import load_dotenv
 
@@ -19,14 +27,60 @@ def create_output_dir():
         logging.info(f"Created output directory: {output_dir}")
     return output_dir
 
-def save_tender_html(tender_id, html_content, output_dir):
-    """Save tender HTML content to a file."""
-    filename = f"{output_dir}/{tender_id}.html"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    logging.info(f"Saved HTML for tender {tender_id} to {filename}")
+def process_in_phases(scraper, building_analyzer, tenders, output_dir):
+    """Classify all tenders, then download the building-related ones."""
+    # Filter for building-related tenders, classified in concurrent batches
+    building_tenders = []
+    unclassified_ids = set()
+    for tender, is_building in building_analyzer.iter_classified_tenders(tenders):
+        if is_building is None:
+            unclassified_ids.add(tender.tender_id)
+        elif is_building:
+            building_tenders.append(tender)
+    logging.info(f"Found {len(building_tenders)} building-related tenders")
+    if unclassified_ids:
+        logging.warning(f"Could not classify {len(unclassified_ids)} tenders")
+    
+    # Save HTML for all building-related tenders
+    download_result = scraper.get_tender_htmls(
+        [tender.tender_id for tender in building_tenders],
+        output_dir
+    )
+    for tender_id, error in download_result.failed.items():
+        logging.error(f"Error saving HTML for tender {tender_id}: {error}")
+    
+    return len(download_result.saved), set(download_result.failed) | unclassified_ids
 
-def main():
+def process_with_pipeline(scraper, building_analyzer, tenders, output_dir, parsed_dir=None):
+    """Classify, download and optionally parse tenders in overlapping pipeline stages."""
+    crawl_pipeline = build_tender_pipeline(scraper, building_analyzer, output_dir, parsed_dir)
+    try:
+        # A failed crawl raises here once the tenders found so far are processed
+        crawl_pipeline.run(tenders)
+    finally:
+        logging.info(f"Pipeline stats: {crawl_pipeline.stats()}")
+    
+    failed_ids = {
+        error['item'].tender_id
+        for stage in crawl_pipeline.stages if stage.name in ('classify', 'download')
+        for error in stage.stats.errors
+    }
+    saved_count = crawl_pipeline.stage('download').stats.emitted
+    return saved_count, failed_ids
+
+def main(
+    incremental: bool = False,
+    checkpoint_path: str = None,
+    cache_dir: str = None,
+    ndjson_path: str = None,
+    pipeline: bool = False,
+    parsed_dir: str = None,
+    classification_cache_path: str = None,
+    classification_ttl: float = None,
+    prefilter: bool = False,
+    prefilter_model_path: str = None,
+    lean: bool = False
+):
     setup_logging()
     # load .env
     load_dotenv()
@@ -37,8 +91,19 @@ def main():
     # Create output directory
     output_dir = create_output_dir()
     
-    scraper = ProzorroScraper()
-    building_analyzer = BuildingAnalyzer(api_key=openai_api_key)
+    cache = HTTPCache(cache_dir) if cache_dir else None
+    scraper = ProzorroScraper(cache=cache, lean=lean)
+    classification_cache = (
+        ClassificationCache(classification_cache_path, ttl=classification_ttl)
+        if classification_cache_path else None
+    )
+    cascade = None
+    if prefilter or prefilter_model_path:
+        # Decide clear-cut titles locally, only escalating the rest to the model
+        cascade = ClassificationCascade(
+            model=TitleModel.load(prefilter_model_path) if prefilter_model_path else None
+        )
+    building_analyzer = BuildingAnalyzer(api_key=openai_api_key, cache=classification_cache, prefilter=cascade)
     
     search_text = "обстріл"
     regions = "61-64"
@@ -48,34 +113,101 @@ def main():
     try:
         logging.info(f"Starting tender search with text='{search_text}', regions={regions}")
         
-        # Get all tenders using pagination
-        all_tenders = scraper.get_all_tender_pages(
-            text=search_text,
-            region=regions,
-            per_page=per_page,
-            max_pages=max_pages
-        )
+        checkpoint = None
+        if incremental:
+            # Only fetch tenders that are new or changed since the last run
+            checkpoint = CrawlCheckpoint.load(
+                checkpoint_path or os.path.join(output_dir, ".crawl_checkpoint.json"),
+                query={'text': search_text, 'region': regions, 'per_page': per_page}
+            )
+            all_tenders = scraper.sync_tender_pages(
+                checkpoint,
+                text=search_text,
+                region=regions,
+                per_page=per_page,
+                max_pages=max_pages,
+                stop_after_unchanged_pages=2
+            )
+        else:
+            # Lazily page through all tenders, classifying them as they arrive
+            all_tenders = scraper.iter_tenders(
+                text=search_text,
+                region=regions,
+                per_page=per_page,
+                max_pages=max_pages
+            )
+        
+        retrieved_ids = []
+        
+        def track(tenders):
+            for tender in tenders:
+                retrieved_ids.append(tender.tender_id)
+                yield tender
         
-        logging.info(f"Retrieved a total of {len(all_tenders)} tenders")
+        tender_stream = track(all_tenders)
+        with TenderNDJSONWriter(ndjson_path) if ndjson_path else nullcontext() as sink:
+            if sink:
+                tender_stream = sink.tee(tender_stream)
+            
+            if pipeline:
+                saved_count, failed_ids = process_with_pipeline(
+                    scraper, building_analyzer, tender_stream, output_dir, parsed_dir
+                )
+            else:
+                saved_count, failed_ids = process_in_phases(
+                    scraper, building_analyzer, tender_stream, output_dir
+                )
         
-        # Filter for building-related tenders
-        building_tenders = building_analyzer.filter_building_related_tenders(all_tenders)
-        logging.info(f"Found {len(building_tenders)} building-related tenders")
+        logging.info(f"Retrieved a total of {len(retrieved_ids)} tenders")
         
-        # Save HTML for all building-related tenders
-        for tender in building_tenders:
-            try:
-                html_content = scraper.get_tender_html(tender.tender_id)
-                save_tender_html(tender.tender_id, html_content, output_dir)
-                
-            except Exception as e:
-                logging.error(f"Error saving HTML for tender {tender.tender_id}: {str(e)}")
+        if checkpoint:
+            # Tenders that failed to be classified or downloaded stay pending for the next run
+            checkpoint.mark_processed(
+                tender_id for tender_id in retrieved_ids
+                if tender_id not in failed_ids
+            )
+            checkpoint.save()
         
-        logging.info(f"Process completed. Saved HTML for {len(building_tenders)} building-related tenders to {output_dir}/")
+        logging.info(f"Process completed. Saved HTML for {saved_count} building-related tenders to {output_dir}/")
+        logging.info(f"Request stats: {scraper.governor.stats.to_dict()}")
+        logging.info(f"Page request stats: {scraper.page_governor.stats.to_dict()}")
+        if cache:
+            logging.info(f"HTTP cache stats: {cache.stats.to_dict()}")
+        if classification_cache is not None:
+            logging.info(f"Classification cache stats: {classification_cache.stats.to_dict()}")
+        if cascade:
+            logging.info(f"Pre-filter stats: {cascade.stats.to_dict()}")
     
     except Exception as e:
         logging.error(f"Error: {str(e)}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Search Prozorro tenders and save building-related tender pages")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch tenders that are new or changed since the last run")
+    parser.add_argument("--checkpoint", help="Path to the crawl checkpoint file (default: output/.crawl_checkpoint.json)")
+    parser.add_argument("--http-cache", help="Directory of an on-disk HTTP cache for search results and tender pages")
+    parser.add_argument("--ndjson", help="Append every retrieved tender to this NDJSON file as it arrives")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run classification, download and parsing as overlapping pipeline stages")
+    parser.add_argument("--parsed-dir", help="In pipeline mode, also parse downloaded pages into this directory")
+    parser.add_argument("--classification-cache",
+                        help="SQLite file caching classification verdicts between runs")
+    parser.add_argument("--classification-ttl", type=float,
+                        help="Days a cached classification verdict stays valid (default: forever)")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="Decide clear-cut titles with local keyword and ДК 021 rules before asking the model")
+    parser.add_argument("--prefilter-model",
+                        help="Pre-filter title model trained with train_prefilter.py (implies --prefilter)")
+    parser.add_argument("--lean", action="store_true",
+                        help="Validate only the commonly used fields of search results, the rest on first use")
+    
+    args = parser.parse_args()
+    
+    main(
+        args.incremental, args.checkpoint, args.http_cache, args.ndjson, args.pipeline, args.parsed_dir,
+        args.classification_cache,
+        args.classification_ttl * 86400 if args.classification_ttl is not None else None,
+        args.prefilter, args.prefilter_model, args.lean
+    )
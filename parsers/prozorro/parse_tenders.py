@@ -3,8 +3,12 @@ import os
 import json
 import logging
 import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from core.html_parser import parse_tender_html_file
+from typing import Any, Dict, Iterable, Optional, Tuple
+from core.html_parser import PARSER_ENGINES, PARSER_VERSION, ParseStats, parse_tender_html, parse_tender_html_file
+from core.parse_manifest import ParseManifest, file_sha256
 
 # Set up logging
 logging.basicConfig(
@@ -13,19 +17,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Run summary and manifest saved next to the parsed files; the underscore keeps them out of analysis
+PARSE_SUMMARY_FILE = '_parse_summary.json'
+PARSE_MANIFEST_FILE = '_parse_manifest.json'
 
-def parse_single_tender(html_file_path: str, output_file: str = None) -> None:
+
+def parse_single_tender(html_file_path: str, output_file: str = None, engine: str = 'lxml') -> None:
     """
     Parse a single tender HTML file and print the extracted data.
     
     Args:
         html_file_path: Path to the HTML file
         output_file: Optional path to save JSON output to
+        engine: Parser engine, 'lxml' or 'bs4'
     """
     logger.info(f"Parsing tender file: {html_file_path}")
     
     # Parse the HTML file
-    parsed_data = parse_tender_html_file(html_file_path)
+    parsed_data = parse_tender_html_file(html_file_path, engine)
     
     # Convert to JSON
     json_data = json.dumps(parsed_data, ensure_ascii=False, indent=2)
@@ -61,39 +70,149 @@ def parse_single_tender(html_file_path: str, output_file: str = None) -> None:
     logger.info(f"Extracted {num_data_points} data points from tender")
 
 
-def parse_all_tenders(input_dir: str, output_dir: str) -> None:
+def _parse_file(task: Tuple[str, str, str, bool]) -> Tuple[str, Optional[str], Optional[ParseStats]]:
+    """
+    Parse one HTML file and save the result; runs in a worker process.
+    
+    Args:
+        task: Tuple of (HTML file path, output JSON path, parser engine,
+            whether to collect parse stats)
+        
+    Returns:
+        Tuple of (HTML file path, error message or None on success, parse
+        stats or None)
+    """
+    html_file, output_file, engine, collect_stats = task
+    stats = ParseStats() if collect_stats else None
+    try:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        parsed_data = parse_tender_html(html_content, engine, stats)
+        if not parsed_data:
+            raise ValueError("No data extracted")
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(parsed_data, f, ensure_ascii=False, indent=2)
+        return html_file, None, stats
+    except Exception as e:
+        return html_file, str(e), stats
+
+
+def parse_all_tenders(
+    input_dir: str,
+    output_dir: str,
+    engine: str = 'lxml',
+    workers: int = 1,
+    force: bool = False,
+    collect_stats: bool = False
+) -> Dict[str, Any]:
     """
     Parse all HTML files in the input directory and save results to output directory.
     
+    A manifest in the output directory records the content hash of every
+    parsed HTML file and the parser version used, and files whose HTML and
+    parser version are both unchanged are skipped. With more than one worker
+    the files are spread over a process pool in chunks; progress is still
+    reported in file order. A summary with the errors of every failed file
+    is saved to the output directory. With ``collect_stats`` the time of
+    every parsing step and the element lookup counts of all files are
+    aggregated, logged at the end and added to the summary.
+    
     Args:
         input_dir: Directory containing HTML files
         output_dir: Directory to save parsed JSON files
+        engine: Parser engine, 'lxml' or 'bs4'
+        workers: Number of worker processes (0 for one per CPU core)
+        force: Re-parse every file regardless of the manifest
+        collect_stats: Collect and report parse stats
+        
+    Returns:
+        The run summary
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
     # Get all HTML files
-    html_files = list(Path(input_dir).glob('*.html'))
+    html_files = sorted(Path(input_dir).glob('*.html'))
     logger.info(f"Found {len(html_files)} HTML files to parse")
     
-    # Process each file
-    for i, html_file in enumerate(html_files):
-        # Determine output file path
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    
+    manifest = ParseManifest.load(os.path.join(output_dir, PARSE_MANIFEST_FILE))
+    manifest.retain(html_file.name for html_file in html_files)
+    
+    # Only parse files that are new, changed, or were parsed by an older parser
+    tasks = []
+    hashes = {}
+    for html_file in html_files:
         output_file = os.path.join(output_dir, f"{html_file.stem}.json")
-        
-        try:
-            # Parse the HTML file
-            parsed_data = parse_tender_html_file(str(html_file))
-            
-            # Save to JSON file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(parsed_data, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"[{i+1}/{len(html_files)}] Parsed {html_file.name} -> {output_file}")
-        except Exception as e:
-            logger.error(f"Error processing {html_file.name}: {str(e)}")
-    
-    logger.info(f"Finished parsing {len(html_files)} HTML files")
+        sha256 = file_sha256(str(html_file))
+        if not force and manifest.is_current(html_file.name, sha256, output_file):
+            continue
+        hashes[str(html_file)] = (sha256, output_file)
+        tasks.append((str(html_file), output_file, engine, collect_stats))
+    
+    skipped = len(html_files) - len(tasks)
+    if skipped:
+        logger.info(f"Skipping {skipped} unchanged files, parsing {len(tasks)}")
+    
+    errors = {}
+    stats = ParseStats() if collect_stats else None
+    
+    def report(results: Iterable[Tuple[str, Optional[str], Optional[ParseStats]]]) -> None:
+        for i, (html_file, error, file_stats) in enumerate(results):
+            name = os.path.basename(html_file)
+            if file_stats is not None:
+                stats.merge(file_stats)
+            if error:
+                errors[name] = error
+                manifest.discard(name)
+                logger.error(f"[{i+1}/{len(tasks)}] Error processing {name}: {error}")
+            else:
+                manifest.record(name, *hashes[html_file])
+                logger.info(f"[{i+1}/{len(tasks)}] Parsed {name}")
+    
+    try:
+        if workers > 1 and len(tasks) > 1:
+            # Big enough chunks to amortise inter-process overhead, small enough to balance the load
+            chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                report(executor.map(_parse_file, tasks, chunksize=chunksize))
+        else:
+            report(map(_parse_file, tasks))
+    finally:
+        # Keep the progress of an interrupted run
+        manifest.save()
+    
+    elapsed = time.perf_counter() - started
+    summary = {
+        'input_dir': input_dir,
+        'engine': engine,
+        'workers': workers,
+        'parser_version': PARSER_VERSION,
+        'total': len(html_files),
+        'skipped': skipped,
+        'parsed': len(tasks) - len(errors),
+        'failed': len(errors),
+        'elapsed_seconds': round(elapsed, 3),
+        'errors': errors,
+    }
+    if stats is not None:
+        summary['stats'] = stats.to_dict()
+    
+    summary_file = os.path.join(output_dir, PARSE_SUMMARY_FILE)
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    
+    logger.info(
+        f"Finished parsing {len(tasks)} HTML files in {elapsed:.1f}s "
+        f"({skipped} unchanged, {len(errors)} failed, summary saved to {summary_file})"
+    )
+    if stats is not None:
+        logger.info(stats.format())
+    return summary
 
 
 def _iter_dict_values(d, parent_key=''):
@@ -120,20 +239,28 @@ if __name__ == "__main__":
     parser.add_argument("--output", help="Path to save the JSON output")
     parser.add_argument("--input-dir", help="Directory containing HTML files to parse")
     parser.add_argument("--output-dir", help="Directory to save parsed JSON files")
+    parser.add_argument("--engine", choices=PARSER_ENGINES, default="lxml",
+                        help="Parser engine; both extract identical data, lxml is several times faster")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes parsing files in parallel (0 for one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-parse all files, even those unchanged since the last run")
+    parser.add_argument("--stats", action="store_true",
+                        help="Report the time of every parsing step and element lookup counts")
     
     args = parser.parse_args()
     
     if args.file:
         # Parse a single file
-        parse_single_tender(args.file, args.output)
+        parse_single_tender(args.file, args.output, args.engine)
     elif args.input_dir and args.output_dir:
         # Parse all files in directory
-        parse_all_tenders(args.input_dir, args.output_dir)
+        parse_all_tenders(args.input_dir, args.output_dir, args.engine, args.workers, args.force, args.stats)
     else:
         # Use default example
         example_file = os.path.join("output", "UA-2023-06-07-005367-a.html")
         if os.path.exists(example_file):
-            parse_single_tender(example_file)
+            parse_single_tender(example_file, engine=args.engine)
         else:
             logger.error(f"Example file not found: {example_file}")
             parser.print_help() 
\ No newline at end of file
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Make the ``core`` and ``benchmarks`` packages importable like the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_prozorro_server import FakeProzorroServer
+from core.governor import RequestGovernor
+
+
+@pytest.fixture
+def prozorro_server():
+    """A fake Prozorro API serving 100 tenders, stopped after the test."""
+    server = FakeProzorroServer(total=100).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fast_governor():
+    """A governor that does not slow down requests to the fake server."""
+    return RequestGovernor(requests_per_second=1000, max_requests_per_second=1000, max_retries=0)
@@ -0,0 +1,185 @@
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import pytest
+
+from core.analysis import (
+    analyze_customers,
+    analyze_damaged_buildings,
+    analyze_procurement_types,
+    analyze_regions,
+    analyze_suppliers,
+    analyze_tender_categories,
+    analyze_tender_values,
+    run_analyses,
+)
+
+TENDERS = [
+    {
+        'tender_id': 'UA-3', 'title': 'Капітальний ремонт покрівлі школи', 'procurement_type': 'Відкриті торги',
+        'customer': {'name': 'Школа №1', 'edrpou': '111', 'region': 'Харківська область'},
+        'subject': {'classifier_name': 'Будівельні роботи', 'description': 'Відновлення після пошкодження'},
+        'expected_cost': {'amount': 1000.5, 'currency': 'UAH'},
+        'dates': {'publication_date': '05.03.2023'},
+        'awards': [
+            {'participant_name': 'ТОВ Буд', 'decision': 'Переможець', 'bid_amount': 900, 'bid_currency': 'UAH'},
+            {'participant_name': 'ТОВ Інше', 'decision': 'Відхилено', 'bid_amount': 800, 'bid_currency': 'UAH'},
+        ],
+    },
+    {
+        'tender_id': 'UA-1', 'title': 'Бензин А-95', 'procurement_type': 'Спрощена закупівля',
+        'customer': {'name': 'Школа №1', 'region': 'Київська область'},
+        'location': {'region': 'Київ'},
+        'subject': {'classifier_name': 'Паливо'},
+        'expected_cost': {'amount': 200, 'currency': 'EUR'},
+        'dates': {'publication_date': '17.11.2022'},
+        'awards': [{'participant_name': 'ТОВ Буд', 'decision': 'Переможець', 'bid_amount': 190, 'bid_currency': 'EUR'}],
+    },
+    {
+        'tender_id': 'UA-2', 'title': 'Реконструкція фасаду', 'procurement_type': 'Відкриті торги',
+        'customer': {'name': 'Міська рада', 'edrpou': '222'},
+        'subject': {'classifier_name': 'Будівельні роботи',
+                    'delivery_place': '61000, Україна, Харківська область, м. Харків'},
+        'expected_cost': {'amount': 5000},
+        'dates': {'publication_date': '01.03.2023'},
+        'awards': [{'participant_name': 'ТОВ Буд', 'decision': 'Переможець'}],
+    },
+    {
+        'tender_id': 'UA-4', 'title': 'Папір офісний',
+        'customer': {'name': 'Міська рада', 'edrpou': '333', 'region': 'Харківська область'},
+        'awards': [],
+    },
+    {'title': 'Без замовника'},
+]
+
+
+def _old_regions(tenders):
+    regions = Counter()
+    for tender in tenders:
+        if 'location' in tender and 'region' in tender['location']:
+            regions[tender['location']['region']] += 1
+        elif 'customer' in tender and 'region' in tender['customer']:
+            regions[tender['customer']['region']] += 1
+        elif 'subject' in tender and 'delivery_place' in tender['subject']:
+            match = re.search(r'Україна,\s+(.*?(?:область|місто|Київ|Крим))', tender['subject']['delivery_place'])
+            if match:
+                regions[match.group(1).strip()] += 1
+    return dict(regions.most_common())
+
+
+def _old_field_counts(tenders, field, section=None):
+    counts = Counter()
+    for tender in tenders:
+        data = tender if section is None else tender.get(section, {})
+        if field in data:
+            counts[data[field]] += 1
+    return dict(counts.most_common())
+
+
+def _old_suppliers(tenders):
+    suppliers = defaultdict(lambda: {'tender_count': 0, 'total_value': 0, 'currencies': set(), 'tender_ids': set()})
+    for tender in tenders:
+        for award in tender.get('awards') or []:
+            if 'participant_name' in award and award['decision'] == 'Переможець':
+                supplier = suppliers[award['participant_name']]
+                supplier['tender_count'] += 1
+                if 'tender_id' in tender:
+                    supplier['tender_ids'].add(tender['tender_id'])
+                if 'bid_amount' in award and 'bid_currency' in award:
+                    supplier['total_value'] += award['bid_amount']
+                    supplier['currencies'].add(award['bid_currency'])
+    return {name: dict(supplier, currencies=sorted(supplier['currencies']), tender_ids=sorted(supplier['tender_ids']))
+            for name, supplier in suppliers.items()}
+
+
+def _old_customers(tenders):
+    customers = defaultdict(lambda: {'tender_count': 0, 'total_value': 0, 'currencies': set(), 'tender_ids': set(),
+                                     'edrpou': None, 'region': None})
+    for tender in tenders:
+        if 'customer' not in tender or 'name' not in tender['customer']:
+            continue
+        customer = customers[tender['customer']['name']]
+        customer['tender_count'] += 1
+        if 'tender_id' in tender:
+            customer['tender_ids'].add(tender['tender_id'])
+        if 'expected_cost' in tender:
+            customer['total_value'] += tender['expected_cost'].get('amount', 0)
+            customer['currencies'].add(tender['expected_cost'].get('currency', 'UAH'))
+        for field in ('edrpou', 'region'):
+            if field in tender['customer'] and not customer[field]:
+                customer[field] = tender['customer'][field]
+    return {name: dict(customer, currencies=sorted(customer['currencies']), tender_ids=sorted(customer['tender_ids']))
+            for name, customer in customers.items()}
+
+
+def _old_values(tenders):
+    amounts = [tender for tender in tenders if 'amount' in tender.get('expected_cost', {})]
+    by_year, by_month, by_category = defaultdict(int), defaultdict(int), defaultdict(int)
+    for tender in amounts:
+        amount = tender['expected_cost']['amount']
+        date = datetime.strptime(tender['dates']['publication_date'], '%d.%m.%Y')
+        by_year[str(date.year)] += amount
+        by_month[f"{date.year}-{date.month:02d}"] += amount
+        if 'classifier_name' in tender.get('subject', {}):
+            by_category[tender['subject']['classifier_name']] += amount
+    total = sum(tender['expected_cost']['amount'] for tender in amounts)
+    return {
+        'total': total,
+        'count': len(amounts),
+        'average': total / len(amounts) if amounts else 0,
+        'min': min((tender['expected_cost']['amount'] for tender in amounts), default=0),
+        'max': max((tender['expected_cost']['amount'] for tender in amounts), default=0),
+        'currency': 'UAH',
+        'by_year': dict(by_year),
+        'by_month': dict(by_month),
+        'by_category': dict(by_category),
+    }
+
+
+def _old_damaged_ids(tenders):
+    keywords = ['пошкодж', 'руйнув', 'зруйнов', 'відновл', 'реконструкц', 'відбудов', 'ремонт', 'віднов', 'реставрац']
+    matches = []
+    for tender in tenders:
+        text = (tender.get('title', '') + ' ' + tender.get('subject', {}).get('description', '')).lower()
+        matched = sorted(keyword for keyword in keywords if keyword in text)
+        if matched:
+            matches.append((tender['tender_id'], matched))
+    return matches
+
+
+def test_analyses_match_the_per_function_implementations():
+    assert analyze_regions(TENDERS) == _old_regions(TENDERS)
+    assert analyze_procurement_types(TENDERS) == _old_field_counts(TENDERS, 'procurement_type')
+    assert analyze_tender_categories(TENDERS) == _old_field_counts(TENDERS, 'classifier_name', 'subject')
+    assert analyze_suppliers(TENDERS) == _old_suppliers(TENDERS)
+    assert analyze_customers(TENDERS) == _old_customers(TENDERS)
+    assert analyze_tender_values(TENDERS) == _old_values(TENDERS)
+    damaged = analyze_damaged_buildings(TENDERS)
+    assert [(tender['tender_id'], sorted(tender['analysis']['matched_keywords'])) for tender in damaged] \
+        == _old_damaged_ids(TENDERS)
+    assert all('analysis' not in tender for tender in TENDERS)
+
+
+def test_single_pass_matches_the_individual_analyses():
+    results = run_analyses(iter(TENDERS))
+
+    assert results['tender_count'] == len(TENDERS)
+    assert results['regions'] == analyze_regions(TENDERS)
+    assert results['procurement_types'] == analyze_procurement_types(TENDERS)
+    assert results['categories'] == analyze_tender_categories(TENDERS)
+    assert results['values'] == analyze_tender_values(TENDERS)
+    assert results['suppliers'] == analyze_suppliers(TENDERS)
+    assert results['customers'] == analyze_customers(TENDERS)
+    assert results['damaged_buildings'] == analyze_damaged_buildings(TENDERS)
+    assert results['top_suppliers']['by_value'] == {'ТОВ Буд': analyze_suppliers(TENDERS)['ТОВ Буд']}
+
+
+@pytest.mark.parametrize('order', [TENDERS, TENDERS[::-1]])
+def test_output_does_not_depend_on_tender_order(order):
+    results = run_analyses(order)
+
+    assert results['suppliers']['ТОВ Буд']['tender_ids'] == ['UA-1', 'UA-2', 'UA-3']
+    assert results['suppliers']['ТОВ Буд']['currencies'] == ['EUR', 'UAH']
+    assert results['customers']['Школа №1']['currencies'] == ['EUR', 'UAH']
+    assert results['top_customers']['by_value']['Міська рада']['tender_ids'] == ['UA-2', 'UA-4']
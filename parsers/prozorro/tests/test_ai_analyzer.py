@@ -0,0 +1,71 @@
+import pytest
+
+from ai_analyzer import AIAnalysisError, BuildingAnalyzer, build_batch_prompt, parse_batch_answers
+from benchmarks.bench_models import make_tender
+from benchmarks.fake_openai_server import FakeOpenAIServer, is_building_title
+from benchmarks.fake_prozorro_server import make_search_tender
+from core.models import Tender
+
+TITLES = [make_search_tender(index)['title'] for index in range(40)]
+
+
+@pytest.fixture
+def openai_server():
+    server = FakeOpenAIServer().start()
+    yield server
+    server.stop()
+
+
+def _analyzer(server, **kwargs):
+    return BuildingAnalyzer(api_key='test', base_url=server.base_url, max_retries=0, **kwargs)
+
+
+def test_parse_batch_answers():
+    assert parse_batch_answers('{"answers": [{"id": 1, "answer": "YES"}, {"id": 2, "answer": "no"}]}', 2) == {1: True, 2: False}
+    assert parse_batch_answers('{"answers": {"1": "NO", "2": "YES"}}', 2) == {1: False, 2: True}
+    assert parse_batch_answers('[{"id": 1, "answer": "YES"}, {"id": 3, "answer": "YES"}, {"id": 2, "answer": "MAYBE"}]', 2) == {1: True}
+    assert parse_batch_answers('not json', 2) == {}
+    assert parse_batch_answers('{"answers": 5}', 2) == {}
+
+
+def test_batch_prompt_lists_titles_by_id():
+    prompt = build_batch_prompt(['перший', 'другий'])
+
+    assert prompt.endswith('[{"id": 1, "text": "перший"}, {"id": 2, "text": "другий"}]')
+
+
+def test_titles_are_classified_in_batches(openai_server):
+    analyzer = _analyzer(openai_server, batch_size=10)
+
+    results = analyzer.classify_titles(TITLES + TITLES[:5])
+
+    assert results == [is_building_title(title) for title in TITLES + TITLES[:5]]
+    assert openai_server.requests == 4
+    assert openai_server.items == 40
+    assert analyzer.unclassified == 0
+
+
+def test_dropped_answers_are_retried_in_smaller_batches(openai_server):
+    openai_server.drop_rate = 0.3
+    analyzer = _analyzer(openai_server, batch_size=10)
+
+    results = analyzer.classify_titles(TITLES)
+
+    assert openai_server.requests > 4
+    for title, result in zip(TITLES, results):
+        assert result is None or result == is_building_title(title)
+    assert analyzer.unclassified == sum(1 for result in results if result is None)
+
+
+def test_failed_titles_are_reported(openai_server):
+    openai_server.fail_rate = 1.0
+    analyzer = _analyzer(openai_server, batch_size=4)
+    tenders = [Tender.model_validate(make_tender(index)) for index in range(4)]
+
+    assert analyzer.filter_building_related_tenders(tenders, batched=True) == []
+    assert analyzer.unclassified == 4
+    # Halves, then single titles: 1 + 2 + 4 requests
+    assert openai_server.requests == 7
+
+    with pytest.raises(AIAnalysisError):
+        analyzer.filter_building_related_tenders(tenders)
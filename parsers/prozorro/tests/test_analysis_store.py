@@ -0,0 +1,109 @@
+import copy
+import json
+
+from core import analysis_store
+from core.analysis import run_analyses
+from core.analysis_store import AnalysisStore
+
+
+def _tender(index, amount, winner='ТОВ Буд', title='Капітальний ремонт школи'):
+    return {
+        'tender_id': f'UA-{index}',
+        'title': f'{title} №{index}',
+        'procurement_type': 'Відкриті торги' if index % 2 else 'Спрощена закупівля',
+        'customer': {'name': f'Замовник {index % 3}', 'edrpou': str(index % 3), 'region': f'Область {index % 3}'},
+        'subject': {'classifier_name': f'Категорія {index % 2}'},
+        'expected_cost': {'amount': amount, 'currency': 'UAH'},
+        'dates': {'publication_date': f'{index + 1:02d}.03.2023'},
+        'awards': [{'participant_name': winner, 'decision': 'Переможець', 'bid_amount': amount, 'bid_currency': 'UAH'}],
+    }
+
+
+TENDERS = [_tender(index, 100.1 * (index + 1)) for index in range(6)]
+
+
+def _comparable(results):
+    """Results with the damaged building tenders in tender ID order rather than in order of addition."""
+    return dict(results, damaged_buildings=sorted(results['damaged_buildings'], key=lambda tender: tender['tender_id']))
+
+
+def _build(path, tenders):
+    store = AnalysisStore(str(path))
+    for tender in tenders:
+        store.add(tender['tender_id'], tender)
+    store.commit()
+    return store
+
+
+def test_reingesting_a_changed_tender_matches_a_fresh_build(tmp_path):
+    changed = _tender(2, 9999.99, winner='ТОВ Нове', title='Бензин')
+    final = TENDERS[:2] + [changed] + TENDERS[3:]
+
+    incremental = _build(tmp_path / 'incremental.sqlite', TENDERS)
+    incremental.add('UA-2', changed)
+    incremental.commit()
+    fresh = _build(tmp_path / 'fresh.sqlite', final)
+
+    assert incremental.results() == fresh.results()
+    assert len(incremental) == 6
+    assert 'UA-2' not in {tender['tender_id'] for tender in incremental.damaged_buildings()}
+
+    expected = run_analyses(final)
+    results = fresh.results()
+    for name in ('tender_count', 'regions', 'procurement_types', 'categories'):
+        assert results[name] == expected[name]
+    assert results['values']['total'] == round(expected['values']['total'], 2)
+    incremental.close()
+    fresh.close()
+
+
+def test_amounts_are_summed_in_kopecks(tmp_path):
+    store = AnalysisStore(str(tmp_path / 'analysis.sqlite'))
+    for index, amount in enumerate((0.1, 0.2, 0.7)):
+        store.add(f'UA-{index}', _tender(index, amount))
+    assert store.results()['values']['total'] == 1.0
+
+    store.remove('UA-2')
+    values = store.results()['values']
+    assert values['total'] == 0.3
+    assert values['max'] == 0.2
+    assert store.results()['top_suppliers']['by_value']['ТОВ Буд']['total_value'] == 0.3
+
+    assert store.remove('UA-0') and store.remove('UA-1')
+    assert not store.remove('UA-1')
+    results = store.results()
+    assert results['values']['total'] == 0
+    assert results['regions'] == {} and results['top_suppliers']['by_value'] == {}
+    store.close()
+
+
+def test_store_of_another_version_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / 'analysis.sqlite'
+    _build(path, TENDERS).close()
+    with AnalysisStore(str(path)) as store:
+        assert len(store) == 6
+
+    monkeypatch.setattr(analysis_store, 'STORE_VERSION', analysis_store.STORE_VERSION + 1)
+    with AnalysisStore(str(path)) as store:
+        assert len(store) == 0
+        assert store.results()['values']['count'] == 0
+
+
+def test_sync_directory(tmp_path):
+    directory = tmp_path / 'parsed'
+    directory.mkdir()
+    for tender in TENDERS:
+        (directory / f"{tender['tender_id']}.json").write_text(json.dumps(tender, ensure_ascii=False), encoding='utf-8')
+    (directory / '_parse_summary.json').write_text('{}', encoding='utf-8')
+
+    with AnalysisStore(str(tmp_path / 'analysis.sqlite')) as store:
+        assert store.sync_directory(str(directory))['added'] == 6
+
+        changed = copy.deepcopy(TENDERS[0])
+        changed['expected_cost']['amount'] = 1234.56
+        (directory / 'UA-0.json').write_text(json.dumps(changed, ensure_ascii=False) + '\n', encoding='utf-8')
+        (directory / 'UA-5.json').unlink()
+        counts = store.sync_directory(str(directory))
+
+        assert counts == {'added': 0, 'replaced': 1, 'removed': 1, 'unchanged': 4, 'failed': 0}
+        assert _comparable(store.results()) == _comparable(_build(tmp_path / 'fresh.sqlite', [changed] + TENDERS[1:5]).results())
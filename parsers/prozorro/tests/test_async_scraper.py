@@ -0,0 +1,64 @@
+import time
+
+from core.async_scraper import AsyncProzorroScraper
+from core.governor import get_default_governor
+from core.scraper import ProzorroScraper
+
+
+def _ids(tenders):
+    return [tender.tender_id for tender in tenders]
+
+
+def test_async_pages_match_sync_pages(prozorro_server, fast_governor):
+    sync_tenders = ProzorroScraper(prozorro_server.base_url, governor=fast_governor).get_all_tender_pages(per_page=10)
+    async_scraper = AsyncProzorroScraper(prozorro_server.base_url, max_concurrency=4, requests_per_second=1000)
+    async_tenders = async_scraper.run_all_tender_pages(per_page=10)
+
+    assert len(sync_tenders) == 100
+    assert _ids(async_tenders) == _ids(sync_tenders)
+    assert prozorro_server.search_requests == 20
+
+
+def test_async_pages_respect_max_pages(prozorro_server, fast_governor):
+    sync_tenders = ProzorroScraper(prozorro_server.base_url, governor=fast_governor).get_all_tender_pages(
+        per_page=10, max_pages=4
+    )
+    async_scraper = AsyncProzorroScraper(prozorro_server.base_url, max_concurrency=4, requests_per_second=1000)
+    async_tenders = async_scraper.run_all_tender_pages(per_page=10, max_pages=4)
+
+    assert len(sync_tenders) == 40
+    assert _ids(async_tenders) == _ids(sync_tenders)
+    assert prozorro_server.search_requests == 8
+
+
+def test_passed_scraper_keeps_its_connection_pool(prozorro_server, fast_governor):
+    scraper = ProzorroScraper(prozorro_server.base_url, governor=fast_governor, pool_size=2)
+    adapter = scraper.session.get_adapter(prozorro_server.base_url)
+
+    AsyncProzorroScraper(scraper=scraper, max_concurrency=8)
+
+    assert scraper.session.get_adapter(prozorro_server.base_url) is adapter
+
+
+def test_async_pages_are_fetched_concurrently(prozorro_server):
+    prozorro_server.latency = 0.1
+    scraper = AsyncProzorroScraper(prozorro_server.base_url, max_concurrency=4, requests_per_second=1000)
+
+    scraper.run_all_tender_pages(per_page=10)
+
+    assert prozorro_server.search_requests == 10
+    assert 1 < prozorro_server.max_in_flight <= 4
+
+
+def test_async_rate_is_set_by_its_own_governor(prozorro_server):
+    scraper = AsyncProzorroScraper(prozorro_server.base_url, max_concurrency=4, requests_per_second=20, burst=1)
+
+    started = time.monotonic()
+    scraper.run_all_tender_pages(per_page=10)
+    elapsed = time.monotonic() - started
+
+    governor = scraper.scraper.governor
+    assert governor is not get_default_governor()
+    assert governor.stats.requests == 10
+    # 10 requests at 20 per second, far faster than the default 1 to 4 per second
+    assert 0.4 <= elapsed < 2.0
@@ -0,0 +1,73 @@
+from core.checkpoint import CrawlCheckpoint, tender_fingerprint
+from core.scraper import ProzorroScraper
+
+QUERY = {'text': None, 'region': None}
+
+
+def _scraper(server, governor):
+    return ProzorroScraper(server.base_url, governor=governor)
+
+
+def test_checkpoint_round_trip(prozorro_server, fast_governor, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    tenders = _scraper(prozorro_server, fast_governor).get_all_tender_pages(per_page=10, max_pages=1)
+    checkpoint = CrawlCheckpoint(path, QUERY)
+    checkpoint.start_crawl(10)
+    assert checkpoint.record_page(1, tenders) == tenders
+    checkpoint.mark_processed([tenders[0].tender_id])
+    checkpoint.save()
+
+    loaded = CrawlCheckpoint.load(path, QUERY)
+
+    assert loaded.in_progress
+    assert (loaded.last_page, loaded.total_pages) == (1, 10)
+    assert loaded.tenders == checkpoint.tenders
+    assert loaded.tenders[tenders[1].tender_id]['hash'] == tender_fingerprint(tenders[1])
+    assert [tender.tender_id for tender in loaded.pending_tenders()] == [tender.tender_id for tender in tenders[1:]]
+    assert loaded.record_page(2, tenders) == []
+    # A checkpoint of another query is discarded
+    assert CrawlCheckpoint.load(path, {'text': 'дах'}).tenders == {}
+
+
+def test_resumed_crawl_fetches_max_pages_per_run(prozorro_server, fast_governor, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+
+    first = _scraper(prozorro_server, fast_governor).sync_tender_pages(
+        CrawlCheckpoint.load(path, QUERY), per_page=10, max_pages=3
+    )
+    assert len(first) == 30
+    assert prozorro_server.search_requests == 3
+
+    checkpoint = CrawlCheckpoint.load(path, QUERY)
+    assert checkpoint.in_progress and checkpoint.last_page == 3
+
+    second = _scraper(prozorro_server, fast_governor).sync_tender_pages(checkpoint, per_page=10, max_pages=3)
+    assert prozorro_server.search_requests == 6
+    assert len(second) == 60
+    assert CrawlCheckpoint.load(path, QUERY).last_page == 6
+
+    rest = _scraper(prozorro_server, fast_governor).sync_tender_pages(CrawlCheckpoint.load(path, QUERY), per_page=10)
+    assert prozorro_server.search_requests == 10
+    assert len(rest) == 100
+    finished = CrawlCheckpoint.load(path, QUERY)
+    assert not finished.in_progress
+    assert finished.last_completed_at is not None
+
+
+def test_sync_stops_after_unchanged_pages(prozorro_server, fast_governor, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    scraper = _scraper(prozorro_server, fast_governor)
+    checkpoint = CrawlCheckpoint.load(path, QUERY)
+    tenders = scraper.sync_tender_pages(checkpoint, per_page=10)
+    checkpoint.mark_processed(tender.tender_id for tender in tenders)
+    checkpoint.save()
+    requests_before = prozorro_server.search_requests
+
+    # A tender on the first page changed since the last crawl
+    changed_id = tenders[3].tender_id
+    checkpoint.tenders[changed_id]['hash'] = 'outdated'
+    pending = scraper.sync_tender_pages(checkpoint, per_page=10, stop_after_unchanged_pages=2)
+
+    assert [tender.tender_id for tender in pending] == [changed_id]
+    assert prozorro_server.search_requests - requests_before == 3
+    assert not checkpoint.in_progress
@@ -0,0 +1,65 @@
+from core import classification_cache
+from core.classification_cache import ClassificationCache, normalize_title
+
+MODEL = 'gpt-4o-mini'
+
+
+def test_normalize_title():
+    assert normalize_title("  Ремонт  «Школи» —\tкорпус  2.  ") == 'ремонт "школи" - корпус 2'
+    assert normalize_title("Об’єкт") == normalize_title("Об'єкт") == normalize_title("ОБʼЄКТ")
+
+
+def test_titles_normalising_alike_share_a_verdict(tmp_path):
+    cache = ClassificationCache(str(tmp_path / 'cache.sqlite'))
+    cache.put("Ремонт даху школи", True, MODEL, 1)
+    titles = ["Ремонт даху школи", "РЕМОНТ  даху школи.", " ремонт даху школи ", "Бензин А-95"]
+
+    assert cache.get_many(titles + titles[:1], MODEL, 1) == dict.fromkeys(titles[:3], True)
+    assert cache.stats.to_dict() == {'hits': 3, 'misses': 1, 'expired': 0, 'stored': 1, 'hit_rate': 0.75}
+
+    # Storing an alike title replaces the shared verdict
+    cache.put("ремонт ДАХУ школи", False, MODEL, 1)
+    assert len(cache) == 1
+    assert cache.get("Ремонт даху школи", MODEL, 1) is False
+    cache.close()
+
+
+def test_verdicts_expire_after_the_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(classification_cache.time, 'time', lambda: now[0])
+    cache = ClassificationCache(str(tmp_path / 'cache.sqlite'), ttl=60)
+    cache.put_many({"Ремонт даху": True, "Бензин": False}, MODEL, 1)
+
+    now[0] += 59
+    assert cache.get_many(["Ремонт даху", "Бензин"], MODEL, 1) == {"Ремонт даху": True, "Бензин": False}
+    assert len(list(cache.verdicts(MODEL, 1))) == 2
+
+    now[0] += 1
+    assert cache.get_many(["Ремонт даху", "Бензин"], MODEL, 1) == {}
+    assert cache.stats.expired == 2
+    assert list(cache.verdicts(MODEL, 1)) == []
+    assert cache.purge() == 2
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_other_models_and_prompt_versions_do_not_reuse_verdicts(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ClassificationCache(path)
+    cache.put("Ремонт даху", True, MODEL, 1)
+    cache.put("Ремонт даху", False, 'gpt-4o', 1)
+    cache.put("Бензин", False, MODEL, 2)
+
+    assert cache.get("Ремонт даху", MODEL, 2) is None
+    assert cache.get("Ремонт даху", 'gpt-4o', 1) is False
+    assert sorted(cache.verdicts(MODEL, 1)) == [("ремонт даху", True)]
+    cache.close()
+
+    # Verdicts persist, and purging keeps only the current model and prompt version
+    cache = ClassificationCache(path)
+    assert cache.get("Ремонт даху", MODEL, 1) is True
+    assert cache.purge(model=MODEL, prompt_version=2) == 2
+    assert len(cache) == 1
+    assert cache.get("Бензин", MODEL, 2) is False
+    assert cache.purge() == 0
+    cache.close()
@@ -0,0 +1,63 @@
+import pytest
+
+from core.exceptions import ProzorroConnectionError, ProzorroResponseError
+from core.scraper import ProzorroScraper
+
+IDS = [f"UA-2023-06-07-{index:06d}-a" for index in range(12)]
+
+
+def _scraper(server, governor):
+    scraper = ProzorroScraper(server.base_url, governor=governor, page_governor=governor)
+    scraper.tender_page_url = server.tender_page_url
+    return scraper
+
+
+def test_pages_are_downloaded_concurrently(prozorro_server, fast_governor, tmp_path):
+    prozorro_server.latency = 0.05
+    scraper = _scraper(prozorro_server, fast_governor)
+
+    result = scraper.get_tender_htmls(IDS + IDS[:3], str(tmp_path), max_workers=4)
+
+    assert sorted(result.saved) == sorted(IDS)
+    assert result.failed == {}
+    assert prozorro_server.page_requests == 12
+    assert 1 < prozorro_server.max_in_flight <= 4
+    for tender_id, path in result.saved.items():
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == prozorro_server.tender_page(tender_id)
+
+
+def test_failed_downloads_are_reported_per_tender(prozorro_server, fast_governor, tmp_path):
+    prozorro_server.missing_pages = {IDS[0]}
+    prozorro_server.truncated_pages = {IDS[1]}
+    scraper = _scraper(prozorro_server, fast_governor)
+
+    result = scraper.get_tender_htmls(IDS, str(tmp_path), max_workers=4)
+
+    assert sorted(result.failed) == sorted(IDS[:2])
+    assert '404' in result.failed[IDS[0]]
+    assert sorted(result.saved) == sorted(IDS[2:])
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"{tender_id}.html" for tender_id in IDS[2:])
+
+
+def test_failed_download_closes_the_response_and_leaves_no_file(prozorro_server, fast_governor, tmp_path):
+    prozorro_server.missing_pages = {IDS[0]}
+    prozorro_server.truncated_pages = {IDS[1]}
+    scraper = _scraper(prozorro_server, fast_governor)
+    responses = []
+    send = scraper.session.request
+
+    def recording_request(*args, **kwargs):
+        response = send(*args, **kwargs)
+        responses.append(response)
+        return response
+
+    scraper.session.request = recording_request
+
+    with pytest.raises(ProzorroResponseError):
+        scraper.download_tender_html(IDS[0], str(tmp_path / 'missing.html'))
+    with pytest.raises(ProzorroConnectionError):
+        scraper.download_tender_html(IDS[1], str(tmp_path / 'truncated.html'))
+
+    assert all(response.raw.closed for response in responses)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,108 @@
+import pytest
+import requests
+
+from core.exceptions import ProzorroCircuitOpenError
+from core.governor import CircuitBreaker, DEFAULT_GOVERNOR_LIMITS, RequestGovernor, get_default_governor
+from core.scraper import ProzorroScraper
+
+
+def test_default_governors_are_separate_per_kind():
+    api = get_default_governor('api')
+    pages = get_default_governor('pages')
+
+    assert api is get_default_governor()
+    assert pages is not api
+    assert api.max_requests_per_second == DEFAULT_GOVERNOR_LIMITS['api']['max_requests_per_second']
+    assert pages.max_requests_per_second == DEFAULT_GOVERNOR_LIMITS['pages']['max_requests_per_second']
+
+    with pytest.raises(ValueError):
+        get_default_governor('unknown')
+
+
+def test_page_downloads_use_the_page_governor(prozorro_server, fast_governor, tmp_path):
+    page_governor = RequestGovernor(requests_per_second=1000, max_requests_per_second=1000, max_retries=0)
+    scraper = ProzorroScraper(prozorro_server.base_url, governor=fast_governor, page_governor=page_governor)
+    scraper.tender_page_url = prozorro_server.tender_page_url
+
+    tenders = scraper.get_all_tender_pages(per_page=10, max_pages=3)
+    result = scraper.get_tender_htmls([tender.tender_id for tender in tenders], str(tmp_path), max_workers=4)
+
+    assert len(result.saved) == len(tenders) == 30
+    assert fast_governor.stats.requests == 3
+    assert page_governor.stats.requests == 30
+
+
+class ScriptedResponse(requests.Response):
+    """A response with a fixed status that remembers being closed."""
+
+    def __init__(self, status_code):
+        super().__init__()
+        self.status_code = status_code
+        self._content = b''
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ScriptedSession:
+    """Returns the given responses in order."""
+
+    def __init__(self, *status_codes):
+        self.responses = [ScriptedResponse(status) for status in status_codes]
+        self.sent = 0
+
+    def request(self, method, url, **kwargs):
+        response = self.responses[self.sent]
+        self.sent += 1
+        return response
+
+
+def _governor(**kwargs):
+    return RequestGovernor(requests_per_second=1000, max_requests_per_second=1000, backoff_base=0, **kwargs)
+
+
+def test_throttled_trial_request_closes_the_circuit():
+    governor = _governor(failure_threshold=1, reset_timeout=0)
+    url = 'http://prozorro.test/api/search/tenders'
+    _, breaker = governor._host_state(url)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    session = ScriptedSession(429, 200)
+    response = governor.request(session, 'POST', url)
+
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert governor.stats.throttled == 1
+    # The host keeps being reachable afterwards
+    assert governor.request(ScriptedSession(200), 'POST', url).status_code == 200
+
+
+def test_breaker_trial_outcomes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    breaker.record_throttled()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow()
+    breaker.record_throttled()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retried_responses_are_closed():
+    governor = _governor(max_retries=3)
+    session = ScriptedSession(503, 429, 200)
+
+    response = governor.request(session, 'GET', 'http://prozorro.test/tender/UA-1')
+
+    assert response.status_code == 200
+    assert [r.closed for r in session.responses] == [True, True, False]
+    assert governor.stats.retries == 2
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from core.html_parser import PARSER_ENGINES, ParseStats, parse_tender_html
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / 'benchmarks' / 'corpus'
+STEPS = {
+    'build_tree', '_extract_basic_info', '_extract_customer_info', '_extract_subject_info', '_extract_award_info',
+    '_extract_dates', '_extract_documents', '_extract_location_data', '_clean_and_normalize_data'
+}
+
+
+@pytest.fixture(scope='module')
+def sample_page():
+    return sorted(CORPUS_DIR.glob('plain_*.html'))[0].read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('engine', PARSER_ENGINES)
+def test_stats_record_steps_and_lookups(engine, sample_page):
+    stats = ParseStats()
+    data = parse_tender_html(sample_page, engine, stats)
+
+    assert data == parse_tender_html(sample_page, engine)
+    assert stats.pages == 1
+    assert set(stats.step_seconds) == STEPS
+    assert all(seconds >= 0 for seconds in stats.step_seconds.values())
+    assert set(stats.lookup_calls) == {'_select_one', '_select', '_find_containing', '_get_text'}
+    assert all(calls > 0 for calls in stats.lookup_calls.values())
+    assert stats.full_document_scans >= 1
+
+    merged = ParseStats()
+    merged.merge(stats)
+    merged.merge(stats)
+    assert merged.pages == 2
+    assert merged.lookup_calls == {lookup: calls * 2 for lookup, calls in stats.lookup_calls.items()}
+    assert merged.to_dict()['steps'].keys() == STEPS
+
+
+def test_engines_count_the_same_lookups(sample_page):
+    counts = []
+    for engine in PARSER_ENGINES:
+        stats = ParseStats()
+        parse_tender_html(sample_page, engine, stats)
+        counts.append((stats.lookup_calls, stats.full_document_scans))
+
+    assert counts[0] == counts[1]
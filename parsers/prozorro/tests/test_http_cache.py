@@ -0,0 +1,58 @@
+from core.http_cache import HTTPCache
+from core.scraper import ProzorroScraper
+from core.utils import extract_tender_status
+
+
+def _scraper(server, governor, cache):
+    scraper = ProzorroScraper(server.base_url, governor=governor, cache=cache, page_governor=governor)
+    scraper.tender_page_url = server.tender_page_url
+    return scraper
+
+
+def test_streamed_download_is_cached_without_buffering(prozorro_server, fast_governor, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache'), default_ttl=None)
+    scraper = _scraper(prozorro_server, fast_governor, cache)
+    url = scraper.tender_page_url.format(tender_id='UA-1')
+
+    response = scraper._send('GET', url, fast_governor, stream=True)
+    assert response._content is False
+    assert cache.stats.stored == 0
+
+    body = b''.join(response.iter_content(chunk_size=1024))
+    assert body == prozorro_server.tender_page('UA-1').encode('utf-8')
+    assert cache.stats.stored == 1
+
+    output_file = scraper.download_tender_html('UA-1', str(tmp_path / 'UA-1.html'))
+    assert prozorro_server.page_requests == 1
+    assert cache.stats.hits == 1
+    with open(output_file, encoding='utf-8') as f:
+        assert f.read() == prozorro_server.tender_page('UA-1')
+
+
+def test_partially_read_stream_is_not_cached(prozorro_server, fast_governor, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache'))
+    scraper = _scraper(prozorro_server, fast_governor, cache)
+    url = scraper.tender_page_url.format(tender_id='UA-1')
+
+    response = scraper._send('GET', url, fast_governor, stream=True)
+    chunks = response.iter_content(chunk_size=16)
+    next(chunks)
+    chunks.close()
+    response.close()
+
+    assert cache.stats.stored == 0
+    assert list((tmp_path / 'cache' / 'bodies').iterdir()) == []
+
+
+def test_status_is_found_across_streamed_chunks(prozorro_server, fast_governor, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache'))
+    scraper = _scraper(prozorro_server, fast_governor, cache)
+    url = scraper.tender_page_url.format(tender_id='UA-2')
+
+    response = scraper._send('GET', url, fast_governor, stream=True)
+    for _ in response.iter_content(chunk_size=7):
+        pass
+
+    status = extract_tender_status(prozorro_server.tender_page('UA-2'))
+    assert status is not None
+    assert cache._lookup(cache.make_key('GET', url))['status'] == status
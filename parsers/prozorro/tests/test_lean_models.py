@@ -0,0 +1,57 @@
+import copy
+
+import pytest
+
+from benchmarks.bench_models import make_tender
+from core.exceptions import ProzorroParsingError
+from core.lean_models import TenderRecord, parse_lean_search_response
+from core.models import Tender
+from core.scraper import ProzorroScraper
+
+
+def _variants():
+    missing_vat = make_tender(1)
+    del missing_vat['value']['valueAddedTaxIncluded']
+    none_vat = make_tender(2)
+    none_vat['value']['valueAddedTaxIncluded'] = None
+    string_vat = make_tender(3)
+    string_vat['value']['valueAddedTaxIncluded'] = 'false'
+    no_period = make_tender(4)
+    del no_period['tenderPeriod']
+    return [make_tender(0), missing_vat, none_vat, string_vat, no_period]
+
+
+@pytest.mark.parametrize('raw', _variants())
+def test_record_matches_full_model(raw):
+    record = TenderRecord(copy.deepcopy(raw))
+    tender = Tender.model_validate(raw)
+
+    assert record.tender_id == tender.tender_id
+    assert record.title == tender.title
+    assert record.status == tender.status
+    assert record.amount == tender.value.amount
+    assert record.currency == tender.value.currency
+    assert record.value_added_tax_included is tender.value.value_added_tax_included
+    period = tender.tender_period
+    assert record.tender_start_date == (period.start_date if period else None)
+    assert record.tender_end_date == (period.end_date if period else None)
+    assert record.procuring_entity == tender.procuring_entity
+    assert record.model_dump() == tender.model_dump()
+
+
+def test_invalid_records_are_rejected():
+    raw = make_tender(0)
+    raw['value']['valueAddedTaxIncluded'] = 'sometimes'
+
+    with pytest.raises(ProzorroParsingError):
+        TenderRecord(raw)
+    with pytest.raises(ProzorroParsingError):
+        parse_lean_search_response({'page': 1, 'per_page': 1, 'total': 1, 'data': [{'title': 'x'}]})
+
+
+def test_lean_crawl_matches_full_crawl(prozorro_server, fast_governor):
+    full = ProzorroScraper(prozorro_server.base_url, governor=fast_governor).get_all_tender_pages(per_page=25)
+    lean = ProzorroScraper(prozorro_server.base_url, governor=fast_governor, lean=True).get_all_tender_pages(per_page=25)
+
+    assert [record.tender_id for record in lean] == [tender.tender_id for tender in full]
+    assert [record.full for record in lean] == full
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from core import loader
+from core.analysis import load_all_json_data
+from core.loader import SnapshotWriter, iter_tender_files, iter_tenders
+
+GOLDEN_DIR = Path(__file__).resolve().parent.parent / 'benchmarks' / 'corpus' / 'golden'
+
+
+def _key(tender):
+    return json.dumps(tender, ensure_ascii=False, sort_keys=True)
+
+
+@pytest.fixture
+def tender_dir(tmp_path):
+    """A directory of parsed tenders with a metadata file and a broken file."""
+    directory = tmp_path / 'parsed'
+    directory.mkdir()
+    for path in sorted(GOLDEN_DIR.glob('plain_*.json')):
+        (directory / path.name).write_text(path.read_text(encoding='utf-8'), encoding='utf-8')
+    (directory / '_parse_summary.json').write_text('{"parsed": 0}', encoding='utf-8')
+    (directory / 'broken.json').write_text('{"title": ', encoding='utf-8')
+    return directory
+
+
+def test_directory_skips_metadata_and_broken_files(tender_dir):
+    expected_keys = sorted(
+        _key(json.loads(path.read_text(encoding='utf-8'))) for path in tender_dir.glob('plain_*.json')
+    )
+
+    for workers in (1, 4):
+        tenders = list(iter_tender_files(str(tender_dir), workers=workers, batch_size=3))
+        assert sorted(_key(tender) for tender in tenders) == expected_keys
+
+
+@pytest.mark.parametrize('name', ['tenders.ndjson', 'tenders.ndjson.gz', 'tenders.pickle'])
+def test_snapshot_round_trip(tender_dir, tmp_path, name):
+    tenders = load_all_json_data(str(tender_dir))
+    snapshot = str(tmp_path / 'snapshots' / name)
+
+    with SnapshotWriter(snapshot) as writer:
+        passed_on = list(writer.tee(tenders))
+
+    assert passed_on == tenders
+    assert writer.count == len(tenders) > 0
+    assert load_all_json_data(snapshot) == tenders
+    assert list(iter_tenders(snapshot)) == tenders
+
+
+def test_failed_snapshot_is_discarded(tmp_path):
+    snapshot = tmp_path / 'tenders.ndjson'
+
+    with pytest.raises(RuntimeError):
+        with SnapshotWriter(str(snapshot)) as writer:
+            writer.write({'tender_id': 'UA-1'})
+            raise RuntimeError("crawl failed")
+
+    assert not snapshot.exists()
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError):
+        SnapshotWriter(str(tmp_path / 'tenders.csv'))
+
+
+def test_json_fallback_without_orjson(tender_dir, tmp_path, monkeypatch):
+    tenders = load_all_json_data(str(tender_dir))
+    monkeypatch.setattr(loader, 'orjson', None)
+    snapshot = str(tmp_path / 'tenders.ndjson')
+
+    with SnapshotWriter(snapshot) as writer:
+        for tender in tenders:
+            writer.write(tender)
+
+    assert load_all_json_data(str(tender_dir)) == tenders
+    assert load_all_json_data(snapshot) == tenders
@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.bench_models import make_tender
+from core.models import Tender
+from core.ndjson import TenderNDJSONWriter, read_tenders_ndjson
+
+
+def _tenders(count, offset=0):
+    return [Tender.model_validate(make_tender(index)) for index in range(offset, offset + count)]
+
+
+def test_round_trip_appends_and_passes_tenders_on(tmp_path):
+    path = str(tmp_path / 'crawl' / 'tenders.ndjson')
+    tenders = _tenders(25)
+
+    with TenderNDJSONWriter(path, flush_every=10) as writer:
+        passed_on = list(writer.tee(tenders[:20]))
+    with TenderNDJSONWriter(path) as writer:
+        writer.write(tenders[20])
+        writer.write(tenders[21])
+
+    assert passed_on == tenders[:20]
+    assert writer.count == 2
+    assert list(read_tenders_ndjson(path)) == tenders[:22]
+
+
+def test_truncated_last_line(tmp_path):
+    path = tmp_path / 'tenders.ndjson'
+    tenders = _tenders(3)
+    with TenderNDJSONWriter(str(path)) as writer:
+        for tender in tenders:
+            writer.write(tender)
+    # A crash mid-write leaves half a line behind
+    line = _tenders(1, offset=3)[0].model_dump_json(by_alias=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n' + line[:len(line) // 2])
+
+    assert list(read_tenders_ndjson(str(path))) == tenders
+    with pytest.raises(ValueError):
+        list(read_tenders_ndjson(str(path), skip_invalid=False))
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from core.exceptions import ProzorroConnectionError
+from core.pipeline import build_tender_pipeline
+from core.scraper import ProzorroScraper
+
+
+class StubClassifier:
+    """Answers like the model would for the fake server's titles."""
+
+    def __init__(self):
+        self.titles = []
+
+    def is_building_related(self, title):
+        self.titles.append(title)
+        return 'ремонт' in title.lower()
+
+
+def _scraper(server, governor):
+    scraper = ProzorroScraper(server.base_url, governor=governor, page_governor=governor)
+    scraper.tender_page_url = server.tender_page_url
+    return scraper
+
+
+def test_pipeline_crawls_classifies_downloads_and_parses(prozorro_server, fast_governor, tmp_path):
+    scraper = _scraper(prozorro_server, fast_governor)
+    classifier = StubClassifier()
+    pipeline = build_tender_pipeline(scraper, classifier, str(tmp_path / 'html'), str(tmp_path / 'parsed'))
+
+    results = pipeline.run(scraper.iter_tenders(per_page=10))
+
+    assert len(classifier.titles) == 100
+    assert pipeline.stage('classify').stats.emitted == 50
+    assert pipeline.stage('download').stats.emitted == 50
+    assert prozorro_server.page_requests == 50
+    assert len(results) == 50
+    assert len(list((tmp_path / 'html').glob('*.html'))) == 50
+    for output_file in results:
+        with open(output_file, encoding='utf-8') as f:
+            assert json.load(f)
+    assert all(not stage.stats.errors for stage in pipeline.stages)
+
+
+def test_pipeline_raises_source_error_after_draining(prozorro_server, fast_governor, tmp_path):
+    scraper = _scraper(prozorro_server, fast_governor)
+    pipeline = build_tender_pipeline(scraper, StubClassifier(), str(tmp_path / 'html'))
+
+    def failing_crawl():
+        yield from scraper.iter_tenders(per_page=10, max_pages=3)
+        raise ProzorroConnectionError("connection lost")
+
+    with pytest.raises(ProzorroConnectionError):
+        pipeline.run(failing_crawl())
+
+    assert pipeline.source_stats.received == 30
+    assert len(pipeline.source_stats.errors) == 1
+    assert pipeline.stage('download').stats.emitted == 15
+    assert len(list((tmp_path / 'html').glob('*.html'))) == 15
+
+
+def test_stage_lookup_by_name(tmp_path):
+    pipeline = build_tender_pipeline(None, StubClassifier(), str(tmp_path / 'html'))
+
+    assert pipeline.stage('download') is pipeline.stages[1]
+    with pytest.raises(KeyError):
+        pipeline.stage('parse')
@@ -0,0 +1,36 @@
+from core.planner import CrawlPlanner, expand_regions
+from core.scraper import ProzorroScraper
+
+
+def _ids(tenders):
+    return [tender.tender_id for tender in tenders]
+
+
+def test_expand_regions():
+    assert expand_regions('61-64') == ['61', '62', '63', '64']
+    assert expand_regions('07-09, 61,07') == ['07', '08', '09', '61']
+
+
+def test_shards_cover_the_query_and_are_deduplicated(prozorro_server, fast_governor):
+    scraper = ProzorroScraper(prozorro_server.base_url, governor=fast_governor)
+    whole = scraper.get_all_tender_pages(region='61-64', per_page=10)
+
+    planner = CrawlPlanner(scraper, max_workers=4)
+    shards = planner.plan(regions='61-64', date_windows=[('2023-01-01', '2023-06-30'), ('2023-06-01', '2023-12-31')])
+    result = planner.crawl(shards, per_page=10)
+
+    assert len(shards) == 8
+    assert len(whole) == 100
+    assert sorted(_ids(result.tenders)) == sorted(_ids(whole))
+    assert len(set(_ids(result.tenders))) == len(result.tenders)
+    # The fake server ignores the date filter, so every tender is found twice
+    assert result.duplicates == 100
+    assert sum(result.shard_counts.values()) == 200
+    assert not result.failed
+
+
+def test_planner_budget_is_not_exceeded():
+    planner = CrawlPlanner(requests_per_second=2)
+    governor = planner.scraper.governor
+
+    assert governor.requests_per_second == governor.max_requests_per_second == 2
@@ -0,0 +1,91 @@
+import pytest
+
+from core.prefilter import ClassificationCascade, RuleClassifier, TitleModel, evaluate_cascade
+
+BUILDING_TITLES = [
+    f"Капітальний ремонт покрівлі будинку №{index}" for index in range(20)
+] + [
+    f"Реконструкція фасаду школи №{index}" for index in range(20)
+]
+OTHER_TITLES = [
+    f"Закупівля бензину А-95 партія №{index}" for index in range(20)
+] + [
+    f"Постачання канцелярського паперу №{index}" for index in range(20)
+]
+
+
+class FixedModel:
+    """Model tier returning the same probability for every title."""
+
+    def __init__(self, probability):
+        self.probability = probability
+
+    def predict_proba(self, title):
+        return self.probability
+
+
+def test_rules():
+    rules = RuleClassifier()
+
+    assert rules.decide("Бензин А-95") is False
+    assert rules.decide("Будівельні роботи (ДК 021:2015: 45210000-2 Будівництво будівель)") is True
+    # Keywords of unrelated goods win over a building works code
+    assert rules.decide("Папір офісний ДК 021:2015: 45210000-2") is False
+    # Both works and unrelated goods are left to the model
+    assert rules.decide("Ремонт медичного обладнання для лікарні") is None
+    assert rules.decide("Ремонт покрівлі будинку") is None
+    assert rules.decide("Послуги ДК 021:2015: 79710000-4") is False
+
+
+def test_title_model_learns_and_round_trips(tmp_path):
+    titles = BUILDING_TITLES + OTHER_TITLES
+    labels = [True] * len(BUILDING_TITLES) + [False] * len(OTHER_TITLES)
+    model = TitleModel.train(titles, labels)
+
+    assert model.predict_proba("Капітальний ремонт покрівлі будинку культури") > 0.9
+    assert model.predict_proba("Закупівля бензину А-92") < 0.1
+
+    path = tmp_path / 'model.json'
+    model.save(str(path))
+    loaded = TitleModel.load(str(path))
+    assert loaded.predict_proba("Реконструкція фасаду школи") == model.predict_proba("Реконструкція фасаду школи")
+
+    with pytest.raises(ValueError):
+        TitleModel.train(titles, labels[:-1])
+
+
+@pytest.mark.parametrize('probability, verdict, tier', [
+    (0.97, True, 'model'),
+    (0.03, False, 'model'),
+    (0.5, None, 'llm'),
+])
+def test_cascade_routing(probability, verdict, tier):
+    cascade = ClassificationCascade(model=FixedModel(probability))
+
+    assert cascade.decide("Бензин А-95") == (False, 'rules')
+    assert cascade.decide("Ремонт покрівлі будинку") == (verdict, tier)
+    assert cascade.stats.to_dict()['rules'] == 1
+    assert getattr(cascade.stats, tier) == 1
+
+
+def test_cascade_without_model_escalates_undecided_titles():
+    cascade = ClassificationCascade()
+    decided, escalated = cascade.split(["Бензин А-95", "Ремонт покрівлі будинку"])
+
+    assert decided == {"Бензин А-95": False}
+    assert escalated == ["Ремонт покрівлі будинку"]
+    assert cascade.stats.to_dict() == {'rules': 1, 'model': 0, 'llm': 1, 'local_share': 0.5}
+
+    with pytest.raises(ValueError):
+        ClassificationCascade(lower=0.9, upper=0.1)
+
+
+def test_evaluation_leaves_runtime_stats_alone():
+    cascade = ClassificationCascade(model=FixedModel(0.97))
+    titles = ["Бензин А-95", "Ремонт покрівлі будинку", "Ремонт медичного обладнання"]
+    report = evaluate_cascade(cascade, titles, [False, True, False])
+
+    assert report['rules'] == {'decided': 1, 'accuracy': 1.0, 'precision': None, 'recall': None}
+    assert report['model'] == {'decided': 2, 'accuracy': 0.5, 'precision': 0.5, 'recall': 1.0}
+    assert report['llm'] == {'decided': 0}
+    assert cascade.stats.to_dict() == {'rules': 0, 'model': 0, 'llm': 0, 'local_share': 0.0}
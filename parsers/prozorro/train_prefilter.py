@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import logging
+import argparse
+import random
+from ai_analyzer import PROMPT_VERSION
+from core.classification_cache import ClassificationCache
+from core.prefilter import ClassificationCascade, TitleModel, evaluate_cascade
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main(cache_path: str, output: str, model: str = "gpt-4o-mini", epochs: int = 15,
+         holdout: float = 0.2, seed: int = 0) -> None:
+    """
+    Train the pre-filter title model on the verdicts of a classification cache.
+    
+    A share of the verdicts is held out first: a model trained on the rest
+    is evaluated on them, tier by tier, against the language model's
+    verdicts. The saved model is then trained on all verdicts.
+    
+    Args:
+        cache_path: Path of the classification cache (SQLite)
+        output: Path of the JSON file to save the model to
+        model: Name of the language model whose verdicts to learn
+        epochs: Passes over the training data
+        holdout: Share of the verdicts held out for evaluation
+        seed: Seed of the held-out sample
+    """
+    cache = ClassificationCache(cache_path)
+    try:
+        examples = list(cache.verdicts(model, PROMPT_VERSION))
+    finally:
+        cache.close()
+    if not examples:
+        logger.error(f"No verdicts of {model} (prompt version {PROMPT_VERSION}) in {cache_path}")
+        return
+    
+    random.Random(seed).shuffle(examples)
+    held_out = int(len(examples) * holdout)
+    if held_out:
+        training, evaluation = examples[held_out:], examples[:held_out]
+        title_model = TitleModel.train([title for title, _ in training], [label for _, label in training],
+                                       epochs=epochs)
+        report = evaluate_cascade(
+            ClassificationCascade(model=title_model),
+            [title for title, _ in evaluation],
+            [label for _, label in evaluation]
+        )
+        logger.info(f"Cascade on {held_out} held-out verdicts of {model}: {report}")
+    
+    title_model = TitleModel.train([title for title, _ in examples], [label for _, label in examples], epochs=epochs)
+    title_model.save(output)
+    logger.info(f"Saved model trained on {len(examples)} verdicts to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the pre-filter title model on cached classification verdicts")
+    parser.add_argument("--cache", required=True, help="Classification cache (SQLite) with past verdicts")
+    parser.add_argument("--output", required=True, help="JSON file to save the model to")
+    parser.add_argument("--model", default="gpt-4o-mini", help="Language model whose verdicts to learn")
+    parser.add_argument("--epochs", type=int, default=15, help="Passes over the training data")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of the verdicts held out for evaluation")
+    
+    args = parser.parse_args()
+    
+    main(args.cache, args.output, args.model, args.epochs, args.holdout)